@@ -0,0 +1,229 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_CAPTURE.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import os
+import re
+import gzip
+import time
+import shutil
+import logging
+import threading
+
+logger = logging.getLogger('rfxcmd')
+
+# Suffix rotate() appends to the file name, gzipped when compress is set
+ROTATED_SUFFIX = r"\.\d{8}-\d{6}(-\d+)?(\.gz)?$"
+
+# ------------------------------------------------------------------------------
+
+class CaptureWriter(object):
+    """
+    Write the raw frames to a capture file, one "unixtime hexframe" line per
+    frame with the time in microseconds.
+
+    The file is kept open and written with a buffer, a background thread
+    flushes it every flush_interval seconds and close() flushes the rest.
+    The file is rotated when it reaches max_bytes or is older than
+    rotate_interval seconds (0 turns either off). A rotated file gets the
+    time of the rotation appended to its name and is gzipped by the thread
+    when compress is set. Only the newest backups rotated files are kept,
+    0 keeps all.
+    """
+
+    def __init__(self, filename, max_bytes=0, rotate_interval=0, backups=5, compress=False,
+            flush_interval=1.0, buffer_size=65536):
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backups = backups
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+
+        self.cond = threading.Condition()
+        self.closed = False
+        self.rotated = []
+        self.frames = 0
+        self.rotations = 0
+        self.errors = 0
+
+        self.open()
+
+        self.thread = threading.Thread(target=self.run, name="capture")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def open(self):
+        self.file = open(self.filename, "a", self.buffer_size)
+        self.size = self.file.tell()
+        self.opened = time.time()
+
+    def write(self, frame, timestamp=None):
+        """
+        Add one frame, given as hex string
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        line = "%.6f %s\n" % (timestamp, frame)
+        with self.cond:
+            if self.closed:
+                return
+            try:
+                if self.size and ((self.max_bytes and self.size + len(line) > self.max_bytes)
+                        or (self.rotate_interval and timestamp - self.opened >= self.rotate_interval)):
+                    self.rotate()
+                self.file.write(line)
+                self.size += len(line)
+                self.frames += 1
+            except (IOError, OSError) as err:
+                self.errors += 1
+                logger.error("Error when trying to write capture file %s, %s" % (self.filename, err))
+
+    def rotate(self):
+        """
+        Close the current file and start a new one, called with the lock held
+        """
+        self.file.close()
+        name = self.filename + time.strftime(".%Y%m%d-%H%M%S")
+        count = 1
+        while os.path.exists(name) or os.path.exists(name + ".gz"):
+            name = "%s%s-%d" % (self.filename, time.strftime(".%Y%m%d-%H%M%S"), count)
+            count += 1
+        try:
+            os.rename(self.filename, name)
+            self.rotated.append(name)
+            self.rotations += 1
+            self.cond.notify()
+        finally:
+            self.open()
+
+    def stats(self):
+        """
+        Return the counters
+        """
+        with self.cond:
+            return {
+                'frames': self.frames,
+                'size': self.size,
+                'rotations': self.rotations,
+                'errors': self.errors
+                }
+
+    def close(self, timeout=5):
+        """
+        Flush and close the file
+        """
+        with self.cond:
+            if self.closed:
+                return
+            self.closed = True
+            self.cond.notify()
+        self.thread.join(timeout)
+        with self.cond:
+            self.file.close()
+
+    def run(self):
+        while True:
+            with self.cond:
+                if not self.closed and not self.rotated:
+                    self.cond.wait(self.flush_interval)
+                closed = self.closed
+                rotated, self.rotated = self.rotated, []
+                try:
+                    self.file.flush()
+                except (IOError, OSError) as err:
+                    self.errors += 1
+                    logger.error("Error when trying to flush capture file %s, %s" % (self.filename, err))
+
+            # Compress and prune outside the lock, write() is not held up
+            if rotated:
+                for name in rotated:
+                    if self.compress:
+                        self.gzip(name)
+                self.prune()
+
+            if closed:
+                return
+
+    def gzip(self, name):
+        try:
+            with open(name, "rb") as source:
+                target = gzip.open(name + ".gz", "wb")
+                try:
+                    shutil.copyfileobj(source, target)
+                finally:
+                    target.close()
+            os.remove(name)
+        except (IOError, OSError) as err:
+            logger.error("Error when trying to compress capture file %s, %s" % (name, err))
+
+    def prune(self):
+        if not self.backups:
+            return
+        directory, base = os.path.split(self.filename)
+        rotated = re.compile(re.escape(base) + ROTATED_SUFFIX)
+        names = [os.path.join(directory, name) for name in os.listdir(directory or ".")
+            if rotated.match(name)]
+        names.sort(key=os.path.getmtime)
+        for name in names[:-self.backups]:
+            try:
+                os.remove(name)
+            except OSError:
+                pass
+
+# ------------------------------------------------------------------------------
+
+def read_capture(filename):
+    """
+    Yield (unixtime, hexframe) for each frame of a capture file, gzipped or
+    not. Lines written before capture files had a time give None as time.
+    A line with an invalid time is logged and gives (None, None), so the
+    caller can count it and go on with the next line.
+    """
+    if filename.endswith(".gz"):
+        f = gzip.open(filename, "rb")
+    else:
+        f = open(filename, "r")
+    try:
+        for line in f:
+            fields = line.split()
+            if len(fields) == 2:
+                try:
+                    unixtime = float(fields[0])
+                except ValueError:
+                    logger.error("Error: invalid time in capture file (%s)" % line.strip())
+                    yield None, None
+                    continue
+                yield unixtime, fields[1]
+            elif len(fields) == 1:
+                yield None, fields[0]
+    finally:
+        f.close()
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
@@ -35,40 +35,224 @@
 
 # --------------------------------------------------------------------------
 
+import time
+import shlex
 import logging
 import subprocess
 import threading
+import collections
 
 logger = logging.getLogger('rfxcmd')
 
-class Command(object):
-	def __init__(self, cmd):
-		self.cmd = cmd
-		self.process = None
+__all__ = ['CommandPool']
+
+# ----------------------------------------------------------------------------
+
+# Characters that need a shell to run the action
+SHELL_CHARS = frozenset('|&;<>()$`\\"\'*?[]#~={}!\n')
+
+# Overflow policies of the CommandPool
+POLICIES = ('drop-oldest', 'drop-new', 'coalesce')
+
+class CommandPool(object):
+	"""
+	Run trigger actions on a fixed number of worker threads.
+	
+	Actions wait in a bounded queue. When the queue is full the policy
+	decides what happens: drop-oldest removes the oldest waiting action,
+	drop-new ignores the new action. With coalesce a new action replaces
+	the waiting action of the same trigger, so a burst of matches on one
+	trigger runs the action once with the latest values, and a new action
+	is ignored when the queue is full.
+	
+	A single watchdog thread kills the actions that run longer than the
+	timeout. Actions without shell characters are started without a shell.
+	"""
 	
-	def run(self, timeout):
-		def target():
-			logger.debug("Thread started, timeout = " + str(timeout))
-			self.process = subprocess.Popen(self.cmd, shell=True)
-			self.process.communicate()
-			logger.debug("Return code: " + str(self.process.returncode))
-			logger.debug("Thread finished")
-			self.timer.cancel()
+	def __init__(self, workers=2, queue_size=50, policy='drop-oldest', timeout=10):
+		if workers < 1:
+			raise ValueError("workers must be at least 1")
+		if queue_size < 1:
+			raise ValueError("queue size must be at least 1")
+		if policy not in POLICIES:
+			raise ValueError("unknown policy '%s', use one of %s" % (policy, ", ".join(POLICIES)))
 		
-		def timer_callback():
-			logger.debug("Thread timeout, terminate it")
-			if self.process.poll() is None:
-				try:
-					self.process.kill()
-				except OSError as error:
-					logger.error("Error: %s " % error)
-				logger.debug("Thread terminated")
-			else:
-				logger.debug("Thread not alive")
+		self.queue_size = queue_size
+		self.policy = policy
+		self.timeout = timeout
+		
+		# Waiting actions as [key, cmd], pending maps key to the waiting entry
+		self.queue = collections.deque()
+		self.pending = {}
+		self.cond = threading.Condition()
+		self.closed = False
+		
+		# Running processes and their deadline, watched by the watchdog
+		self.running = {}
+		self.watch = threading.Condition()
+		self.stopped = False
+		
+		self.submitted = 0
+		self.executed = 0
+		self.dropped = 0
+		self.coalesced = 0
+		self.timeouts = 0
+		self.errors = 0
+		
+		self.workers = []
+		for i in range(workers):
+			thread = threading.Thread(target=self.worker, name="trigger-%d" % i)
+			thread.daemon = True
+			thread.start()
+			self.workers.append(thread)
+		
+		self.watchdog = threading.Thread(target=self.watchdog_loop, name="trigger-watchdog")
+		self.watchdog.daemon = True
+		self.watchdog.start()
+	
+	def submit(self, cmd, key=None):
+		"""
+		Queue the action, key identifies the trigger for coalesce.
+		Return False if the action was dropped.
+		"""
+		with self.cond:
+			if self.closed:
+				return False
+			self.submitted += 1
+			
+			if self.policy == 'coalesce' and key is not None and key in self.pending:
+				self.pending[key][1] = cmd
+				self.coalesced += 1
+				logger.debug("Trigger action coalesced, queue depth " + str(len(self.queue)))
+				return True
 			
-		thread = threading.Thread(target=target)
-		self.timer = threading.Timer(int(timeout), timer_callback)
-		self.timer.start()
-		thread.start()
+			if len(self.queue) >= self.queue_size:
+				if self.policy == 'drop-oldest':
+					oldest = self.queue.popleft()
+					self.forget(oldest)
+					self.dropped += 1
+					logger.debug("Trigger queue full, oldest action dropped: " + oldest[1])
+				else:
+					self.dropped += 1
+					logger.debug("Trigger queue full, action dropped: " + cmd)
+					return False
+			
+			entry = [key, cmd]
+			self.queue.append(entry)
+			if key is not None:
+				self.pending[key] = entry
+			logger.debug("Trigger action queued, queue depth " + str(len(self.queue)))
+			self.cond.notify()
+			return True
+	
+	def forget(self, entry):
+		"""
+		Remove the entry from pending, called with the lock held
+		"""
+		if entry[0] is not None and self.pending.get(entry[0]) is entry:
+			del self.pending[entry[0]]
+	
+	def depth(self):
+		"""
+		Return the number of waiting actions
+		"""
+		return len(self.queue)
+	
+	def stats(self):
+		"""
+		Return the queue depth and counters
+		"""
+		with self.cond:
+			return {
+				'depth': len(self.queue),
+				'running': len(self.running),
+				'submitted': self.submitted,
+				'executed': self.executed,
+				'dropped': self.dropped,
+				'coalesced': self.coalesced,
+				'timeouts': self.timeouts,
+				'errors': self.errors
+				}
+	
+	def close(self, wait=True):
+		"""
+		Stop accepting actions, with wait the workers finish the queue first
+		"""
+		with self.cond:
+			self.closed = True
+			self.cond.notify_all()
+		if wait:
+			for thread in self.workers:
+				thread.join()
+			# Nothing runs any more, stop the watchdog
+			with self.watch:
+				self.stopped = True
+				self.watch.notify()
+			self.watchdog.join()
+	
+	def worker(self):
+		while True:
+			with self.cond:
+				while not self.queue and not self.closed:
+					self.cond.wait()
+				if not self.queue:
+					return
+				entry = self.queue.popleft()
+				self.forget(entry)
+			self.execute(entry[1])
+	
+	def execute(self, cmd):
+		"""
+		Run one action and wait for it
+		"""
+		if isinstance(cmd, unicode):
+			cmd = cmd.encode('utf-8')
+		logger.debug("Execute: " + cmd)
+		try:
+			if SHELL_CHARS.isdisjoint(cmd):
+				process = subprocess.Popen(shlex.split(cmd))
+			else:
+				process = subprocess.Popen(cmd, shell=True)
+		except (OSError, ValueError) as error:
+			logger.error("Error: %s " % error)
+			with self.cond:
+				self.errors += 1
+			return
+		
+		with self.watch:
+			self.running[process] = time.time() + self.timeout
+			self.watch.notify()
+		process.wait()
+		with self.watch:
+			del self.running[process]
+		
+		logger.debug("Return code: " + str(process.returncode))
+		with self.cond:
+			self.executed += 1
+	
+	def watchdog_loop(self):
+		"""
+		Kill the processes that pass their deadline, sleep until the next one
+		"""
+		with self.watch:
+			while not self.stopped:
+				now = time.time()
+				deadline = None
+				for process, end in self.running.items():
+					if end <= now:
+						if process.poll() is None:
+							logger.debug("Action timeout, terminate it")
+							try:
+								process.kill()
+							except OSError as error:
+								logger.error("Error: %s " % error)
+							self.timeouts += 1
+						self.running[process] = now + self.timeout
+					elif deadline is None or end < deadline:
+						deadline = end
+				if deadline is None:
+					self.watch.wait()
+				else:
+					self.watch.wait(deadline - now)
 
 # ----------------------------------------------------------------------------
@@ -0,0 +1,233 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_CONFIG.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import time
+
+try:
+    import xml.etree.cElementTree as ElementTree
+except ImportError:
+    import xml.etree.ElementTree as ElementTree
+
+# ------------------------------------------------------------------------------
+
+class ConfigError(Exception):
+    pass
+
+# ------------------------------------------------------------------------------
+# Value types, each converts the text of a tag or raises ValueError
+# ------------------------------------------------------------------------------
+
+def yes_no(text):
+    if text.lower() == "yes":
+        return True
+    if text.lower() == "no":
+        return False
+    raise ValueError("expected yes or no")
+
+def choice(*values):
+    def convert(text):
+        if text.lower() not in values:
+            raise ValueError("expected one of " + ", ".join(values))
+        return text.lower()
+    return convert
+
+def text(text):
+    return text
+
+def type_windows(text):
+    """
+    Parse "52=2, 10=0.5" into {"52": 2.0, "10": 0.5}
+    """
+    windows = {}
+    for item in text.replace(",", " ").split():
+        packettype, sep, seconds = item.partition("=")
+        if not sep or len(packettype) != 2:
+            raise ValueError("expected packettype=seconds, e.g. 52=2")
+        int(packettype, 16)
+        windows[packettype.upper()] = float(seconds)
+    return windows
+
+# ------------------------------------------------------------------------------
+
+# Configuration items in config.xml with their type and default value, the
+# default is used when the tag is missing or empty
+SCHEMA = (
+    ("serial_active", yes_no, False),
+    ("serial_device", text, ""),
+    ("serial_rate", int, 38400),
+    ("serial_timeout", int, 9),
+    ("process_rfxmsg", yes_no, False),
+    ("mysql_active", yes_no, False),
+    ("mysql_server", text, ""),
+    ("mysql_database", text, ""),
+    ("mysql_username", text, ""),
+    ("mysql_password", text, ""),
+    ("pgsql_active", yes_no, False),
+    ("pgsql_server", text, ""),
+    ("pgsql_database", text, ""),
+    ("pgsql_port", int, 5432),
+    ("pgsql_username", text, ""),
+    ("pgsql_password", text, ""),
+    ("pgsql_table", text, ""),
+    ("trigger_active", yes_no, False),
+    ("trigger_onematch", yes_no, False),
+    ("trigger_file", text, ""),
+    ("trigger_timeout", int, 10),
+    ("trigger_workers", int, 2),
+    ("trigger_queue", int, 50),
+    ("trigger_policy", choice("drop-oldest", "drop-new", "coalesce"), "drop-oldest"),
+    ("sqlite_active", yes_no, False),
+    ("sqlite_database", text, ""),
+    ("sqlite_table", text, ""),
+    ("database_batch", int, 100),
+    ("database_interval", float, 2.0),
+    ("loglevel", choice("debug", "info", "warning", "error", "critical"), "error"),
+    ("logfile", text, "rfxcmd.log"),
+    ("graphite_active", yes_no, False),
+    ("graphite_server", text, ""),
+    ("graphite_port", int, 2003),
+    ("graphite_protocol", choice("plaintext", "pickle", "udp"), "plaintext"),
+    ("graphite_batch", int, 100),
+    ("graphite_interval", float, 1.0),
+    ("xpl_active", yes_no, False),
+    ("xpl_host", text, ""),
+    ("xpl_sourcename", text, "rfxcmd-"),
+    ("xpl_includehostname", yes_no, False),
+    ("socketserver", yes_no, False),
+    ("sockethost", text, ""),
+    ("socketport", int, 55000),
+    ("whitelist_active", yes_no, False),
+    ("whitelist_file", text, ""),
+    ("daemon_active", yes_no, False),
+    ("daemon_pidfile", text, "rfxcmd.pid"),
+    ("weewx_active", yes_no, False),
+    ("weewx_config", text, "weewx.xml"),
+    ("reload_interval", float, 0.0),
+    ("dedup_active", yes_no, False),
+    ("dedup_window", float, 1.0),
+    ("dedup_windows", type_windows, {}),
+    ("dedup_size", int, 1024),
+    ("stats_interval", float, 0.0),
+    ("prometheus_active", yes_no, False),
+    ("prometheus_host", text, ""),
+    ("prometheus_port", int, 9119),
+    ("rrd_active", yes_no, False),
+    ("rrd_path", text, ""),
+    ("barometric", int, 0),
+    ("log_msg", yes_no, False),
+    ("log_msgfile", text, ""),
+    ("log_msgsize", int, 0),
+    ("log_msgrotate", float, 0.0),
+    ("log_msgbackups", int, 5),
+    ("log_msgcompress", yes_no, False),
+    ("log_msgflush", float, 1.0),
+    ("protocol_startup", yes_no, False),
+    ("protocol_file", text, "protocol.xml")
+    )
+
+# Items that are not read from config.xml
+RUNTIME = ("configfile", "program_path", "device", "load_time")
+
+# ------------------------------------------------------------------------------
+
+class Config(object):
+    """
+    The configuration, read-only after it is created. Use replace() to get
+    a copy with some values changed.
+    """
+
+    __slots__ = tuple([item[0] for item in SCHEMA]) + RUNTIME
+
+    def __init__(self, **values):
+        for item in SCHEMA:
+            object.__setattr__(self, item[0], item[2])
+        for name in RUNTIME:
+            object.__setattr__(self, name, None)
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("configuration is read-only, use replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError("configuration is read-only")
+
+    def replace(self, **changes):
+        """
+        Return a copy with the changes applied
+        """
+        values = self.items()
+        values.update(changes)
+        return Config(**values)
+
+    def items(self):
+        """
+        Return the configuration as a dict
+        """
+        return dict([(name, getattr(self, name)) for name in self.__slots__])
+
+# ------------------------------------------------------------------------------
+
+def load_config(configfile, program_path=""):
+    """
+    Parse config.xml once and return a Config. Raise ConfigError if the
+    file cannot be read or a value has the wrong type. An empty rrd_path
+    is set to program_path.
+    """
+    start = time.time()
+
+    try:
+        root = ElementTree.parse(configfile).getroot()
+    except (IOError, OSError) as err:
+        raise ConfigError("cannot read configuration file %s, %s" % (configfile, err))
+    except SyntaxError as err:
+        raise ConfigError("problem in the configuration file %s, %s" % (configfile, err))
+
+    tags = {}
+    for element in root.iter():
+        if element.text is not None:
+            tags.setdefault(element.tag, element.text.strip())
+
+    values = {}
+    for name, convert, default in SCHEMA:
+        value = tags.get(name)
+        if not value:
+            continue
+        try:
+            values[name] = convert(value)
+        except ValueError as err:
+            raise ConfigError("invalid value '%s' for %s in %s, %s" % (value, name, configfile, err))
+
+    if not values.get("rrd_path"):
+        values["rrd_path"] = program_path
+
+    return Config(configfile=configfile, program_path=program_path,
+        load_time=time.time() - start, **values)
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
@@ -0,0 +1,271 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_DATABASE.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import time
+import logging
+import threading
+import collections
+
+logger = logging.getLogger('rfxcmd')
+
+# Columns of the rfxcmd table, processed is always 0 on insert
+COLUMNS = ("datetime", "unixtime", "packettype", "subtype", "seqnbr", "battery", "rssi",
+    "data1", "data2", "data3", "data4", "data5", "data6", "data7", "data8", "data9",
+    "data10", "data11", "data12", "data13")
+
+def insert_sql(table, marker):
+    """
+    Return the parameterized INSERT statement for table, marker is the
+    parameter marker of the database module
+    """
+    return "INSERT INTO %s (%s, processed) VALUES (%s, 0)" \
+        % (table, ", ".join(COLUMNS), ", ".join([marker] * len(COLUMNS)))
+
+# ------------------------------------------------------------------------------
+# Backends, one long-lived connection each. They are only used from the
+# writer thread, which is also required by sqlite3. Each imports its
+# database module when it is created.
+# ------------------------------------------------------------------------------
+
+class MySQLBackend(object):
+
+    name = "MySQL"
+
+    def __init__(self, server, username, password, database):
+        import MySQLdb
+        self.module = MySQLdb
+        self.args = (server, username, password, database)
+        self.sql = insert_sql("rfxcmd", "%s")
+        self.errors = (MySQLdb.Error,)
+        self.db = None
+
+    def connect(self):
+        self.db = self.module.connect(*self.args)
+
+    def insert(self, rows):
+        rows = [row[:-1] + ("0000-00-00 00:00:00" if row[-1] == "0" else row[-1],) for row in rows]
+        cursor = self.db.cursor()
+        cursor.executemany(self.sql, rows)
+        self.db.commit()
+        cursor.close()
+
+    def close(self):
+        if self.db is not None:
+            try:
+                self.db.close()
+            except self.errors:
+                pass
+            self.db = None
+
+class SQLiteBackend(MySQLBackend):
+
+    name = "SqLite"
+
+    def __init__(self, database, table):
+        import sqlite3
+        self.module = sqlite3
+        self.database = database
+        self.sql = insert_sql("'%s'" % table, "?")
+        self.errors = (sqlite3.Error,)
+        self.db = None
+
+    def connect(self):
+        self.db = self.module.connect(self.database)
+
+    def insert(self, rows):
+        try:
+            self.db.executemany(self.sql, rows)
+            self.db.commit()
+        except self.errors:
+            self.db.rollback()
+            raise
+
+class PgSQLBackend(MySQLBackend):
+
+    name = "PgSQL"
+
+    def __init__(self, server, port, username, password, database, table):
+        import psycopg2
+        self.module = psycopg2
+        self.dsn = "dbname='%s' user='%s' host='%s' port=%s password=%s" \
+            % (database, username, server, port, password)
+        self.sql = insert_sql(table, "%s")
+        self.errors = (psycopg2.Error,)
+        self.db = None
+
+    def connect(self):
+        self.db = self.module.connect(self.dsn)
+
+    def insert(self, rows):
+        rows = [row[:-1] + (None if row[-1] == "0" else row[-1] + " UTC",) for row in rows]
+        try:
+            cursor = self.db.cursor()
+            cursor.executemany(self.sql, rows)
+            self.db.commit()
+            cursor.close()
+        except self.errors:
+            self.db.rollback()
+            raise
+
+# ------------------------------------------------------------------------------
+
+class DatabaseWriter(object):
+    """
+    Write rows to the databases from a background thread.
+
+    insert() only queues the row, so a slow or restarting database does not
+    stall the serial read loop. The thread writes with executemany when
+    batch_size rows are waiting or after interval seconds. A backend that
+    fails is closed and retried with a backoff that doubles up to
+    max_backoff seconds, its rows are kept until then. At most queue_size
+    rows are kept in the queue and per backend, the oldest are dropped.
+    The thread logs any error and carries on, it never stops before close().
+    """
+
+    def __init__(self, backends, batch_size=100, interval=2.0, queue_size=10000, max_backoff=60):
+        self.backends = list(backends)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.queue_size = queue_size
+        self.max_backoff = max_backoff
+
+        self.queue = collections.deque()
+        self.cond = threading.Condition()
+        self.closed = False
+
+        # Per backend: rows not yet written, next retry time and backoff
+        self.pending = dict([(b, collections.deque()) for b in self.backends])
+        self.retry_at = dict([(b, 0) for b in self.backends])
+        self.backoff = dict([(b, 0) for b in self.backends])
+
+        self.written = 0
+        self.dropped = 0
+        self.failures = 0
+
+        self.thread = threading.Thread(target=self.run, name="database")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def insert(self, *values):
+        """
+        Queue one row, the values in the order of COLUMNS
+        """
+        row = tuple([v if isinstance(v, basestring) else str(v) for v in values])
+        with self.cond:
+            if self.closed:
+                return
+            if len(self.queue) >= self.queue_size:
+                self.queue.popleft()
+                self.dropped += 1
+            self.queue.append(row)
+            if len(self.queue) >= self.batch_size:
+                self.cond.notify()
+
+    def stats(self):
+        """
+        Return the queue depth and counters
+        """
+        with self.cond:
+            return {
+                'depth': len(self.queue) + max([len(p) for p in self.pending.values()] or [0]),
+                'written': self.written,
+                'dropped': self.dropped,
+                'failures': self.failures
+                }
+
+    def close(self, timeout=5):
+        """
+        Write what is queued and close the connections, gives up on a
+        database that is down after timeout seconds
+        """
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        self.thread.join(timeout)
+
+    def run(self):
+        while True:
+            with self.cond:
+                if not self.closed and len(self.queue) < self.batch_size:
+                    self.cond.wait(self.interval)
+                rows = list(self.queue)
+                self.queue.clear()
+                closed = self.closed
+
+            for backend in self.backends:
+                pending = self.pending[backend]
+                pending.extend(rows)
+                overflow = len(pending) - self.queue_size
+                if overflow > 0:
+                    logger.error("%s queue full, %d rows dropped" % (backend.name, overflow))
+                    for i in range(overflow):
+                        pending.popleft()
+                    self.dropped += overflow
+                if pending and (closed or time.time() >= self.retry_at[backend]):
+                    self.flush(backend, pending)
+
+            if closed:
+                for backend in self.backends:
+                    try:
+                        backend.close()
+                    except Exception as err:
+                        logger.error("%s close error: %s" % (backend.name, err))
+                return
+
+    def flush(self, backend, pending):
+        """
+        Write the pending rows of one backend in batches
+        """
+        try:
+            if backend.db is None:
+                logger.debug("Connect to " + backend.name)
+                backend.connect()
+            while pending:
+                count = min(len(pending), self.batch_size)
+                batch = [pending[i] for i in range(count)]
+                backend.insert(batch)
+                for i in range(count):
+                    pending.popleft()
+                self.written += count
+                logger.debug("%s: %d rows written" % (backend.name, count))
+            self.backoff[backend] = 0
+        except Exception as err:
+            # Not only backend.errors, anything else would end the thread
+            self.failures += 1
+            backoff = min(max(self.backoff[backend] * 2, 1), self.max_backoff)
+            self.backoff[backend] = backoff
+            self.retry_at[backend] = time.time() + backoff
+            logger.error("%s error: %s, %d rows waiting, retry in %d sec" % (backend.name, err, len(pending), backoff))
+            try:
+                backend.close()
+            except Exception as err:
+                logger.error("%s close error: %s" % (backend.name, err))
+                backend.db = None
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
@@ -28,67 +28,76 @@
 #
 # ------------------------------------------------------------------------------
 
-from rfx_utils import ByteToHex
-from rfx_utils import clearBit
-from rfx_utils import testBit
+import struct
+
+# ----------------------------------------------------------------------------
+# The decoders work on the integer byte values of the message, e.g. from
+# bytearray(message), and never convert a byte to a hex string and back.
+# ----------------------------------------------------------------------------
+
+UINT32 = struct.Struct('>I')
+UINT48 = struct.Struct('>HI')
 
 # ----------------------------------------------------------------------------
 
-def decodeTemperature(message_high, message_low):
+def decodeUInt16(data, offset):
 	"""
-	Decode temperature bytes.
+	Decode a big endian 16 bit value at offset.
 	"""
-	temp_high = ByteToHex(message_high)
-	temp_low = ByteToHex(message_low)
-	polarity = testBit(int(temp_high,16),7)
-		
-	if polarity == 128:
-		polarity_sign = "-"
-	else:
-		polarity_sign = ""
-			
-	temp_high = clearBit(int(temp_high,16),7)
-	temp_high = temp_high << 8
-	temperature = ( temp_high + int(temp_low,16) ) * 0.1
-	temperature_str = polarity_sign + str(temperature)
-
-	return temperature_str
+	return (data[offset] << 8) | data[offset + 1]
+
+# ----------------------------------------------------------------------------
+
+def decodeUInt32(data, offset):
+	"""
+	Decode a big endian 32 bit value at offset.
+	"""
+	return UINT32.unpack_from(data, offset)[0]
+
+# ----------------------------------------------------------------------------
+
+def decodeUInt48(data, offset):
+	"""
+	Decode a big endian 48 bit value at offset.
+	"""
+	high, low = UINT48.unpack_from(data, offset)
+	return (high << 32) | low
+
+# ----------------------------------------------------------------------------
+
+def decodeTemperature(temp_high, temp_low):
+	"""
+	Decode temperature bytes, bit 7 in the high byte is the sign.
+	"""
+	temperature = str((((temp_high & 0x7F) << 8) + temp_low) * 0.1)
+
+	if temp_high & 0x80:
+		return "-" + temperature
+
+	return temperature
 
 # ----------------------------------------------------------------------------
 
-def decodeSignal(message):
+def decodeSignal(value):
 	"""
 	Decode signal byte.
 	"""
-	signal = int(ByteToHex(message),16) >> 4
-	return signal
+	return value >> 4
 
 # ----------------------------------------------------------------------------
 
-def decodeBattery(message):
+def decodeBattery(value):
 	"""
 	Decode battery byte.
 	"""
-	battery = int(ByteToHex(message),16) & 0xf
-	return battery
+	return value & 0xf
 
 # ----------------------------------------------------------------------------
 
-def decodePower(message_1, message_2, message_3):
+def decodePower(power_1, power_2, power_3):
 	"""
 	Decode power bytes.
 	"""
-	power_1 = ByteToHex(message_1)
-	power_2 = ByteToHex(message_2)
-	power_3 = ByteToHex(message_3)
-	
-	power_1 = int(power_1,16)
-	power_1 = power_1 << 16
-	power_2 = int(power_2,16) << 8
-	power_3 = int(power_3,16)
-	power = ( power_1 + power_2 + power_3)
-	power_str = str(power)
-	
-	return power_str
+	return str((power_1 << 16) + (power_2 << 8) + power_3)
 
 # ----------------------------------------------------------------------------
@@ -0,0 +1,754 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_DECODERS.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import binascii
+import logging
+
+from lib.rfx_utils import testBit
+from lib.rfx_decode import decodeUInt16
+from lib.rfx_decode import decodeUInt32
+from lib.rfx_decode import decodeUInt48
+from lib.rfx_decode import decodeTemperature
+from lib.rfx_decode import decodeSignal
+from lib.rfx_decode import decodeBattery
+from lib.rfx_decode import decodePower
+import lib.rfx_sensors
+
+logger = logging.getLogger('rfxcmd')
+
+rfx = lib.rfx_sensors.rfx_data()
+
+# ------------------------------------------------------------------------------
+# The decoders only parse the message, each one returns a dict with the
+# decoded fields. Printout, CSV, trigger, database, graphite, xPL, RRD and
+# weewx are handled by the caller from the returned dict.
+#
+# Numeric fields are read as integers from data = bytearray(message). Fields
+# that are shown or looked up as hex are sliced from the raw hex string, byte
+# n of the message is raw[2*n:2*n+2].
+# ------------------------------------------------------------------------------
+
+def decode_header(message):
+    """
+    Decode the fields common to all packets, return the result dict and
+    the message as a bytearray
+    """
+    raw = binascii.hexlify(message).upper()
+    length = len(message)
+    result = {
+        'raw' : raw,
+        'packettype' : raw[2:4]
+        }
+
+    if length > 2:
+        result['subtype'] = raw[4:6]
+
+    if length > 3:
+        result['seqnbr'] = raw[6:8]
+
+    if length > 4:
+        result['id1'] = raw[8:10]
+
+    if length > 5:
+        result['id2'] = raw[10:12]
+
+    return result, bytearray(message)
+
+# ------------------------------------------------------------------------------
+# 0x00 - Interface Control
+# ------------------------------------------------------------------------------
+
+def decode_0x00(message):
+    return decode_header(message)[0]
+
+# ------------------------------------------------------------------------------
+# 0x01 - Interface Message
+# ------------------------------------------------------------------------------
+
+def decode_0x01(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+    result['cmnd'] = raw[8:10]
+    for i in range(1, 10):
+        result['msg%d' % i] = raw[8 + 2 * i:10 + 2 * i]
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x02 - Receiver/Transmitter Message
+# ------------------------------------------------------------------------------
+
+def decode_0x02(message):
+    return decode_header(message)[0]
+
+# ------------------------------------------------------------------------------
+# 0x03 - Undecoded Message
+# ------------------------------------------------------------------------------
+
+def decode_0x03(message):
+    result, data = decode_header(message)
+    result['message'] = result['raw'][4:]
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x10 Lighting1
+# ------------------------------------------------------------------------------
+
+def decode_0x10(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+
+    try:
+        result['housecode'] = rfx.rfx_subtype_10_housecode[raw[8:10]]
+    except Exception as err:
+        result['housecode'] = "Error: Unknown housecode"
+        logger.error("Unknown house command received, %s" % str(err))
+
+    result['unitcode'] = data[5]
+
+    try:
+        result['command'] = rfx.rfx_subtype_10_cmnd[raw[12:14]]
+    except Exception as err:
+        result['command'] = "Error: Unknown command"
+        logger.error("Unknown command received, %s" % str(err))
+
+    result['signal'] = decodeSignal(data[7])
+
+    try:
+        result['subtype_str'] = str(rfx.rfx_subtype_10[result['subtype']])
+    except Exception as err:
+        result['subtype'] = result['subtype_str'] = "Error: Unknown subtype"
+        logger.error("Unknown subtype received, %s" % str(err))
+
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x11 Lighting2
+# ------------------------------------------------------------------------------
+
+def decode_0x11(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+    result['id'] = raw[8:16]
+    result['unitcode'] = data[8]
+    result['command'] = rfx.rfx_subtype_11_cmnd[raw[18:20]]
+    result['dimlevel'] = rfx.rfx_subtype_11_dimlevel[raw[20:22]]
+    result['signal'] = decodeSignal(data[11])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x12 Lighting3
+# ------------------------------------------------------------------------------
+
+def decode_0x12(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+    result['system'] = raw[8:10]
+
+    # Channel 1-8 in the first byte, 9-10 in the second, first bit set wins
+    channels = (data[6] << 8) + data[5]
+    result['channel'] = 255
+    for bit in range(0, 10):
+        if testBit(channels, bit):
+            result['channel'] = bit + 1
+            break
+
+    result['command'] = rfx.rfx_subtype_12_cmnd[raw[14:16]]
+    result['battery'] = decodeBattery(data[8])
+    result['signal'] = decodeSignal(data[8])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x13 Lighting4
+# ------------------------------------------------------------------------------
+
+def decode_0x13(message):
+    result, data = decode_header(message)
+    result['code'] = result['raw'][8:14]
+    result['code_bin'] = " ".join([format(x, '08b') for x in data[4:7]])
+    result['pulse'] = decodeUInt16(data, 7)
+    result['signal'] = decodeSignal(data[9])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x14 Lighting5
+# ------------------------------------------------------------------------------
+
+def decode_0x14(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+    subtype = result['subtype']
+    result['id'] = raw[8:14]
+    result['unitcode'] = data[7]
+
+    commands = {
+        '00' : rfx.rfx_subtype_14_cmnd0,
+        '01' : rfx.rfx_subtype_14_cmnd1,
+        '02' : rfx.rfx_subtype_14_cmnd2,
+        '03' : rfx.rfx_subtype_14_cmnd3,
+        '04' : rfx.rfx_subtype_14_cmnd4,
+        '05' : rfx.rfx_subtype_14_cmnd5,
+        '06' : rfx.rfx_subtype_14_cmnd5
+        }
+
+    if subtype == '06':
+        try:
+            result['command'] = commands[subtype][raw[16:18]]
+        except Exception as err:
+            # if the value is between x06 and x84 it is 'select color'
+            # This should be improved, as it will not catch unknown values
+            logger.error("Value is not in the sensor list")
+            result['command'] = "Select Color"
+    elif subtype in commands:
+        result['command'] = commands[subtype][raw[16:18]]
+    else:
+        result['command'] = "Unknown"
+
+    if subtype == "00":
+        result['level'] = raw[18:20]
+    else:
+        result['level'] = 0
+
+    result['signal'] = decodeSignal(data[10])
+
+    try:
+        result['subtype_str'] = rfx.rfx_subtype_14[subtype]
+    except Exception as err:
+        logger.error("Error: Invalid subtype")
+        result['subtype_str'] = "Unknown"
+
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x15 Lighting6
+# Credit: Dimitri Clatot
+# ------------------------------------------------------------------------------
+
+def decode_0x15(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+    result['id'] = raw[8:12]
+    result['groupcode'] = rfx.rfx_subtype_15_groupcode[raw[12:14]]
+    result['unitcode'] = data[7]
+    result['command'] = rfx.rfx_subtype_15_cmnd[raw[16:18]]
+    result['command_seqnbr'] = raw[18:20]
+    result['seqnbr2'] = raw[20:22]
+    result['signal'] = decodeSignal(data[11])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x16 Chime
+# ------------------------------------------------------------------------------
+
+def decode_0x16(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+    subtype = result['subtype']
+    result['id'] = raw[8:12]
+    result['sound'] = None
+
+    if subtype == "00":
+        try:
+            result['sound'] = rfx.rfx_subtype_16_sound[raw[12:14]]
+        except Exception as err:
+            logger.error("Error: %s", str(err))
+            result['sound'] = "Unknown"
+    elif subtype == "01":
+        result['sound'] = raw[12:14]
+
+    try:
+        result['signal'] = decodeSignal(data[7])
+    except Exception as err:
+        logger.error("Error: %s", str(err))
+        result['signal'] = "Error"
+
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x17 Fan, 0x18 Curtain1, 0x19 Blinds1 (not completed)
+# ------------------------------------------------------------------------------
+
+def decode_0x17(message):
+    return decode_header(message)[0]
+
+def decode_0x18(message):
+    return decode_header(message)[0]
+
+def decode_0x19(message):
+    return decode_header(message)[0]
+
+# ------------------------------------------------------------------------------
+# 0x1A RTS
+# ------------------------------------------------------------------------------
+
+def decode_0x1A(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+    subtype = result['subtype']
+    result['id'] = raw[8:14]
+
+    try:
+        result['subtype_str'] = rfx.rfx_subtype_1A[subtype]
+    except Exception as err:
+        logger.error("Unknown subtype")
+        result['subtype_str'] = "Error: Unknown subtype"
+
+    result['unitcode'] = raw[12:14]
+    if subtype == "00" and result['unitcode'] == "00":
+        result['unitcode_str'] = "All"
+    else:
+        result['unitcode_str'] = result['unitcode']
+
+    result['command'] = raw[14:16]
+    try:
+        result['command_str'] = rfx.rfx_subtype_1A_cmnd[result['command']]
+    except Exception as err:
+        logger.error("Unknown command received")
+        result['command_str'] = "Error: Unknown command received"
+
+    result['signal'] = decodeSignal(data[8])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x20 Security1
+# Credit: Dimitri Clatot
+# ------------------------------------------------------------------------------
+
+def decode_0x20(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+    result['id'] = raw[8:14]
+    result['status'] = rfx.rfx_subtype_20_status[raw[14:16]]
+    result['signal'] = decodeSignal(data[8])
+    result['battery'] = decodeBattery(data[8])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x28 Camera1 (not completed)
+# ------------------------------------------------------------------------------
+
+def decode_0x28(message):
+    return decode_header(message)[0]
+
+# ------------------------------------------------------------------------------
+# 0x30 Remote control and IR
+# ------------------------------------------------------------------------------
+
+def decode_0x30(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+    subtype = result['subtype']
+
+    if subtype == '04':
+        result['cmndtype'] = {
+            '00' : "PC",
+            '01' : "AUX1",
+            '02' : "AUX2",
+            '03' : "AUX3",
+            '04' : "AUX4"
+            }.get(raw[14:16], "Unknown")
+
+    if subtype == '00':
+        result['command'] = rfx.rfx_subtype_30_atiremotewonder[raw[10:12]]
+    elif subtype == '02':
+        result['command'] = rfx.rfx_subtype_30_medion[raw[10:12]]
+    elif subtype == '01' or subtype == '03' or subtype == '04':
+        result['command'] = "Not implemented in RFXCMD"
+
+    result['toggle'] = raw[12:14]
+
+    if subtype == '00' or subtype == '02' or subtype == '03':
+        result['signal'] = decodeSignal(data[6])
+
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x40 - Thermostat1
+# Credit: Jean-Francois Pucheu
+# ------------------------------------------------------------------------------
+
+def decode_0x40(message):
+    result, data = decode_header(message)
+    result['id'] = result['raw'][8:12]
+    result['temperature'] = data[6]
+    result['temperature_set'] = data[7]
+    status = data[8]
+    result['status'] = rfx.rfx_subtype_40_status[str(testBit(status, 0) + testBit(status, 1))]
+    if testBit(status, 7) == 128:
+        result['mode'] = rfx.rfx_subtype_40_mode['1']
+    else:
+        result['mode'] = rfx.rfx_subtype_40_mode['0']
+    result['signal'] = decodeSignal(data[9])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x41 Thermostat2 (not completed)
+# ------------------------------------------------------------------------------
+
+def decode_0x41(message):
+    return decode_header(message)[0]
+
+# ------------------------------------------------------------------------------
+# 0x42 Thermostat3
+# ------------------------------------------------------------------------------
+
+def decode_0x42(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+    subtype = result['subtype']
+
+    if subtype == '00':
+        result['unitcode'] = raw[8:10]
+        result['command'] = rfx.rfx_subtype_42_cmd00[raw[14:16]]
+    elif subtype == '01':
+        result['unitcode'] = raw[8:14]
+        result['command'] = rfx.rfx_subtype_42_cmd01[raw[14:16]]
+    else:
+        result['unitcode'] = "00"
+        result['command'] = '0'
+
+    result['signal'] = decodeSignal(data[8])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x50 - Temperature sensors
+# ------------------------------------------------------------------------------
+
+def decode_0x50(message):
+    result, data = decode_header(message)
+    result['id'] = result['raw'][8:12]
+    result['temperature'] = decodeTemperature(data[6], data[7])
+    result['signal'] = decodeSignal(data[8])
+    result['battery'] = decodeBattery(data[8])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x51 - Humidity sensors
+# ------------------------------------------------------------------------------
+
+def decode_0x51(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+    result['id'] = raw[8:12]
+    result['humidity'] = data[6]
+    result['humidity_status'] = rfx.rfx_subtype_51_humstatus[raw[14:16]]
+    result['signal'] = decodeSignal(data[8])
+    result['battery'] = decodeBattery(data[8])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x52 - Temperature and humidity sensors
+# ------------------------------------------------------------------------------
+
+def decode_0x52(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+    result['id'] = raw[8:12]
+    result['temperature'] = decodeTemperature(data[6], data[7])
+    result['humidity'] = data[8]
+    result['humidity_status'] = rfx.rfx_subtype_52_humstatus[raw[18:20]]
+    result['signal'] = decodeSignal(data[10])
+    result['battery'] = decodeBattery(data[10])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x54 - Temperature, humidity and barometric sensors
+# Credit: Jean-Baptiste Bodart
+# ------------------------------------------------------------------------------
+
+def decode_0x54(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+    result['id'] = raw[8:12]
+    result['temperature'] = decodeTemperature(data[6], data[7])
+    result['humidity'] = data[8]
+    try:
+        result['humidity_status'] = rfx.rfx_subtype_54_humstatus[raw[18:20]]
+    except:
+        logger.debug("Humidity status [" + raw[18:20] + "] is unknown (" + raw + ")")
+        result['humidity_status'] = "Unknown"
+    result['barometric'] = ((data[10] & 0x7F) << 8) + data[11]
+    result['forecast'] = rfx.rfx_subtype_54_forecast[raw[24:26]]
+    result['signal'] = decodeSignal(data[13])
+    result['battery'] = decodeBattery(data[13])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x55 - Rain sensors
+# ------------------------------------------------------------------------------
+
+def decode_0x55(message):
+    result, data = decode_header(message)
+    subtype = result['subtype']
+    result['id'] = result['raw'][8:12]
+
+    rainrate = decodeUInt16(data, 6)
+    if subtype == '01':
+        result['rainrate'] = rainrate
+    elif subtype == '02':
+        result['rainrate'] = float(rainrate) / 100
+    else:
+        result['rainrate'] = 0
+
+    result['raintotal1'] = data[8]
+    if subtype <> '06':
+        result['raintotal'] = float( (data[8] * 0x1000) + (data[9] * 0x100) + data[10] ) / 10
+    else:
+        result['raintotal'] = 0
+
+    result['signal'] = decodeSignal(data[11])
+    result['battery'] = decodeBattery(data[11])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x56 - Wind sensors
+# ------------------------------------------------------------------------------
+
+def decode_0x56(message):
+    result, data = decode_header(message)
+    subtype = result['subtype']
+    result['id'] = result['raw'][8:12]
+    result['direction'] = decodeUInt16(data, 6)
+    if subtype <> "05":
+        result['av_speed'] = decodeUInt16(data, 8) * 0.1
+    else:
+        result['av_speed'] = 0
+    result['gust'] = decodeUInt16(data, 10) * 0.1
+    if subtype == "04":
+        result['temperature'] = decodeTemperature(data[12], data[13])
+        result['windchill'] = decodeTemperature(data[14], data[15])
+    else:
+        result['temperature'] = 0
+        result['windchill'] = 0
+    result['signal'] = decodeSignal(data[16])
+    result['battery'] = decodeBattery(data[16])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x57 UV Sensor
+# ------------------------------------------------------------------------------
+
+def decode_0x57(message):
+    result, data = decode_header(message)
+    result['id'] = result['raw'][8:12]
+    result['uv'] = data[6] * 10
+    result['temperature'] = decodeTemperature(data[6], data[8])
+    result['signal'] = decodeSignal(data[9])
+    result['battery'] = decodeBattery(data[9])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x58 Date/Time sensor
+# ------------------------------------------------------------------------------
+
+def decode_0x58(message):
+    result, data = decode_header(message)
+    result['id'] = result['raw'][8:12]
+    result['date'] = "20%s-%s-%s" % (str(data[6]).zfill(2), str(data[7]).zfill(2), str(data[8]).zfill(2))
+    result['dow'] = data[9]
+    result['time'] = "%s:%s:%s" % (str(data[10]), str(data[11]), str(data[12]))
+    result['datetime'] = "%s %s" % (result['date'], result['time'])
+    result['signal'] = decodeSignal(data[13])
+    result['battery'] = decodeBattery(data[13])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x59 Current Sensor
+# ------------------------------------------------------------------------------
+
+def decode_0x59(message):
+    result, data = decode_header(message)
+    result['id'] = result['raw'][8:12]
+    result['count'] = data[6]
+    result['channel1'] = decodeUInt16(data, 7) * 0.1
+    result['channel2'] = decodeUInt16(data, 9) * 0.1
+    result['channel3'] = decodeUInt16(data, 11) * 0.1
+    result['signal'] = decodeSignal(data[13])
+    result['battery'] = decodeBattery(data[13])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x5A Energy sensor
+# Credit: Jean-Michel ROY
+# ------------------------------------------------------------------------------
+
+def decode_0x5A(message):
+    result, data = decode_header(message)
+    result['id'] = result['raw'][8:12]
+    result['count'] = data[6]
+    result['instant'] = decodeUInt32(data, 7)
+    result['usage'] = int(decodeUInt48(data, 11) / 223.666)
+    result['signal'] = decodeSignal(data[17])
+    result['battery'] = decodeBattery(data[17])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x5B Current Sensor
+# ------------------------------------------------------------------------------
+
+def decode_0x5B(message):
+    result, data = decode_header(message)
+    result['id'] = result['raw'][8:12]
+    result['count'] = data[6]
+    result['channel1'] = decodeUInt16(data, 7) * 0.1
+    result['channel2'] = decodeUInt16(data, 9) * 0.1
+    result['channel3'] = decodeUInt16(data, 11) * 0.1
+    result['total'] = float(decodeUInt48(data, 13) / 223.666)
+    result['signal'] = decodeSignal(data[19])
+    result['battery'] = decodeBattery(data[19])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x5C Power Sensors
+# ------------------------------------------------------------------------------
+
+def decode_0x5C(message):
+    result, data = decode_header(message)
+    result['id'] = result['raw'][8:12]
+    result['voltage'] = data[6]
+    result['current'] = decodeUInt16(data, 7) * 0.01
+    result['power'] = decodeUInt16(data, 9) * 0.1
+    result['energy'] = decodeUInt16(data, 11) * 0.01
+    result['powerfactor'] = data[13] * 0.01
+    result['freq'] = data[14]
+    result['signal'] = decodeSignal(data[15])
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x5E Gas Usage Sensor, 0x5F Water Usage Sensor (not implemented)
+# ------------------------------------------------------------------------------
+
+def decode_0x5E(message):
+    return decode_header(message)[0]
+
+def decode_0x5F(message):
+    return decode_header(message)[0]
+
+# ------------------------------------------------------------------------------
+# 0x70 RFXsensor
+# ------------------------------------------------------------------------------
+
+def decode_0x70(message):
+    result, data = decode_header(message)
+    raw = result['raw']
+    subtype = result['subtype']
+    result['msg1'] = raw[10:12]
+    result['msg2'] = raw[12:14]
+
+    if subtype == '00':
+        result['temperature'] = float(decodeTemperature(data[5], data[6])) * 0.1
+    else:
+        result['temperature'] = 0
+
+    if subtype == '01' or subtype == '02':
+        result['voltage'] = decodeUInt16(data, 5)
+    else:
+        result['voltage'] = 0
+
+    result['signal'] = decodeSignal(data[7])
+
+    if subtype == '03':
+        result['message'] = rfx.rfx_subtype_70_msg03[result['msg2']]
+
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x71 RFXmeter
+# ------------------------------------------------------------------------------
+
+def decode_0x71(message):
+    result, data = decode_header(message)
+    result['id'] = result['raw'][8:12]
+    result['power'] = ''
+    try:
+        result['power'] = decodePower(data[7], data[8], data[9])
+    except Exception, e:
+        logger.error("Exception: %s" % str(e))
+    return result
+
+# ------------------------------------------------------------------------------
+# 0x72 FS20 (not implemented)
+# ------------------------------------------------------------------------------
+
+def decode_0x72(message):
+    return decode_header(message)[0]
+
+# ------------------------------------------------------------------------------
+# Decoder registry, packettype : (message length, decoder)
+#
+# The length is the total message length including the length byte, None
+# when it is not checked. Packet types with a decoder of None are length
+# checked but not decoded.
+# ------------------------------------------------------------------------------
+
+rfx_decoder = {
+    '00' : (14, decode_0x00),
+    '01' : (14, decode_0x01),
+    '02' : (5, decode_0x02),
+    '03' : (None, decode_0x03),
+    '10' : (8, decode_0x10),
+    '11' : (12, decode_0x11),
+    '12' : (9, decode_0x12),
+    '13' : (10, decode_0x13),
+    '14' : (None, decode_0x14),
+    '15' : (12, decode_0x15),
+    '16' : (8, decode_0x16),
+    '17' : (8, decode_0x17),
+    '18' : (8, decode_0x18),
+    '19' : (10, decode_0x19),
+    '1A' : (13, decode_0x1A),
+    '20' : (9, decode_0x20),
+    '28' : (7, decode_0x28),
+    '30' : (7, decode_0x30),
+    '40' : (10, decode_0x40),
+    '41' : (7, decode_0x41),
+    '42' : (9, decode_0x42),
+    '4E' : (11, None),
+    '4F' : (11, None),
+    '50' : (9, decode_0x50),
+    '51' : (9, decode_0x51),
+    '52' : (11, decode_0x52),
+    '53' : (10, None),
+    '54' : (14, decode_0x54),
+    '55' : (12, decode_0x55),
+    '56' : (17, decode_0x56),
+    '57' : (10, decode_0x57),
+    '58' : (14, decode_0x58),
+    '59' : (14, decode_0x59),
+    '5A' : (18, decode_0x5A),
+    '5B' : (20, decode_0x5B),
+    '5C' : (16, decode_0x5C),
+    '5D' : (9, None),
+    '5E' : (None, decode_0x5E),
+    '5F' : (None, decode_0x5F),
+    '70' : (8, decode_0x70),
+    '71' : (11, decode_0x71),
+    '72' : (10, decode_0x72)
+    }
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
@@ -0,0 +1,105 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_DEDUP.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import time
+import binascii
+from collections import OrderedDict
+
+# ------------------------------------------------------------------------------
+
+class Deduplicator(object):
+    """
+    Suppress the repeated copies of a frame that many 433 MHz sensors send.
+
+    A frame is a duplicate when the same frame, ignoring the sequence
+    number, was seen less than the window of its packet type ago. The
+    window starts at the first copy, so a sensor that sends the same
+    value on a regular interval longer than the window is not suppressed.
+    windows maps packet type ("52") to seconds, other types use window,
+    a window of 0 turns it off for that type. At most max_entries frames
+    are remembered. Interface and control packets (types below 0x10, such
+    as the 0x02 transmitter ACK) are never suppressed.
+    """
+
+    def __init__(self, window=1.0, windows=None, max_entries=1024):
+        self.window = window
+        self.windows = dict(windows or {})
+        self.max_window = max([window] + self.windows.values())
+        self.max_entries = max_entries
+        self.seen = OrderedDict()
+        self.suppressed = 0
+        self.by_type = {}
+
+    def is_duplicate(self, message, now=None):
+        """
+        Return True if message is a repeat of a recent frame
+        """
+        if len(message) < 4 or ord(message[1]) < 0x10:
+            return False
+        if now is None:
+            now = time.time()
+
+        packettype = binascii.hexlify(message[1]).upper()
+        window = self.windows.get(packettype, self.window)
+        if window <= 0:
+            return False
+
+        seen = self.seen
+        # The oldest entries are first, drop the ones no window covers
+        while seen:
+            key, first = next(seen.iteritems())
+            if now - first < self.max_window:
+                break
+            del seen[key]
+
+        key = message[:3] + message[4:]
+        first = seen.get(key)
+        if first is not None and now - first < window:
+            self.suppressed += 1
+            self.by_type[packettype] = self.by_type.get(packettype, 0) + 1
+            return True
+
+        if first is not None:
+            del seen[key]
+        elif len(seen) >= self.max_entries:
+            seen.popitem(last=False)
+        seen[key] = now
+        return False
+
+    def stats(self):
+        """
+        Return the counters, by_type is suppressed frames per packet type
+        """
+        return {
+            'suppressed': self.suppressed,
+            'entries': len(self.seen),
+            'by_type': dict(self.by_type)
+            }
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
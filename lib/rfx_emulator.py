@@ -0,0 +1,258 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_EMULATOR.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import os
+import pty
+import tty
+import time
+import errno
+import fcntl
+import select
+import logging
+import threading
+
+logger = logging.getLogger('rfxcmd')
+
+# Sensor frames sent when no others are given
+DEFAULT_FRAMES = [
+    "0A520145050100D1470269",
+    "08500110D508006679",
+    "0D54010EE90000B9340003F50169",
+    "0B5501001A3A000000000000",
+    "10560104A7020000000003000000000069",
+    "0957010105030AA0A079",
+    "0B1100050103FE1A0A010F70"
+    ]
+
+# Interface commands, byte 4 of a 0x00 packet
+CMD_RESET = 0x00
+CMD_STATUS = 0x02
+CMD_SETMODE = 0x03
+CMD_SAVE = 0x06
+
+# Largest number of bytes waiting for the host before frames are dropped
+MAX_PENDING = 4096
+
+# ------------------------------------------------------------------------------
+
+def check_frame(frame):
+    """
+    Return the hex frame as a bytearray, raise ValueError if it is not a
+    complete frame with room for the sequence number
+    """
+    try:
+        data = bytearray(frame.decode('hex'))
+    except TypeError:
+        raise ValueError("invalid frame %s, not hex" % frame)
+    if len(data) < 4:
+        raise ValueError("invalid frame %s, shorter than 4 bytes" % frame)
+    if data[0] != len(data) - 1:
+        raise ValueError("invalid frame %s, length byte %02X for %d bytes" % (frame, data[0], len(data)))
+    return data
+
+# ------------------------------------------------------------------------------
+
+class Emulator(object):
+    """
+    RFXtrx on a pseudo-terminal. Open device with rfxcmd like a real
+    RFXtrx: reset gets no reply, status, set mode and save get a 0x01
+    interface response and any other packet a 0x02 transmitter ACK.
+
+    The frames are sent in turn, rate frames per second (0 = as fast as
+    the host reads), until count frames are sent (0 = no limit), with a
+    new sequence number in each. When the host does not read, frames are
+    dropped like a receiver would lose them. A frame that is not hex, is
+    shorter than 4 bytes or has a length byte other than its length - 1
+    raises ValueError.
+    """
+
+    def __init__(self, frames=None, rate=10.0, count=0, transceiver=0x53, firmware=0x1E,
+            protocols=(0x00, 0x04, 0x0F)):
+        self.frames = [check_frame(frame) for frame in (frames or DEFAULT_FRAMES)]
+        self.rate = rate
+        self.count = count
+        self.transceiver = transceiver
+        self.firmware = firmware
+        self.protocols = list(protocols)
+
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)
+        flags = fcntl.fcntl(self.master, fcntl.F_GETFL)
+        fcntl.fcntl(self.master, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+        self.device = os.ttyname(self.slave)
+
+        self.inbuf = bytearray()
+        self.outbuf = bytearray()
+        self.seqnbr = 0
+        self.running = False
+        self.thread = None
+
+        self.sent = 0
+        self.dropped = 0
+        self.commands = 0
+
+    def start(self):
+        """
+        Run the emulator in a background thread
+        """
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="emulator")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(2)
+        os.close(self.master)
+        os.close(self.slave)
+
+    def stats(self):
+        return {
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'commands': self.commands,
+            'pending': len(self.outbuf)
+            }
+
+    def run(self):
+        self.running = True
+        start = time.time()
+        index = 0
+        while self.running:
+            # Time until the next frame is due
+            if self.count and index >= self.count:
+                timeout = 0.5
+            elif self.rate > 0:
+                timeout = max(start + index / self.rate - time.time(), 0)
+            else:
+                timeout = None if self.outbuf else 0
+
+            writers = [self.master] if self.outbuf else []
+            try:
+                readable, writable = select.select([self.master], writers, [], timeout)[0:2]
+            except select.error as err:
+                if err.args[0] == errno.EINTR:
+                    continue
+                raise
+
+            if readable:
+                self.read()
+            if writable:
+                self.write()
+
+            if self.count and index >= self.count:
+                continue
+            if self.rate > 0:
+                # Catch up when behind, the frames that do not fit are dropped
+                due = int((time.time() - start) * self.rate) + 1
+                if self.count:
+                    due = min(due, self.count)
+                while index < due:
+                    self.emit(self.frames[index % len(self.frames)])
+                    index += 1
+            else:
+                frame = self.frames[index % len(self.frames)]
+                if len(self.outbuf) + len(frame) <= MAX_PENDING:
+                    self.emit(frame)
+                    index += 1
+
+    def emit(self, frame):
+        """
+        Queue a sensor frame with the next sequence number
+        """
+        if len(self.outbuf) + len(frame) > MAX_PENDING:
+            self.dropped += 1
+            return
+        frame = bytearray(frame)
+        frame[3] = self.seqnbr
+        self.seqnbr = (self.seqnbr + 1) & 0xFF
+        self.outbuf += frame
+        self.sent += 1
+        self.write()
+
+    def write(self):
+        try:
+            written = os.write(self.master, bytes(self.outbuf))
+        except OSError as err:
+            if err.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return
+            if err.errno == errno.EIO:
+                # The device is not open
+                time.sleep(0.01)
+                return
+            raise
+        del self.outbuf[:written]
+
+    def read(self):
+        try:
+            data = os.read(self.master, 1024)
+        except OSError as err:
+            # EIO when the host has closed the device
+            if err.errno in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EIO):
+                time.sleep(0.01)
+                return
+            raise
+        self.inbuf += data
+        while self.inbuf:
+            length = self.inbuf[0]
+            if length == 0:
+                del self.inbuf[0]
+                continue
+            if len(self.inbuf) < length + 1:
+                break
+            packet = self.inbuf[:length + 1]
+            del self.inbuf[:length + 1]
+            self.command(packet)
+
+    def command(self, packet):
+        """
+        Answer one packet from the host
+        """
+        self.commands += 1
+        seqnbr = packet[3] if len(packet) > 3 else 0
+        if packet[1] != 0x00:
+            logger.debug("Emulator: packet type 0x%02X, ACK" % packet[1])
+            self.outbuf += bytearray([0x04, 0x02, 0x01, seqnbr, 0x00])
+            return
+
+        cmnd = packet[4] if len(packet) > 4 else CMD_RESET
+        logger.debug("Emulator: command 0x%02X" % cmnd)
+        if cmnd == CMD_RESET:
+            # The RFXtrx drops what it had not sent yet
+            self.outbuf = bytearray()
+            return
+        if cmnd == CMD_SETMODE and len(packet) >= 10:
+            self.transceiver = packet[5]
+            self.protocols = [packet[7], packet[8], packet[9]]
+
+        self.outbuf += bytearray([0x0D, 0x01, 0x00, seqnbr, cmnd, self.transceiver, self.firmware]
+            + self.protocols + [0x00] * 4)
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
@@ -0,0 +1,182 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_EXPORTER.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import re
+import time
+import logging
+import threading
+import SocketServer
+import BaseHTTPServer
+
+logger = logging.getLogger('rfxcmd')
+
+# Source fields that are a current value, all other fields only increase
+GAUGES = frozenset(['depth', 'running', 'clients', 'subscribers', 'pending', 'entries', 'size', 'buffered'])
+
+# Label of the keys of a source field that is a dict
+LABELS = {'by_type': 'packettype'}
+
+QUANTILES = (('0.5', 'p50'), ('0.9', 'p90'), ('0.99', 'p99'))
+
+# ------------------------------------------------------------------------------
+
+def metric_name(*parts):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', "_".join(['rfxcmd'] + list(parts)))
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class Exposition(object):
+    """
+    Collect samples and write them in the Prometheus text format, the
+    samples of one metric together under its TYPE line. suffix is _sum
+    or _count for those samples of a summary.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+
+    def add(self, name, kind, value, suffix='', **labels):
+        if value is None:
+            return
+        samples = self.metrics.setdefault(name, (kind, []))[1]
+        samples.append((suffix, labels, value))
+
+    def text(self):
+        lines = []
+        for name in sorted(self.metrics):
+            kind, samples = self.metrics[name]
+            lines.append("# TYPE %s %s" % (name, kind))
+            for suffix, labels, value in samples:
+                if labels:
+                    label = ",".join(['%s="%s"' % (key, escape(labels[key])) for key in sorted(labels)])
+                    lines.append("%s%s{%s} %s" % (name, suffix, label, repr(float(value))))
+                else:
+                    lines.append("%s%s %s" % (name, suffix, repr(float(value))))
+        return "\n".join(lines) + "\n"
+
+# ------------------------------------------------------------------------------
+
+def exposition(report, sensors, now=None):
+    """
+    Return the metrics report and the sensor state in the text format.
+
+    Counters: rfxcmd_frames_total{packettype} for decoded frames, the
+    other listener counters as rfxcmd_<name>_total and the errors of a
+    stage or output as rfxcmd_errors_total{stage}. Stage latency is the
+    summary rfxcmd_stage_seconds{stage}. Each source field becomes
+    rfxcmd_<source>_<field>, a gauge for queue depths and the like and a
+    counter otherwise. Each sensor has its last seen age, signal, battery
+    and frame count, labelled with packettype, subtype and id.
+    """
+    if now is None:
+        now = time.time()
+    out = Exposition()
+    out.add('rfxcmd_uptime_seconds', 'gauge', report['uptime'])
+
+    for name, value in report['counters'].iteritems():
+        if name.startswith('packettype.'):
+            out.add('rfxcmd_frames_total', 'counter', value, packettype=name[11:])
+        elif name.endswith('.errors'):
+            out.add('rfxcmd_errors_total', 'counter', value, stage=name[:-7])
+        else:
+            out.add(metric_name(name, 'total'), 'counter', value)
+
+    for name, stage in report['stages'].iteritems():
+        for quantile, key in QUANTILES:
+            out.add('rfxcmd_stage_seconds', 'summary', stage[key], stage=name, quantile=quantile)
+        out.add('rfxcmd_stage_seconds', 'summary', stage['mean'] * stage['count'], suffix='_sum', stage=name)
+        out.add('rfxcmd_stage_seconds', 'summary', stage['count'], suffix='_count', stage=name)
+
+    for source, stats in report['sources'].iteritems():
+        for field, value in stats.iteritems():
+            if isinstance(value, dict):
+                label = LABELS.get(field, 'key')
+                for key, item in value.iteritems():
+                    out.add(metric_name(source, field, 'total'), 'counter', item, **{label: key})
+            elif field in GAUGES:
+                out.add(metric_name(source, field), 'gauge', value)
+            else:
+                out.add(metric_name(source, field, 'total'), 'counter', value)
+
+    for sensor in sensors:
+        labels = {'packettype': sensor['packettype'], 'subtype': sensor['subtype'], 'id': sensor['id']}
+        if sensor['unixtime'] is not None:
+            out.add('rfxcmd_sensor_last_seen_seconds', 'gauge', now - sensor['unixtime'], **labels)
+        out.add('rfxcmd_sensor_signal', 'gauge', sensor['signal'], **labels)
+        out.add('rfxcmd_sensor_battery', 'gauge', sensor['battery'], **labels)
+        out.add('rfxcmd_sensor_frames_total', 'counter', sensor['count'], **labels)
+
+    return out.text()
+
+# ------------------------------------------------------------------------------
+
+class MetricsHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        try:
+            body = self.server.collect()
+        except Exception as err:
+            logger.error("Error when trying to collect metrics, %s" % err)
+            self.send_error(500)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("Metrics request from %s: %s" % (self.client_address[0], format % args))
+
+class MetricsServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """
+    HTTP server for /metrics in the Prometheus text format, served from
+    its own thread. collect is called for every request and returns the
+    text.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, port, collect):
+        BaseHTTPServer.HTTPServer.__init__(self, (address, port), MetricsHandler)
+        self.collect = collect
+        self.thread = threading.Thread(target=self.serve_forever, args=(0.5,), name="metrics")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def shutdown(self):
+        BaseHTTPServer.HTTPServer.shutdown(self)
+        self.server_close()
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
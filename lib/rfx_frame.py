@@ -0,0 +1,209 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_FRAME.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import time
+import logging
+
+logger = logging.getLogger('rfxcmd')
+
+# ------------------------------------------------------------------------------
+
+# Valid values of the length byte (first byte) for each packet type, used to
+# detect a corrupt length byte. Packet types not listed are accepted with any
+# length between FRAME_MINLEN and FRAME_MAXLEN.
+FRAME_LENGTH = {
+    0x00: (0x0D,),
+    0x01: (0x0D,),
+    0x02: (0x04,),
+    0x10: (0x07,),
+    0x11: (0x0B,),
+    0x12: (0x08,),
+    0x13: (0x09,),
+    0x15: (0x0B,),
+    0x16: (0x07,),
+    0x17: (0x07,),
+    0x18: (0x07,),
+    0x19: (0x09,),
+    0x1A: (0x0C,),
+    0x20: (0x08,),
+    0x28: (0x06,),
+    0x30: (0x06,),
+    0x40: (0x09,),
+    0x41: (0x06,),
+    0x42: (0x08,),
+    0x4E: (0x0A,),
+    0x4F: (0x0A,),
+    0x50: (0x08,),
+    0x51: (0x08,),
+    0x52: (0x0A,),
+    0x53: (0x09,),
+    0x54: (0x0D,),
+    0x55: (0x0B,),
+    0x56: (0x10,),
+    0x57: (0x09,),
+    0x58: (0x0D,),
+    0x59: (0x0D,),
+    0x5A: (0x11,),
+    0x5B: (0x13,),
+    0x5C: (0x0F,),
+    0x5D: (0x08,),
+    0x70: (0x07,),
+    0x71: (0x0A,),
+    0x72: (0x09,)
+    }
+
+FRAME_MINLEN = 0x04
+FRAME_MAXLEN = 0x40
+
+# ------------------------------------------------------------------------------
+
+class FrameReader(object):
+    """
+    Split the byte stream from the RFXtrx into length prefixed frames.
+
+    All available bytes are read in one call into a bytearray that is kept
+    between reads, so a frame split over several reads is completed by the
+    next one. A length byte that is out of range, does not match its packet
+    type, or starts a frame that never completes, is skipped one byte at a
+    time until the stream is in sync again.
+    """
+
+    def __init__(self, port=None, timeout=0.5):
+        self.port = port
+        self.timeout = timeout
+        self.buffer = bytearray()
+        self.partial_since = None
+        self.bytes = 0
+        self.frames = 0
+        self.dropped = 0
+
+    def read(self):
+        """
+        Read everything waiting on the serial port, return the list of
+        complete frames. Does not block if nothing is waiting.
+        """
+        waiting = self.port.inWaiting()
+        if waiting == 0:
+            return self.expire()
+        return self.feed(self.port.read(waiting))
+
+    def feed(self, data):
+        """
+        Add data to the buffer and return the list of complete frames
+        """
+        self.buffer.extend(data)
+        self.bytes += len(data)
+        self.timed_out()
+        return self.split()
+
+    def expire(self):
+        """
+        Resync when the buffered frame has been incomplete too long, return
+        the frames found after the dropped byte. Call it when no data has
+        arrived, an incomplete frame is otherwise only checked in feed().
+        """
+        if not self.timed_out():
+            return []
+        return self.split()
+
+    def timed_out(self):
+        """
+        Drop the first byte if the frame has been incomplete too long, a
+        frame that never completes had a bad length byte
+        """
+        if self.partial_since is None or \
+                time.time() - self.partial_since <= self.timeout:
+            return False
+        logger.debug("Incomplete frame timed out, resync")
+        self.resync()
+        return True
+
+    def split(self):
+        """
+        Take the complete frames from the start of the buffer
+        """
+        buf = self.buffer
+        frames = []
+
+        while buf:
+            length = buf[0]
+
+            if length < FRAME_MINLEN or length > FRAME_MAXLEN:
+                self.resync()
+                continue
+
+            if len(buf) > 1:
+                valid = FRAME_LENGTH.get(buf[1])
+                if valid is not None and length not in valid:
+                    self.resync()
+                    continue
+
+            if len(buf) < length + 1:
+                break
+
+            frames.append(str(buf[:length + 1]))
+            del buf[:length + 1]
+            self.frames += 1
+
+        if buf:
+            if self.partial_since is None:
+                self.partial_since = time.time()
+        else:
+            self.partial_since = None
+
+        return frames
+
+    def resync(self):
+        """
+        Drop the first byte in the buffer
+        """
+        logger.debug("Invalid length byte %02X, dropped" % self.buffer[0])
+        del self.buffer[0]
+        self.dropped += 1
+        self.partial_since = None
+
+    def reset(self):
+        """
+        Discard buffered data, use after the serial port is flushed
+        """
+        del self.buffer[:]
+        self.partial_since = None
+
+    def stats(self):
+        """
+        Return the counters, dropped is the bytes skipped to resync
+        """
+        return {
+            'bytes': self.bytes,
+            'frames': self.frames,
+            'dropped': self.dropped,
+            'buffered': len(self.buffer)
+            }
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
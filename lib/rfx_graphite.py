@@ -0,0 +1,220 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_GRAPHITE.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import time
+import struct
+import socket
+import logging
+import threading
+import collections
+import cPickle as pickle
+
+logger = logging.getLogger('rfxcmd')
+
+# Carbon protocols, plaintext and pickle over TCP, or plaintext over UDP
+PROTOCOLS = ('plaintext', 'pickle', 'udp')
+
+# Largest UDP datagram that is sent
+UDP_PAYLOAD = 1400
+
+# ------------------------------------------------------------------------------
+
+class GraphiteClient(object):
+    """
+    Send metric lines ("path value timestamp") to Carbon from a background
+    thread.
+
+    send() only adds the lines to a ring buffer of buffer_size lines, when
+    it is full the oldest lines are dropped. The thread sends the buffer
+    when batch_size lines are waiting or after interval seconds, over one
+    TCP connection that is kept open. After a failed connect or send the
+    lines stay in the buffer and the connection is retried with a backoff
+    that doubles up to max_backoff seconds.
+    """
+
+    def __init__(self, server, port, protocol='plaintext', batch_size=100, interval=1.0,
+            buffer_size=10000, max_backoff=60):
+        if protocol not in PROTOCOLS:
+            raise ValueError("unknown protocol '%s', use one of %s" % (protocol, ", ".join(PROTOCOLS)))
+
+        self.server = server
+        self.port = int(port)
+        self.protocol = protocol
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_backoff = max_backoff
+
+        self.buffer = collections.deque(maxlen=buffer_size)
+        self.cond = threading.Condition()
+        self.closed = False
+
+        self.sock = None
+        self.backoff = 0
+        self.retry_at = 0
+
+        self.sent = 0
+        self.dropped = 0
+        self.failures = 0
+
+        self.thread = threading.Thread(target=self.run, name="graphite")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def send(self, lines):
+        """
+        Queue the metric lines
+        """
+        with self.cond:
+            if self.closed:
+                return
+            overflow = len(self.buffer) + len(lines) - self.buffer.maxlen
+            if overflow > 0:
+                self.dropped += min(overflow, len(lines) + len(self.buffer))
+            self.buffer.extend(lines)
+            if len(self.buffer) >= self.batch_size:
+                self.cond.notify()
+
+    def stats(self):
+        """
+        Return the buffer depth and counters
+        """
+        with self.cond:
+            return {
+                'depth': len(self.buffer),
+                'sent': self.sent,
+                'dropped': self.dropped,
+                'failures': self.failures
+                }
+
+    def close(self, timeout=5):
+        """
+        Send what is buffered and close the connection
+        """
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        self.thread.join(timeout)
+
+    def run(self):
+        while True:
+            with self.cond:
+                if not self.closed:
+                    # While backing off a full buffer does not make it retry sooner
+                    backoff = self.retry_at - time.time()
+                    if backoff > 0:
+                        self.cond.wait(backoff)
+                    elif len(self.buffer) < self.batch_size:
+                        self.cond.wait(self.interval)
+                closed = self.closed
+
+            if self.buffer and (closed or time.time() >= self.retry_at):
+                self.flush()
+
+            if closed:
+                self.disconnect()
+                return
+
+    def flush(self):
+        """
+        Send the buffered lines in batches, keep them on failure
+        """
+        try:
+            while True:
+                with self.cond:
+                    count = min(len(self.buffer), self.batch_size)
+                    batch = [self.buffer[i] for i in range(count)]
+                if not batch:
+                    break
+                self.write(batch)
+                sent = 0
+                with self.cond:
+                    # Lines dropped from the ring while sending are already
+                    # counted as dropped
+                    for line in batch:
+                        if self.buffer and self.buffer[0] is line:
+                            self.buffer.popleft()
+                            sent += 1
+                    self.sent += sent
+                logger.debug("Graphite: %d lines sent" % sent)
+            self.backoff = 0
+        except (socket.error, socket.gaierror) as err:
+            self.failures += 1
+            self.backoff = min(max(self.backoff * 2, 1), self.max_backoff)
+            self.retry_at = time.time() + self.backoff
+            logger.error("Graphite error: %s, %d lines waiting, retry in %d sec" % (err, len(self.buffer), self.backoff))
+            self.disconnect()
+
+    def write(self, batch):
+        """
+        Send one batch with the configured protocol
+        """
+        if self.protocol == 'udp':
+            if self.sock is None:
+                family, socktype, proto, canonname, address = socket.getaddrinfo(self.server, self.port,
+                    socket.AF_UNSPEC, socket.SOCK_DGRAM)[0]
+                self.sock = socket.socket(family, socktype, proto)
+                self.sock.connect(address)
+            datagram = []
+            size = 0
+            for line in batch:
+                if datagram and size + len(line) + 1 > UDP_PAYLOAD:
+                    self.sock.send("\n".join(datagram) + "\n")
+                    datagram = []
+                    size = 0
+                datagram.append(line)
+                size += len(line) + 1
+            self.sock.send("\n".join(datagram) + "\n")
+            return
+
+        if self.sock is None:
+            logger.debug("Connect to Graphite %s:%d" % (self.server, self.port))
+            self.sock = socket.create_connection((self.server, self.port), 10)
+
+        if self.protocol == 'pickle':
+            metrics = []
+            for line in batch:
+                try:
+                    path, value, timestamp = line.split()
+                    metrics.append((path, (int(timestamp), float(value))))
+                except ValueError:
+                    logger.error("Graphite: invalid line '%s', skipped" % line)
+            payload = pickle.dumps(metrics, 2)
+            self.sock.sendall(struct.pack("!L", len(payload)) + payload)
+        else:
+            self.sock.sendall("\n".join(batch) + "\n")
+
+    def disconnect(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except socket.error:
+                pass
+            self.sock = None
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
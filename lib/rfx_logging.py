@@ -0,0 +1,154 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_LOGGING.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import logging
+import threading
+from collections import deque
+
+# ------------------------------------------------------------------------------
+
+class QueueListener(object):
+    """
+    Pass the log records put on the queue to handlers from a background
+    thread, so the file I/O of logging does not hold up the listener. The
+    thread sleeps on a condition until records are put, then writes all
+    that are queued. put() is a deque append, it only takes the lock to
+    wake the thread when the thread is idle.
+
+    Before start() and after stop() the records are handled at once by
+    the thread that logs them, so nothing is lost when the process exits
+    before the thread runs or is started before a fork.
+    """
+
+    def __init__(self, *handlers):
+        self.handlers = handlers
+        self.queue = deque()
+        self.cond = threading.Condition()
+        self.idle = False
+        self.stopped = False
+        self.thread = None
+
+    def start(self):
+        self.stopped = False
+        self.thread = threading.Thread(target=self.run, name="logging")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self, timeout=5):
+        """
+        Write the queued records and stop the thread
+        """
+        if self.thread is None:
+            return
+        thread, self.thread = self.thread, None
+        with self.cond:
+            self.stopped = True
+            self.cond.notify()
+        thread.join(timeout)
+        # Records put while the thread was stopping
+        self.drain()
+
+    def running(self):
+        return self.thread is not None
+
+    def put(self, record):
+        if self.thread is not None:
+            self.queue.append(record)
+            if self.idle:
+                with self.cond:
+                    self.cond.notify()
+        else:
+            self.handle(record)
+
+    def handle(self, record):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def drain(self):
+        queue = self.queue
+        while queue:
+            self.handle(queue.popleft())
+        for handler in self.handlers:
+            handler.flush()
+
+    def run(self):
+        while True:
+            with self.cond:
+                # idle is set before the queue is checked, so a record put
+                # after the check always finds it set and wakes the thread
+                self.idle = True
+                while not self.queue and not self.stopped:
+                    self.cond.wait()
+                self.idle = False
+                stopped = self.stopped
+            self.drain()
+            if stopped:
+                return
+
+# ------------------------------------------------------------------------------
+
+class QueueHandler(logging.Handler):
+    """
+    Put log records on the queue of listener. The message is formatted
+    here, in the logging thread, and the arguments are dropped so the
+    record can be handled later from another thread.
+    """
+
+    def __init__(self, listener):
+        logging.Handler.__init__(self)
+        self.listener = listener
+
+    def prepare(self, record):
+        record.msg = self.format(record)
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        return record
+
+    def emit(self, record):
+        try:
+            self.listener.put(self.prepare(record))
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except:
+            self.handleError(record)
+
+# ------------------------------------------------------------------------------
+
+def queue_logging(logger, *handlers):
+    """
+    Send the records of logger through a queue to handlers, return the
+    QueueListener. Call start() on it to move the I/O to its thread.
+    """
+    listener = QueueListener(*handlers)
+    logger.addHandler(QueueHandler(listener))
+    return listener
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
@@ -0,0 +1,230 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_METRICS.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import time
+import bisect
+import logging
+import threading
+
+logger = logging.getLogger('rfxcmd')
+
+# Upper bounds of the histogram buckets in seconds, from 1 us to about 2
+# minutes, four buckets per doubling so a percentile is within 19 %
+BOUNDS = [1e-6 * 2 ** (i / 4.0) for i in range(108)]
+
+# ------------------------------------------------------------------------------
+
+class Histogram(object):
+    """
+    Latency histogram with fixed logarithmic buckets, observe() costs the
+    same however many values are recorded
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent):
+        """
+        Return the upper bound of the bucket that holds the percentile
+        """
+        if not self.count:
+            return 0.0
+        rank = self.count * percent / 100.0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if index < len(BOUNDS):
+                    return min(BOUNDS[index], self.max)
+                break
+        return self.max
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max
+            }
+
+# ------------------------------------------------------------------------------
+
+class Timer(object):
+    """
+    Context manager that observes the time of its block, an exception in
+    the block counts name.errors and is passed on
+    """
+
+    __slots__ = ('metrics', 'name', 'started')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.metrics.observe(self.name, time.time() - self.started)
+        if exc_type is not None:
+            self.metrics.count(self.name + '.errors')
+        return False
+
+# ------------------------------------------------------------------------------
+
+class Metrics(object):
+    """
+    Named latency histograms of the processing stages, named counters, and
+    the stats() of the output threads registered as sources
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.sources = {}
+        self.started = time.time()
+
+    def observe(self, name, seconds):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def time(self, name):
+        """
+        Return a Timer for a with block
+        """
+        return Timer(self, name)
+
+    def register(self, name, stats):
+        """
+        Add a source, stats is a function that returns a dict of counters
+        """
+        with self.lock:
+            self.sources[name] = stats
+
+    def unregister(self, name):
+        with self.lock:
+            self.sources.pop(name, None)
+
+    def snapshot(self):
+        """
+        Return {name: {count, mean, p50, p90, p99, max}}, times in seconds
+        """
+        with self.lock:
+            return dict([(name, histogram.as_dict()) for name, histogram in self.histograms.iteritems()])
+
+    def report(self):
+        """
+        Return the uptime, counters, stage latencies and the stats of each
+        source. A source that fails is left out.
+        """
+        with self.lock:
+            counters = dict(self.counters)
+            sources = self.sources.items()
+        report = {
+            'uptime': time.time() - self.started,
+            'counters': counters,
+            'stages': self.snapshot(),
+            'sources': {}
+            }
+        for name, stats in sources:
+            try:
+                report['sources'][name] = stats()
+            except Exception as err:
+                logger.error("Error when trying to get stats of %s, %s" % (name, err))
+        return report
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.counters = {}
+            self.started = time.time()
+
+# The metrics of this process
+metrics = Metrics()
+
+# ------------------------------------------------------------------------------
+
+def format_report(report):
+    """
+    Return the report as one line for the log, times in milliseconds
+    """
+    parts = ["uptime=%ds" % report['uptime']]
+    parts.extend(["%s=%s" % item for item in sorted(report['counters'].items())])
+    for name, stage in sorted(report['stages'].items()):
+        parts.append("%s=%d/%.3f/%.3f/%.3fms" % (name, stage['count'], stage['p50'] * 1000,
+            stage['p99'] * 1000, stage['max'] * 1000))
+    for name, stats in sorted(report['sources'].items()):
+        parts.append("%s(%s)" % (name, ",".join(["%s=%s" % item for item in sorted(stats.items())
+            if not isinstance(item[1], dict)])))
+    return " ".join(parts)
+
+class StatsLogger(object):
+    """
+    Write the report of metrics to the log every interval seconds, at level
+    info. Stages are written as count/p50/p99/max.
+    """
+
+    def __init__(self, interval, metrics=metrics):
+        self.interval = interval
+        self.metrics = metrics
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="stats")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            logger.info("Stats: " + format_report(self.metrics.report()))
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join(1)
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
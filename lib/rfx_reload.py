@@ -0,0 +1,101 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_RELOAD.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import os
+import logging
+import threading
+
+logger = logging.getLogger('rfxcmd')
+
+# ------------------------------------------------------------------------------
+
+class Reloader(object):
+    """
+    Call a reload function from a background thread, when request() is
+    called (e.g. from the SIGHUP handler) or when one of the files has
+    a new modification time. With interval 0 the files are not watched.
+
+    Requests that arrive while a reload runs are merged into one more
+    reload. The reload function builds the new tables and swaps them in
+    with a single assignment, so the listener is never blocked.
+    """
+
+    def __init__(self, reload, files=(), interval=0):
+        self.reload = reload
+        self.files = [f for f in files if f]
+        self.interval = interval
+        self.requested = threading.Event()
+        self.mtimes = self.stat()
+        self.reloads = 0
+
+        self.thread = threading.Thread(target=self.run, name="reload")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def request(self):
+        """
+        Ask for a reload, safe to call from a signal handler
+        """
+        self.requested.set()
+
+    def stat(self):
+        """
+        Return the modification time of each file, None if it is missing
+        """
+        mtimes = {}
+        for filename in self.files:
+            try:
+                mtimes[filename] = os.stat(filename).st_mtime
+            except OSError:
+                mtimes[filename] = None
+        return mtimes
+
+    def run(self):
+        while True:
+            if self.interval:
+                requested = self.requested.wait(self.interval)
+            else:
+                requested = self.requested.wait()
+            self.requested.clear()
+
+            mtimes = self.stat()
+            if not requested:
+                if mtimes == self.mtimes:
+                    continue
+                changed = [f for f in self.files if mtimes[f] != self.mtimes[f]]
+                logger.info("Changed: " + ", ".join(changed))
+            self.mtimes = mtimes
+
+            try:
+                self.reload()
+                self.reloads += 1
+            except Exception as err:
+                logger.exception("Reload failed: %s" % err)
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
@@ -31,15 +31,14 @@
 
 # ------------------------------------------------------------------------------
 
-try:
-	import rrdtool
-except ImportError:
-	pass
+# rrdtool is imported on the first update, when rrd_active is set
 
 import os
 
 def rrd1Metric (sensortype, sensorid, metric1, rrd_root):
 	
+	import rrdtool
+	
 	DS1 = "metric1"
 	
 	# ensure rrd dir exist
@@ -69,6 +68,8 @@ def rrd1Metric (sensortype, sensorid, metric1, rrd_root):
 
 def rrd2Metrics (sensortype, sensorid, metric1, metric2, rrd_root):
 	
+	import rrdtool
+	
 	DS1 = "metric1"
 	DS2 = "metric2"
 	
@@ -28,16 +28,20 @@
 #
 # ------------------------------------------------------------------------------
 
+import os
+import sys
 import time
+import json
+import errno
+import select
+import socket
 import logging
 import threading
 
 from Queue import Queue
 messageQueue = Queue()
 
-import SocketServer
-SocketServer.TCPServer.allow_reuse_address = True
-from SocketServer import (TCPServer, StreamRequestHandler)
+from collections import OrderedDict
 
 # Import WEEWX extension
 try:
@@ -46,100 +50,527 @@ except ImportError:
 	print "Error: module lib/weewx.py not found"
 	sys.exit(1)
 
+import lib.rfx_state as sensorstate
+from lib.rfx_metrics import metrics
+
 logger = logging.getLogger('rfxcmd')
 	
 # ------------------------------------------------------------------------------
 
-class NetRequestHandler(StreamRequestHandler):
+class QueueWakeup(object):
+	"""
+	Self-pipe that makes the messageQueue selectable. Each message put on
+	the queue writes one byte to the pipe, so a select() loop waiting on the
+	read end wakes up as soon as a message arrives.
+	"""
+	def __init__(self):
+		import fcntl
+		self.readfd, self.writefd = os.pipe()
+		for fd in (self.readfd, self.writefd):
+			flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+			fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+	def fileno(self):
+		return self.readfd
+
+	def notify(self):
+		try:
+			os.write(self.writefd, 'x')
+		except OSError:
+			# Pipe is full, the reader is already due to wake up
+			pass
+
+	def clear(self):
+		try:
+			while os.read(self.readfd, 512):
+				pass
+		except OSError:
+			pass
+
+# Not available on Windows, where select() only works with sockets
+if sys.platform == 'win32':
+	messageWakeup = None
+else:
+	messageWakeup = QueueWakeup()
+
+def queue_message(message):
+	"""
+	Put message on the messageQueue and wake up the listen loop
+	"""
+	messageQueue.put(message)
+	if messageWakeup is not None:
+		messageWakeup.notify()
+
+# ------------------------------------------------------------------------------
+
+class Subscription(object):
+	"""
+	The events a SUBSCRIBE client asked for and the lines waiting to be
+	sent to it. When more than max_pending lines wait, the drop policy
+	removes the oldest line, the coalesce policy keeps only the latest
+	line of each sensor.
+	"""
+	
+	def __init__(self, format='json', packettypes=None, ids=None, policy='drop', max_pending=1000):
+		if format not in sensorstate.EVENT_FORMATS:
+			raise ValueError("unknown format '%s'" % format)
+		if policy not in ('drop', 'coalesce'):
+			raise ValueError("unknown policy '%s'" % policy)
+		self.format = format
+		self.packettypes = packettypes
+		self.ids = ids
+		self.policy = policy
+		self.max_pending = max_pending
+		self.pending = OrderedDict()
+		self.count = 0
+		self.dropped = 0
+	
+	def matches(self, packettype, sid):
+		return ((self.packettypes is None or packettype in self.packettypes)
+			and (self.ids is None or sid in self.ids))
+	
+	def add(self, key, line):
+		if self.policy == 'coalesce':
+			if self.pending.pop(key, None) is not None:
+				self.dropped += 1
+		else:
+			self.count += 1
+			key = self.count
+		if len(self.pending) >= self.max_pending:
+			self.pending.popitem(last=False)
+			self.dropped += 1
+		self.pending[key] = line
+
+def parse_subscribe(line):
+	"""
+	Return the Subscription of SUBSCRIBE[;format=json|csv][;type=52,50]
+	[;id=0501][;policy=drop|coalesce], raise ValueError if it is invalid
+	"""
+	options = {}
+	for field in line.strip().split(';')[1:]:
+		name, sep, value = field.partition('=')
+		if not sep:
+			raise ValueError("expected name=value, got '%s'" % field)
+		options[name.strip().lower()] = value.strip()
+	
+	unknown = set(options) - set(['format', 'type', 'id', 'policy'])
+	if unknown:
+		raise ValueError("unknown option " + ", ".join(sorted(unknown)))
+	
+	packettypes = None
+	if options.get('type'):
+		packettypes = set()
+		for packettype in options['type'].split(','):
+			packettype = packettype.strip().upper()
+			if packettype.startswith('0X'):
+				packettype = packettype[2:]
+			packettypes.add(packettype)
+	
+	ids = None
+	if options.get('id'):
+		ids = set([sid.strip() for sid in options['id'].split(',')])
+	
+	return Subscription(options.get('format', 'json').lower(), packettypes, ids,
+		options.get('policy', 'drop').lower())
+
+class EventStream(object):
+	"""
+	Hand the decoded events from the listener to the subscribed socket
+	clients. publish() formats each event once per format and adds it to
+	the matching subscriptions, the socket server thread takes the lines
+	when the client has room for them, so a slow client only loses its
+	own events.
+	"""
+	
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.subscriptions = []
+		self.published = 0
+		self.wakeup = None if sys.platform == 'win32' else QueueWakeup()
+	
+	def subscribe(self, subscription):
+		with self.lock:
+			self.subscriptions.append(subscription)
+	
+	def unsubscribe(self, subscription):
+		with self.lock:
+			if subscription in self.subscriptions:
+				self.subscriptions.remove(subscription)
+	
+	def publish(self, result):
+		"""
+		Add a decoder result to the matching subscriptions
+		"""
+		if not self.subscriptions:
+			return
+		packettype = result['packettype']
+		if packettype < '10':
+			return
+		sid = sensorstate.sensor_id(result)
+		key = (packettype, result.get('subtype'), sid)
+		lines = {}
+		
+		with self.lock:
+			for subscription in self.subscriptions:
+				if not subscription.matches(packettype, sid):
+					continue
+				line = lines.get(subscription.format)
+				if line is None:
+					line = lines[subscription.format] = sensorstate.EVENT_FORMATS[subscription.format](result)
+				subscription.add(key, line)
+			self.published += 1
+		
+		if lines and self.wakeup is not None:
+			self.wakeup.notify()
+	
+	def take(self, subscription):
+		"""
+		Return the lines waiting for a subscription
+		"""
+		with self.lock:
+			lines = subscription.pending.values()
+			subscription.pending.clear()
+		return lines
+	
+	def stats(self):
+		with self.lock:
+			return {
+				'subscribers': len(self.subscriptions),
+				'published': self.published,
+				'dropped': sum([s.dropped for s in self.subscriptions])
+				}
+
+# The event stream of this process
+events = EventStream()
+
+# ------------------------------------------------------------------------------
+
+# WeeWx v2 requests, "WEEWX;0x52", and the function that answers them
+WEEWX_SENSORS = {
+	'0x52': 'weewx_0x52',
+	'0x53': 'weewx_0x53',
+	'0x54': 'weewx_0x54',
+	'0x55': 'weewx_0x55',
+	'0x56': 'weewx_0x56',
+	'0x57': 'weewx_0x57'
+	}
+
+# Legacy WeeWx request
+WEEWX_LEGACY = '0A1100FF001100FF001100'
+
+def weewx_batch(sensors):
+	"""
+	Answer "WEEWX;0x52,0x56" or "WEEWX;ALL" with the data of all the
+	sensors in one line, "0x52=data|0x56=data". Unknown sensors are left out.
+	"""
+	if sensors.strip().upper() == "ALL":
+		sensors = sorted(WEEWX_SENSORS)
+	else:
+		sensors = [sensor.strip() for sensor in sensors.split(',')]
+	logger.debug("Send WeeWx data for sensors %s" % ", ".join(sensors))
+	return '|'.join(["%s=%s" % (sensor, getattr(wwx, WEEWX_SENSORS[sensor])())
+		for sensor in sensors if sensor in WEEWX_SENSORS])
+
+def answer(line):
+	"""
+	Handle one line from a client, return the reply or None. Everything
+	except sensor state queries is put on the messageQueue for the listener.
+	"""
+	# Sensor state query, answered here without the listener
+	if line[0:5] == "STATE":
+		logger.debug("Sensor state query: " + line.strip())
+		return sensorstate.query_json(line) + '\n'
+	
+	# Counters, stage latency and output stats
+	if line.strip() == "STATS":
+		logger.debug("Stats query")
+		return json.dumps(metrics.report(), sort_keys=True) + '\n'
+	
+	queue_message(line)
+	logger.debug("Message read from socket: " + line.strip())
+	
+	# WEEWX incoming string
+	if line.strip() == WEEWX_LEGACY:
+		logger.debug("WeeWx request, send data to WeeWx")
+		return "Received request weewx weatherstation - ok\n" + wwx.weewx_result() + '\n' + "Sent result - ok\n"
+	
+	# WEEWX v2
+	if line[0:5] == "WEEWX":
+		logger.debug("Process WeeWx request")
+		indata = line.split(';')
+		sensor = indata[1].strip() if len(indata) > 1 else ""
+		if sensor in WEEWX_SENSORS:
+			logger.debug("Send WeeWx data for sensor %s" % sensor)
+			return getattr(wwx, WEEWX_SENSORS[sensor])()
+		if sensor.upper() == "ALL" or ',' in sensor:
+			return weewx_batch(sensor)
+		logger.debug("Unknown WeeWx sensor: %s" % sensor)
+		return ""
+	
+	return None
+
+# ------------------------------------------------------------------------------
+
+class SocketClient(object):
+	"""
+	One client connection. Requests are lines, a connection may send any
+	number of them. A request that has a reply (STATE, STATS, WEEWX) closes the
+	connection after the reply is sent, as old clients read the reply until
+	the connection closes. A client that first sends PERSISTENT keeps the
+	connection open, each reply then ends with a newline. SUBSCRIBE also
+	keeps the connection open and streams the decoded events to it.
+	"""
+	
+	def __init__(self, sock, address):
+		self.sock = sock
+		# Kept, the fileno of a closed socket raises EBADF
+		self.fd = sock.fileno()
+		self.address = address
+		self.inbuf = ''
+		self.outbuf = ''
+		self.persistent = False
+		self.closing = False
+		self.subscription = None
+		self.last_active = time.time()
+	
+	def fileno(self):
+		return self.fd
 	
-	def handle(self):
-		logger.debug("Client connected to [%s:%d]" % self.client_address)
-		lg = self.rfile.readline()
-		messageQueue.put(lg)
-		logger.debug("Message read from socket: " + lg.strip())
+	def lines(self):
+		"""
+		Return the complete lines that were received
+		"""
+		lines = self.inbuf.split('\n')
+		self.inbuf = lines.pop()
+		return [line + '\n' for line in lines]
+	
+	def request(self, line):
+		"""
+		Handle one request line
+		"""
+		if self.closing:
+			return
+		if line.strip() == "PERSISTENT":
+			logger.debug("Persistent connection [%s:%d]" % self.address)
+			self.persistent = True
+			self.outbuf += "OK\n"
+			return
 		
-		# WEEWX incoming string
-		if lg.strip() == '0A1100FF001100FF001100':
-			logger.debug("WeeWx request, send data to WeeWx")
+		if line[0:9] == "SUBSCRIBE":
 			try:
-				self.wfile.write("Received request weewx weatherstation - ok\n")
-				self.wfile.write(wwx.weewx_result() + '\n')
-				self.wfile.write("Sent result - ok\n")
-			except Exception, e:
-				logger.debug("Error: WeeWx data send failed")
-				logger.debug("Error: %s" % str(e))
-				pass
+				subscription = parse_subscribe(line)
+			except ValueError, err:
+				logger.error("Error: invalid subscribe request '%s', %s" % (line.strip(), err))
+				self.outbuf += "ERROR %s\n" % err
+				self.closing = not self.persistent
+				return
+			logger.debug("Client subscribed [%s:%d]: %s" % (self.address + (line.strip(),)))
+			if self.subscription is not None:
+				events.unsubscribe(self.subscription)
+			self.subscription = subscription
+			events.subscribe(subscription)
+			self.persistent = True
+			self.outbuf += "OK\n"
+			return
 		
-		# WEEWX v2
-		if lg[0:5] == "WEEWX":
-			logger.debug("Process WeeWx request")
-			indata = lg.split(';')
-			logger.debug("Indata[0]: %s" % str(indata[0].strip()))
-			logger.debug("Indata[1]: %s" % str(indata[1].strip()))
-			
-			# Sensor 0x4f
-			if indata[1].strip() == "0x4f":
-				logger.debug("Send WeeWx data for sensor 0x4f")
-				self.wfile.write(wwx.weewx_0x4f())
-			
-			# Sensor 0x50
-			if indata[1].strip() == "0x50":
-				logger.debug("Send WeeWx data for sensor 0x50")
-				self.wfile.write(wwx.weewx_0x50())
-			
-			# Sensor 0x51
-			if indata[1].strip() == "0x51":
-				logger.debug("Send WeeWx data for sensor 0x51")
-				self.wfile.write(wwx.weewx_0x51())
-			
-			# Sensor 0x52
-			if indata[1].strip() == "0x52":
-				logger.debug("Send WeeWx data for sensor 0x52")
-				self.wfile.write(wwx.weewx_0x52())
-			
-			# Sensor 0x53
-			if indata[1].strip() == "0x53":
-				logger.debug("Send WeeWx data for sensor 0x53")
-				self.wfile.write(wwx.weewx_0x53())
-			
-			# Sensor 0x54
-			if indata[1].strip() == "0x54":
-				logger.debug("Send WeeWx data for sensor 0x54")
-				self.wfile.write(wwx.weewx_0x54())
-			
-			# Sensor 0x55
-			if indata[1].strip() == "0x55":
-				logger.debug("Send WeeWx data for sensor 0x55")
-				self.wfile.write(wwx.weewx_0x55())
-			
-			# Sensor 0x56
-			if indata[1].strip() == "0x56":
-				logger.debug("Send WeeWx data for sensor 0x56")
-				self.wfile.write(wwx.weewx_0x56())
-			
-			# Sensor 0x57
-			if indata[1].strip() == "0x57":
-				logger.debug("Send WeeWx data for sensor 0x57")
-				self.wfile.write(wwx.weewx_0x57())
+		try:
+			reply = answer(line)
+		except Exception, err:
+			logger.error("Error: socket request '%s' failed, %s" % (line.strip(), err))
+			reply = "ERROR %s\n" % err
 		
-		self.netAdapterClientConnected = False
-		logger.debug("Client disconnected from [%s:%d]" % self.client_address)
+		if reply is None:
+			return
+		if self.persistent:
+			if not reply.endswith('\n'):
+				reply += '\n'
+		else:
+			self.closing = True
+		self.outbuf += reply
+
+class RFXcmdSocketAdapter(object):
+	"""
+	Socket server for rfxsend.py, WeeWx and sensor state queries. A single
+	thread serves all clients with select(), so a slow or idle client does
+	not hold up the others. Messages for the RFXtrx go to the messageQueue,
+	which wakes up the listener at once. Subscribers get new events when
+	less than stream_buffer bytes are waiting to be sent to them.
+	"""
 	
-class RFXcmdSocketAdapter(object, StreamRequestHandler):
-	def __init__(self, address='localhost', port=55000):
+	def __init__(self, address='localhost', port=55000, max_clients=256, idle_timeout=300, max_output=1048576, stream_buffer=65536):
 		self.Address = address
 		self.Port = port
-
-		self.netAdapter = TCPServer((self.Address, self.Port), NetRequestHandler)
-		if self.netAdapter:
-			self.netAdapterRegistered = True
-			threading.Thread(target=self.loopNetServer, args=()).start()
-
+		self.max_clients = max_clients
+		self.idle_timeout = idle_timeout
+		self.max_output = max_output
+		self.stream_buffer = stream_buffer
+		self.clients = {}
+		self.running = True
+		
+		self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+		self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+		self.server.bind((self.Address, self.Port))
+		self.server.listen(socket.SOMAXCONN)
+		self.server.setblocking(0)
+		self.netAdapterRegistered = True
+		
+		self.accepted = 0
+		self.refused = 0
+		self.overflows = 0
+		metrics.register('socket', self.stats)
+		
+		self.thread = threading.Thread(target=self.loopNetServer, args=(), name="socketserver")
+		self.thread.daemon = True
+		self.thread.start()
+	
+	def shutdown(self):
+		"""
+		Stop serving and close all connections
+		"""
+		metrics.unregister('socket')
+		self.running = False
+		self.thread.join(2)
+	
+	def stats(self):
+		"""
+		Return the client counters and the event stream stats
+		"""
+		clients = self.clients.values()
+		stats = events.stats()
+		stats.update({
+			'clients': len(clients),
+			'pending': sum([len(c.outbuf) for c in clients]),
+			'accepted': self.accepted,
+			'refused': self.refused,
+			'overflows': self.overflows
+			})
+		return stats
+	
 	def loopNetServer(self):
 		logger.debug("LoopNetServer Thread started")
 		logger.debug("Listening on: [%s:%d]" % (self.Address, self.Port))
-		self.netAdapter.serve_forever()
+		
+		while self.running:
+			readers = [self.server] + self.clients.values()
+			if events.wakeup is not None:
+				readers.append(events.wakeup)
+			writers = [c for c in self.clients.itervalues() if c.outbuf]
+			try:
+				readable, writable = select.select(readers, writers, [], 0.5)[0:2]
+			except select.error, err:
+				if err.args[0] == errno.EINTR:
+					continue
+				raise
+			
+			# A client can be closed by write() while it is still in readable
+			for client in writable:
+				if self.clients.get(client.fd) is client:
+					self.serve(self.write, client)
+			
+			for item in readable:
+				if item is self.server:
+					self.accept()
+				elif item is events.wakeup:
+					events.wakeup.clear()
+				elif self.clients.get(item.fd) is item:
+					self.serve(self.read, item)
+			
+			# Move the waiting events to the subscribers that have room
+			for client in self.clients.itervalues():
+				if client.subscription is not None and len(client.outbuf) < self.stream_buffer:
+					client.outbuf += ''.join(events.take(client.subscription))
+			
+			if self.idle_timeout:
+				expired = time.time() - self.idle_timeout
+				for client in self.clients.values():
+					if client.subscription is None and client.last_active < expired:
+						logger.debug("Client idle, disconnect [%s:%d]" % client.address)
+						self.disconnect(client)
+		
+		for client in self.clients.values():
+			self.disconnect(client)
+		self.server.close()
 		logger.debug("LoopNetServer Thread stopped")
+	
+	def serve(self, handler, client):
+		"""
+		Call handler for one client, an error only drops that client
+		"""
+		try:
+			handler(client)
+		except Exception, err:
+			logger.error("Error: socket client failed [%s:%d], %s" % (client.address + (err,)))
+			self.disconnect(client)
+	
+	def accept(self):
+		try:
+			sock, address = self.server.accept()
+		except socket.error, err:
+			if err.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK, errno.ECONNABORTED):
+				return
+			raise
+		if len(self.clients) >= self.max_clients:
+			logger.error("Error: too many socket clients, refused [%s:%d]" % address)
+			self.refused += 1
+			sock.close()
+			return
+		self.accepted += 1
+		sock.setblocking(0)
+		client = SocketClient(sock, address)
+		self.clients[client.fd] = client
+		logger.debug("Client connected to [%s:%d]" % address)
+	
+	def read(self, client):
+		try:
+			data = client.sock.recv(4096)
+		except socket.error, err:
+			if err.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+				return
+			data = ''
+		client.last_active = time.time()
+		
+		if data:
+			client.inbuf += data
+			for line in client.lines():
+				client.request(line)
+		else:
+			# End of input, a request without newline is still handled
+			if client.inbuf:
+				line, client.inbuf = client.inbuf, ''
+				client.request(line)
+			client.closing = True
+		
+		if len(client.outbuf) > self.max_output:
+			logger.error("Error: socket client does not read its replies, disconnect [%s:%d]" % client.address)
+			self.overflows += 1
+			self.disconnect(client)
+		elif client.closing and not client.outbuf:
+			self.disconnect(client)
+	
+	def write(self, client):
+		try:
+			sent = client.sock.send(client.outbuf)
+		except socket.error, err:
+			if err.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+				return
+			self.disconnect(client)
+			return
+		client.outbuf = client.outbuf[sent:]
+		client.last_active = time.time()
+		if client.closing and not client.outbuf:
+			self.disconnect(client)
+	
+	def disconnect(self, client):
+		if self.clients.get(client.fd) is not client:
+			return
+		del self.clients[client.fd]
+		if client.subscription is not None:
+			events.unsubscribe(client.subscription)
+		try:
+			client.sock.close()
+		except socket.error:
+			pass
+		logger.debug("Client disconnected from [%s:%d]" % client.address)
 
 # ------------------------------------------------------------------------------
 # END
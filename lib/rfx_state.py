@@ -0,0 +1,205 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_STATE.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import json
+import threading
+from collections import OrderedDict
+
+# Keys of the decoder result that are not sensor values
+HEADER_KEYS = frozenset(['raw', 'packettype', 'subtype', 'seqnbr', 'id1', 'id2', 'id',
+    'signal', 'battery', 'timestamp', 'unixtime'])
+
+# ------------------------------------------------------------------------------
+
+def sensor_id(result):
+    """
+    Return the sensor id of a decoder result: the id, or the housecode
+    or id1 when the packet has no id, with the unitcode appended for
+    lighting packets
+    """
+    sid = result.get('id') or result.get('housecode') or result.get('id1', '')
+    if 'unitcode' in result:
+        sid = "%s:%s" % (sid, result['unitcode'])
+    return str(sid)
+
+def event_values(result):
+    """
+    Return the sensor values of a decoder result
+    """
+    return dict([(k, v) for k, v in result.iteritems() if k not in HEADER_KEYS])
+
+# ------------------------------------------------------------------------------
+
+class SensorState(object):
+    """
+    The latest values of one sensor
+    """
+
+    __slots__ = ('packettype', 'subtype', 'id', 'values', 'raw', 'unixtime', 'signal', 'battery', 'count')
+
+    def __init__(self, packettype, subtype, id):
+        self.packettype = packettype
+        self.subtype = subtype
+        self.id = id
+        self.values = None
+        self.raw = None
+        self.unixtime = None
+        self.signal = None
+        self.battery = None
+        self.count = 0
+
+    def as_dict(self):
+        return {
+            'packettype': self.packettype,
+            'subtype': self.subtype,
+            'id': self.id,
+            'values': self.values,
+            'raw': self.raw,
+            'unixtime': self.unixtime,
+            'signal': self.signal,
+            'battery': self.battery,
+            'count': self.count
+            }
+
+# ------------------------------------------------------------------------------
+
+class SensorStore(object):
+    """
+    The latest decoded values of every sensor seen, keyed on
+    (packettype, subtype, sensor id). Holds at most max_sensors sensors,
+    the one not heard from the longest is removed first.
+
+    update() is called from the listener, query() from the socket server
+    thread, so both take the lock and query() returns copies.
+    """
+
+    def __init__(self, max_sensors=1024):
+        self.max_sensors = max_sensors
+        self.sensors = OrderedDict()
+        self.lock = threading.Lock()
+
+    def update(self, result):
+        """
+        Store the decoder result of one packet. Interface packets
+        (packettype below 0x10) are not sensors and are ignored.
+        """
+        packettype = result['packettype']
+        if packettype < '10':
+            return
+        key = (packettype, result.get('subtype'), sensor_id(result))
+        values = event_values(result)
+
+        with self.lock:
+            state = self.sensors.pop(key, None)
+            if state is None:
+                state = SensorState(*key)
+                if len(self.sensors) >= self.max_sensors:
+                    self.sensors.popitem(last=False)
+            self.sensors[key] = state
+            state.values = values
+            state.raw = result['raw']
+            state.unixtime = result.get('unixtime')
+            state.signal = result.get('signal')
+            state.battery = result.get('battery')
+            state.count += 1
+
+    def query(self, packettype=None, subtype=None, id=None):
+        """
+        Return the state of the matching sensors as a list of dicts, a
+        filter that is None matches all
+        """
+        with self.lock:
+            return [state.as_dict() for key, state in self.sensors.iteritems()
+                if (packettype is None or key[0] == packettype)
+                and (subtype is None or key[1] == subtype)
+                and (id is None or key[2] == id)]
+
+    def __len__(self):
+        return len(self.sensors)
+
+# ------------------------------------------------------------------------------
+
+def parse_query(line):
+    """
+    Return the filters of a socket query, STATE[;packettype[;subtype[;id]]],
+    the packettype may be written as 0x52
+    """
+    fields = [f.strip() for f in line.strip().split(';')[1:]]
+    fields = [f or None for f in fields] + [None] * 3
+    packettype, subtype, id = fields[:3]
+    if packettype is not None:
+        if packettype.lower().startswith('0x'):
+            packettype = packettype[2:]
+        packettype = packettype.upper()
+    if subtype is not None:
+        subtype = subtype.upper()
+    return packettype, subtype, id
+
+def query_json(line):
+    """
+    Answer a socket query with a JSON list of sensors
+    """
+    return json.dumps(sensors.query(*parse_query(line)), sort_keys=True)
+
+def event_json(result):
+    """
+    Return a decoder result as one line of JSON
+    """
+    return json.dumps({
+        'packettype': result['packettype'],
+        'subtype': result.get('subtype'),
+        'id': sensor_id(result),
+        'values': event_values(result),
+        'unixtime': result.get('unixtime'),
+        'signal': result.get('signal'),
+        'battery': result.get('battery')
+        }, sort_keys=True) + '\n'
+
+def event_csv(result):
+    """
+    Return a decoder result as one compact line,
+    unixtime,packettype,subtype,id,signal,battery,name=value,...
+    """
+    fields = [result.get('unixtime'), result['packettype'], result.get('subtype'),
+        sensor_id(result), result.get('signal'), result.get('battery')]
+    fields = ['' if f is None else str(f) for f in fields]
+    fields.extend(["%s=%s" % item for item in sorted(event_values(result).iteritems())])
+    return ','.join(fields) + '\n'
+
+EVENT_FORMATS = {
+    'json': event_json,
+    'csv': event_csv
+    }
+
+# ------------------------------------------------------------------------------
+
+# The sensor store of this process
+sensors = SensorStore()
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
@@ -0,0 +1,107 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_TRIGGER.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import re
+import logging
+
+logger = logging.getLogger('rfxcmd')
+
+# Placeholder in an action, e.g. $temperature$
+PLACEHOLDER = re.compile(r'\$(\w+)\$')
+
+# A message pattern that starts with the length and packettype as plain
+# characters, not followed by a quantifier and without alternatives
+PACKETTYPE_PREFIX = re.compile(r'^[0-9A-Za-z.]{4}(?![*+?{])')
+
+# ------------------------------------------------------------------------------
+
+class Trigger(object):
+    """
+    One trigger from trigger.xml, with the message compiled and the action
+    split into a template of literal text and placeholder names
+    """
+
+    def __init__(self, message, action):
+        self.message = message
+        self.action = action
+        self.regex = re.compile(message)
+
+        # re.split() with a group gives literal, name, literal, ... literal
+        parts = PLACEHOLDER.split(action)
+        self.literals = parts[0::2]
+        self.names = parts[1::2]
+
+        if PACKETTYPE_PREFIX.match(message) and '|' not in message and '.' not in message[2:4]:
+            self.packettype = message[2:4]
+        else:
+            self.packettype = None
+
+    def render(self, values):
+        """
+        Return the action with the placeholders replaced from values, a
+        placeholder without a value is left as it is
+        """
+        if not self.names:
+            return self.action
+        literals = self.literals
+        action = [literals[0]]
+        for i, name in enumerate(self.names):
+            if name in values:
+                action.append(values[name])
+            else:
+                action.append("$" + name + "$")
+            action.append(literals[i + 1])
+        return "".join(action)
+
+# ------------------------------------------------------------------------------
+
+class TriggerIndex(object):
+    """
+    The triggers indexed on packettype. A trigger whose message does not
+    start with a fixed packettype is tested for every packet. The triggers
+    for a packettype are kept in the order of trigger.xml, so
+    trigger_onematch stops at the same trigger as before.
+    """
+
+    def __init__(self, triggers):
+        self.triggers = list(triggers)
+        self.by_type = {}
+
+    def candidates(self, packettype):
+        """
+        Return the triggers that can match a packet of packettype
+        """
+        try:
+            return self.by_type[packettype]
+        except KeyError:
+            triggers = [t for t in self.triggers if t.packettype is None or t.packettype == packettype]
+            self.by_type[packettype] = triggers
+            return triggers
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
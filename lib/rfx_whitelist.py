@@ -0,0 +1,129 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFX_WHITELIST.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Version history can be found at
+#   http://code.google.com/p/rfxcmd/wiki/VersionHistory
+#
+# ------------------------------------------------------------------------------
+
+import re
+import logging
+from operator import itemgetter
+from collections import OrderedDict
+
+logger = logging.getLogger('rfxcmd')
+
+# A whitelist entry made of hex digits and '.' only matches on fixed positions
+FIXED_PATTERN = re.compile(r'^[0-9A-Fa-f.]*$')
+
+# ------------------------------------------------------------------------------
+
+class WhitelistMatcher(object):
+    """
+    Match raw messages (hex string without spaces) against the whitelist.
+
+    All entries are compiled once into a single regex. The decisions are
+    kept in an LRU cache. When every entry only uses hex digits and '.',
+    the cache key is the message length and the characters at the
+    positions any entry checks, i.e. packet type, subtype and sensor id
+    for a normal whitelist, so every message from a known sensor is a
+    cache hit. Otherwise the whole message is the key.
+    """
+
+    def __init__(self, patterns, cache_size=1024):
+        self.patterns = list(patterns)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.regex = None
+        self.regex_list = []
+        try:
+            if self.patterns:
+                self.regex = re.compile("|".join(["(?:%s)" % p for p in self.patterns]))
+        except re.error as err:
+            # Entries that cannot be combined, e.g. with backreferences
+            logger.debug("Whitelist cannot be combined, %s" % str(err))
+            self.regex_list = [re.compile(p) for p in self.patterns]
+
+        self.positions = None
+        self.key_length = 0
+        self.getters = {}
+        if self.patterns and all([FIXED_PATTERN.match(p) for p in self.patterns]):
+            positions = set()
+            for pattern in self.patterns:
+                positions.update([i for i, c in enumerate(pattern) if c != '.'])
+            self.positions = sorted(positions)
+            # Only the length up to the longest entry changes the decision
+            self.key_length = max([len(p) for p in self.patterns])
+
+    def match(self, raw):
+        """
+        Return True if the raw message matches any entry
+        """
+        if self.positions is None:
+            key = raw
+        else:
+            length = min(len(raw), self.key_length)
+            try:
+                getter = self.getters[length]
+            except KeyError:
+                getter = self.getters[length] = self.key_getter(length)
+            key = (length, getter(raw))
+
+        cache = self.cache
+        try:
+            decision = cache.pop(key)
+            self.hits += 1
+        except KeyError:
+            decision = self.search(raw)
+            self.misses += 1
+            if len(cache) >= self.cache_size:
+                cache.popitem(last=False)
+        cache[key] = decision
+        return decision
+
+    def key_getter(self, length):
+        """
+        Return a function that picks the checked positions from a message
+        of the given length
+        """
+        positions = [p for p in self.positions if p < length]
+        if not positions:
+            return lambda raw: None
+        return itemgetter(*positions)
+
+    def search(self, raw):
+        """
+        Match the raw message against the entries, without the cache
+        """
+        if self.regex is not None:
+            return self.regex.match(raw) is not None
+        for regex in self.regex_list:
+            if regex.match(raw):
+                return True
+        return False
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
@@ -33,6 +33,10 @@ import string
 import select
 import socket
 import datetime
+import logging
+import threading
+
+logger = logging.getLogger('rfxcmd')
 
 # -----------------------------------------------------------------------------
 
@@ -69,6 +73,97 @@ def send(host, message, sourcename = "rfxcmd-", hostname = True):
 
 # -----------------------------------------------------------------------------
 
+class Publisher(object):
+    """
+    Send sensor.basic messages to the xPL network from one broadcast
+    socket. The source name, including the hostname, is built once.
+    add() collects the messages of one decoded frame and flush() sends
+    them one after the other. A heartbeat is sent every interval minutes
+    from a background thread, and hbeat.end on close().
+    """
+
+    def __init__(self, host, sourcename = "rfxcmd-", hostname = True, interval = 5):
+        self.addr = (host, 3865)
+        if hostname:
+            sourcename = sourcename + socket.gethostname()
+        self.header = 'xpl-stat\n{\nhop=1\nsource=' + sourcename + '\ntarget=*\n}\n'
+        self.interval = interval
+        self.pending = []
+        self.lock = threading.Lock()
+        self.sent = 0
+        self.errors = 0
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+
+        self.heartbeat()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.heartbeat_loop, name="xpl-heartbeat")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def add(self, message):
+        """
+        Add a sensor.basic message body, sent on the next flush()
+        """
+        self.pending.append(self.header + 'sensor.basic\n{\n' + message + '\n}\n')
+
+    def flush(self):
+        """
+        Send the added messages
+        """
+        if not self.pending:
+            return
+        messages = self.pending
+        self.pending = []
+        self.sendto(messages)
+
+    def send(self, message):
+        """
+        Send one sensor.basic message now
+        """
+        self.add(message)
+        self.flush()
+
+    def heartbeat(self, schema = 'hbeat.basic'):
+        self.sendto([self.header + schema + '\n{\ninterval=' + str(self.interval) + '\n}\n'])
+
+    def heartbeat_loop(self):
+        while not self.stopped.wait(self.interval * 60):
+            self.heartbeat()
+
+    def sendto(self, messages):
+        with self.lock:
+            for message in messages:
+                try:
+                    self.sock.sendto(message, self.addr)
+                    self.sent += 1
+                except socket.error as err:
+                    self.errors += 1
+                    logger.error("xPL send error: %s" % err)
+
+    def stats(self):
+        """
+        Return the counters
+        """
+        with self.lock:
+            return {
+                'sent': self.sent,
+                'errors': self.errors
+                }
+
+    def close(self):
+        """
+        Send the remaining messages and hbeat.end
+        """
+        self.flush()
+        self.stopped.set()
+        self.thread.join(1)
+        self.heartbeat('hbeat.end')
+        self.sock.close()
+
+# -----------------------------------------------------------------------------
+
 def SendHeartbeat(port):
     """
     Send heartbeat
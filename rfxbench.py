@@ -0,0 +1,585 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFXBENCH.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Website: http://code.google.com/p/rfxcmd/
+#
+#   NOTES
+#
+#   Micro-benchmark of the packet decoders in lib/rfx_decoders.py, prints
+#   the decode cost per frame for each packet type. Run it before and after
+#   a change to the decoders to compare.
+#
+#   With -w the whitelist check is measured instead, for a small and a
+#   large whitelist.
+#
+#   With -s the benchmark suite runs every frame through the decoder alone,
+#   through decodePacket without outputs, and through decodePacket with CSV,
+#   database, Graphite, xPL or trigger output going to in-memory stand-ins.
+#   -j writes the results as JSON, -c compares them with an earlier JSON
+#   file and exits with 1 when a result is more than -t percent slower.
+#
+#   With -g the logging cost per frame is measured, at error level and at
+#   debug level with the log written from the log thread or directly.
+#
+#   With -u the start-up time of a one-shot rfxcmd.py -x is measured.
+#
+# ------------------------------------------------------------------------------
+
+import gc
+import os
+import re
+import sys
+import json
+import time
+import timeit
+import logging
+import optparse
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+import lib.rfx_sensors
+from lib.rfx_decoders import rfx_decoder
+from lib.rfx_whitelist import WhitelistMatcher
+from lib.rfx_config import Config
+from lib.rfx_database import DatabaseWriter
+from lib.rfx_trigger import Trigger, TriggerIndex
+
+# ------------------------------------------------------------------------------
+# Sample frames, one for each packet type in rfx_sensors.rfx_packettype
+# ------------------------------------------------------------------------------
+
+FRAMES = [
+    "0D00000102000000000000000000",
+    "0D01000102531E00040F00000000",
+    "0402010100",
+    "0703000102030405",
+    "0710000041010570",
+    "0B1100050103FE1A0A010F70",
+    "08120000000100100F",
+    "0913000154550101C370",
+    "0A14000F4F5A5C0100005B",
+    "0B150001F0E1420100000070",
+    "0716000100110570",
+    "0718000112345600",
+    "09190001123456010070",
+    "0C1A0010123456010000000070",
+    "0820000C1C2A3E0059",
+    "06280001123400",
+    "0630000034017E",
+    "09400001A9A5170E0080",
+    "06410001123400",
+    "084201010203020170",
+    "08500110D508006679",
+    "085101024B02340379",
+    "0A520145050100D1470269",
+    "09530001123403F50169",
+    "0D54010EE90000B9340003F50169",
+    "0B5501001A3A000000000000",
+    "10560104A7020000000003000000000069",
+    "0957010105030AA0A079",
+    "0D5801001B020E110A03090C2059",
+    "0D5901020C3D0100320000000079",
+    "115A01020C3D0100000000000000003B8A79",
+    "135B01020C3D0100320000000000000000000079",
+    "0F5C01004F0DE600000000000000006A",
+    "085D00011234000079",
+    "0D5E000112340000000000000079",
+    "0D5F000112340000000000000079",
+    "0770000101000A70",
+    "0A71000101000002E28060",
+    "09720001123456000070"
+    ]
+
+# ------------------------------------------------------------------------------
+
+def bench_frame(frame, number):
+    """
+    Return the decode time in microseconds per frame
+    """
+    message = frame.decode('hex')
+    decoder = rfx_decoder[frame[2:4].upper()][1]
+    if decoder is None:
+        return None
+    timer = timeit.Timer(lambda: decoder(message))
+    return min(timer.repeat(3, number)) / number * 1000000
+
+# ------------------------------------------------------------------------------
+
+def whitelist_entries(count):
+    """
+    Return count whitelist entries for 0x52 sensors, the last one matches
+    the 0x52 sample frame
+    """
+    entries = ["0A5201..%04X.........." % i for i in range(count - 1)]
+    entries.append("0A5201..0501..........")
+    return entries
+
+# ------------------------------------------------------------------------------
+
+def bench_whitelist(number):
+    """
+    Print the whitelist check time in microseconds per frame, for the
+    regex loop that was used before and for the WhitelistMatcher. The
+    loop recompiles its patterns when they do not fit in the re module
+    cache, so it runs fewer times.
+    """
+    loop_number = max(number / 1000, 1)
+    raws = [frame.upper() for frame in FRAMES]
+
+    print("%-8s %12s %12s" % ("Entries", "loop usec", "matcher usec"))
+    for count in (5, 50, 500):
+        entries = whitelist_entries(count)
+
+        def loop():
+            for raw in raws:
+                for sensor in entries:
+                    if re.match(sensor, raw):
+                        break
+
+        matcher = WhitelistMatcher(entries)
+
+        def cached():
+            for raw in raws:
+                matcher.match(raw)
+
+        loop_usec = min(timeit.Timer(loop).repeat(3, loop_number)) / loop_number / len(raws) * 1000000
+        cached_usec = min(timeit.Timer(cached).repeat(3, number)) / number / len(raws) * 1000000
+        print("%-8d %12.2f %12.2f" % (count, loop_usec, cached_usec))
+
+# ------------------------------------------------------------------------------
+# Benchmark suite, decodePacket with each output against in-memory stand-ins
+# ------------------------------------------------------------------------------
+
+# decode is the decoder alone, pipeline is decodePacket without outputs
+MODES = ('decode', 'pipeline', 'csv', 'database', 'graphite', 'xpl', 'trigger')
+
+class NullWriter(object):
+    """
+    Stands in for stdout, the CSV lines are counted and dropped
+    """
+    def __init__(self):
+        self.lines = 0
+
+    def write(self, text):
+        self.lines += 1
+
+    def flush(self):
+        pass
+
+class MemoryBackend(object):
+    """
+    Database backend for DatabaseWriter that only counts the rows
+    """
+    name = "Memory"
+    errors = ()
+
+    def __init__(self):
+        self.db = None
+        self.rows = 0
+
+    def connect(self):
+        self.db = True
+
+    def insert(self, rows):
+        self.rows += len(rows)
+
+    def close(self):
+        self.db = None
+
+class MemorySink(object):
+    """
+    Stands in for the Graphite client, the xPL publisher and the trigger pool
+    """
+    def __init__(self):
+        self.items = 0
+
+    def send(self, lines):
+        self.items += len(lines)
+
+    def add(self, message):
+        self.items += 1
+
+    def submit(self, action, key=None):
+        self.items += 1
+
+    def flush(self):
+        pass
+
+    def close(self, timeout=None):
+        pass
+
+# ------------------------------------------------------------------------------
+
+def setup_rfxcmd(mode):
+    """
+    Set the globals of rfxcmd.py that main() would set, with only the
+    output of mode active
+    """
+    import rfxcmd as app
+
+    logger = logging.getLogger('rfxcmd')
+    logger.setLevel(logging.INFO)
+    if not logger.handlers:
+        logger.addHandler(logging.NullHandler())
+
+    app.config = Config(serial_active=False, rrd_active=False,
+        sqlite_active=(mode == 'database'), graphite_active=(mode == 'graphite'),
+        xpl_active=(mode == 'xpl'), trigger_active=(mode == 'trigger'))
+    app.cmdarg = app.cmdarg_data(printout_complete=False, printout_csv=(mode == 'csv'))
+    app.rfx = lib.rfx_sensors.rfx_data()
+    app.rfxcmd = app.rfxcmd_data()
+    app.serial_param = app.serial_data()
+    app.triggerlist = app.trigger_data()
+    app.whitelist = app.whitelist_data()
+    app.database = app.database_data()
+    app.graphite = app.graphite_data()
+    app.xplsender = app.xpl_data()
+    app.capture = app.capture_data()
+    app.weewxlist = app.weewx_data()
+
+    if mode == 'database':
+        app.database.writer = DatabaseWriter([MemoryBackend()])
+    elif mode == 'graphite':
+        app.graphite.client = MemorySink()
+    elif mode == 'xpl':
+        app.xplsender.publisher = MemorySink()
+    elif mode == 'trigger':
+        app.triggerlist.index = TriggerIndex([Trigger(".*", "echo $raw$ $id$")])
+        app.triggerlist.pool = MemorySink()
+    return app
+
+def measure(function, number):
+    """
+    Call function number times, return frames/s, p50 and p99 latency in
+    microseconds and the objects left behind per frame. peak_bytes is the
+    most memory used during one frame, only with tracemalloc (Python 3 or
+    a patched Python 2), else None.
+    """
+    timer = timeit.default_timer
+    samples = [0.0] * number
+
+    gc.collect()
+    objects = len(gc.get_objects())
+    for i in xrange(number):
+        started = timer()
+        function()
+        samples[i] = timer() - started
+    gc.collect()
+    retained = (len(gc.get_objects()) - objects) / float(number)
+
+    peak = None
+    if tracemalloc is not None:
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        function()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        tracemalloc.stop()
+
+    samples.sort()
+    total = sum(samples)
+    return {
+        'frames_per_sec': round(number / total, 1) if total else None,
+        'p50_us': round(samples[number // 2] * 1000000, 3),
+        'p99_us': round(samples[min(int(number * 0.99), number - 1)] * 1000000, 3),
+        'retained_objects': round(retained, 3),
+        'peak_bytes': peak
+        }
+
+def run_suite(modes, number):
+    """
+    Return the results of every mode for every frame of the corpus
+    """
+    results = []
+    stdout = sys.stdout
+    for mode in modes:
+        app = setup_rfxcmd(mode)
+        for frame in FRAMES:
+            message = frame.decode('hex')
+            if mode == 'decode':
+                decoder = rfx_decoder[frame[2:4]][1]
+                if decoder is None:
+                    continue
+                function = lambda: decoder(message)
+            else:
+                function = lambda: app.decodePacket(message)
+            sys.stdout = NullWriter()
+            try:
+                result = measure(function, number)
+            finally:
+                sys.stdout = stdout
+            result['mode'] = mode
+            result['packettype'] = frame[2:4]
+            results.append(result)
+        if app.database.writer is not None:
+            app.database.writer.close()
+    return results
+
+def summary(results):
+    """
+    Return frames/s over the whole corpus for each mode
+    """
+    modes = {}
+    for result in results:
+        if result['frames_per_sec']:
+            modes.setdefault(result['mode'], []).append(1.0 / result['frames_per_sec'])
+    return dict([(mode, round(len(times) / sum(times), 1)) for mode, times in modes.iteritems()])
+
+def print_results(results):
+    print("%-9s %-5s %12s %10s %10s %10s" % ("Mode", "Type", "frames/s", "p50 usec", "p99 usec", "objects"))
+    for r in results:
+        print("%-9s 0x%-3s %12.1f %10.2f %10.2f %10.3f" % (r['mode'], r['packettype'],
+            r['frames_per_sec'] or 0, r['p50_us'], r['p99_us'], r['retained_objects']))
+    print("")
+    for mode, fps in sorted(summary(results).items(), key=lambda item: MODES.index(item[0])):
+        print("%-9s %-5s %12.1f" % (mode, "all", fps))
+
+def compare(results, filename, threshold):
+    """
+    Print the change against the results in filename, return the number of
+    mode/type pairs that are more than threshold percent slower
+    """
+    with open(filename) as f:
+        old = dict([((r['mode'], r['packettype']), r) for r in json.load(f)['results']])
+
+    regressions = 0
+    print("%-9s %-5s %12s %12s %8s" % ("Mode", "Type", "old fr/s", "new fr/s", "change"))
+    for r in results:
+        before = old.get((r['mode'], r['packettype']))
+        if before is None or not before['frames_per_sec'] or not r['frames_per_sec']:
+            continue
+        change = (r['frames_per_sec'] / before['frames_per_sec'] - 1) * 100
+        flag = ""
+        if change < -threshold:
+            regressions += 1
+            flag = " REGRESSION"
+        print("%-9s 0x%-3s %12.1f %12.1f %+7.1f%%%s" % (r['mode'], r['packettype'],
+            before['frames_per_sec'], r['frames_per_sec'], change, flag))
+    return regressions
+
+# ------------------------------------------------------------------------------
+# Logging cost per frame in process_rfx
+# ------------------------------------------------------------------------------
+
+class NullLogger(object):
+    """
+    Logger whose calls do nothing, the floor that any real logger is
+    compared with
+    """
+    def _ignore(self, *args, **kwargs):
+        pass
+
+    debug = info = warning = error = critical = _ignore
+
+    def isEnabledFor(self, level):
+        return False
+
+def bench_logging(number):
+    """
+    Time process_rfx over the frames with the logger at error level and
+    at debug level, writing to /dev/null through the log queue or directly
+    """
+    from lib.rfx_logging import queue_logging
+
+    app = setup_rfxcmd('pipeline')
+    logger = logging.getLogger('rfxcmd')
+    messages = [frame.decode('hex') for frame in FRAMES]
+    formatter = logging.Formatter('%(asctime)s - %(threadName)s - %(module)s:%(lineno)d - %(levelname)s - %(message)s')
+
+    def run():
+        for message in messages:
+            app.process_rfx(message)
+
+    def setup(level, queued):
+        handler = logging.FileHandler(os.devnull)
+        handler.setFormatter(formatter)
+        logger.handlers = []
+        logger.setLevel(level)
+        # As logger_init() in rfxcmd.py
+        logging.disable(level - 1)
+        listener = None
+        if queued:
+            listener = queue_logging(logger, handler)
+            listener.start()
+        else:
+            logger.addHandler(handler)
+        return listener
+
+    cases = [
+        ("no logger", None, False),
+        ("error", logging.ERROR, True),
+        ("debug, queued", logging.DEBUG, True),
+        ("debug, direct", logging.DEBUG, False)
+        ]
+
+    print("%-16s %12s %12s" % ("Logging", "usec/frame", "overhead"))
+    stdout = sys.stdout
+    floor = None
+    for name, level, queued in cases:
+        listener = None
+        if level is None:
+            app.logger = NullLogger()
+        else:
+            app.logger = logger
+            listener = setup(level, queued)
+        sys.stdout = NullWriter()
+        try:
+            run()
+            usec = min(timeit.Timer(run).repeat(5, number)) / (number * len(messages)) * 1000000
+        finally:
+            sys.stdout = stdout
+            if listener is not None:
+                listener.stop()
+            logging.disable(logging.NOTSET)
+        if floor is None:
+            floor = usec
+        print("%-16s %12.2f %12.2f" % (name, usec, usec - floor))
+    logger.handlers = []
+
+# ------------------------------------------------------------------------------
+# Start-up time of rfxcmd.py for a one-shot simulate
+# ------------------------------------------------------------------------------
+
+def bench_startup(number):
+    """
+    Run rfxcmd.py -x number times and print the time per run and the
+    number of modules it loads, next to the bare interpreter
+    """
+    import tempfile
+    import subprocess
+
+    path = os.path.dirname(os.path.realpath(__file__))
+    tmp = tempfile.mkdtemp()
+    configfile = os.path.join(tmp, "config.xml")
+    with open(configfile, "w") as f:
+        f.write("<config><serial_active>no</serial_active><loglevel>error</loglevel>"
+            "<logfile>%s</logfile></config>\n" % os.devnull)
+
+    frame = "0A520145050100D1470269"
+    commands = [
+        ("python", [sys.executable, "-c", "pass"]),
+        ("rfxcmd -x", [sys.executable, os.path.join(path, "rfxcmd.py"), "-x", frame, "-o", configfile])
+        ]
+
+    devnull = open(os.devnull, "w")
+    print("%-12s %10s %10s" % ("Command", "min ms", "mean ms"))
+    for name, command in commands:
+        times = []
+        for i in xrange(number):
+            started = timeit.default_timer()
+            subprocess.call(command, stdout=devnull, stderr=devnull, cwd=tmp)
+            times.append(timeit.default_timer() - started)
+        print("%-12s %10.1f %10.1f" % (name, min(times) * 1000, sum(times) / len(times) * 1000))
+    devnull.close()
+
+    modules = subprocess.Popen([sys.executable, "-c", "import sys; sys.argv = ['rfxcmd.py']; "
+        "before = len(sys.modules); import rfxcmd; print len(sys.modules) - before"],
+        stdout=subprocess.PIPE, cwd=path).communicate()[0].strip()
+    print("Modules loaded by import rfxcmd: %s" % modules)
+
+    os.remove(configfile)
+    os.rmdir(tmp)
+
+# ------------------------------------------------------------------------------
+
+def main():
+
+    parser = optparse.OptionParser()
+    parser.add_option("-n", "--number", action="store", type="int", dest="number", help="Decodes per frame and repetition (default 20000, 2000 with -s)")
+    parser.add_option("-w", "--whitelist", action="store_true", dest="whitelist", default=False, help="Benchmark the whitelist check")
+    parser.add_option("-g", "--logging", action="store_true", dest="logging", default=False, help="Benchmark the logging cost per frame")
+    parser.add_option("-u", "--startup", action="store_true", dest="startup", default=False, help="Benchmark the start-up time of rfxcmd.py")
+    parser.add_option("-s", "--suite", action="store_true", dest="suite", default=False, help="Run the benchmark suite")
+    parser.add_option("-m", "--modes", action="store", type="string", dest="modes", default=",".join(MODES), help="Suite modes, comma separated (default all: %s)" % ",".join(MODES))
+    parser.add_option("-j", "--json", action="store", type="string", dest="json", help="Write the suite results as JSON to this file, - for stdout")
+    parser.add_option("-c", "--compare", action="store", type="string", dest="compare", help="Compare the suite results with an earlier JSON file")
+    parser.add_option("-t", "--threshold", action="store", type="float", dest="threshold", default=10.0, help="Percent slower that counts as regression (default 10)")
+    (options, args) = parser.parse_args()
+
+    if options.whitelist:
+        bench_whitelist(options.number or 20000)
+        return
+
+    if options.startup:
+        bench_startup(options.number or 20)
+        return
+
+    if options.logging:
+        bench_logging(options.number or 200)
+        return
+
+    if options.suite:
+        modes = [mode.strip() for mode in options.modes.split(",")]
+        for mode in modes:
+            if mode not in MODES:
+                parser.error("unknown mode '%s'" % mode)
+        number = options.number or 2000
+        results = run_suite(modes, number)
+
+        if options.json:
+            import rfxcmd
+            report = {
+                'rfxcmd': rfxcmd.__version__,
+                'python': "%d.%d.%d" % sys.version_info[:3],
+                'platform': sys.platform,
+                'time': int(time.time()),
+                'number': number,
+                'summary': summary(results),
+                'results': results
+                }
+            if options.json == "-":
+                json.dump(report, sys.stdout, indent=1, sort_keys=True)
+                print("")
+            else:
+                with open(options.json, "w") as f:
+                    json.dump(report, f, indent=1, sort_keys=True)
+        if options.json != "-":
+            print_results(results)
+
+        if options.compare:
+            if compare(results, options.compare, options.threshold):
+                sys.exit(1)
+        return
+
+    total = 0
+    count = 0
+    print("%-6s %10s" % ("Type", "usec/frame"))
+    for frame in FRAMES:
+        usec = bench_frame(frame, options.number or 20000)
+        if usec is None:
+            continue
+        total += usec
+        count += 1
+        print("0x%-4s %10.2f" % (frame[2:4], usec))
+
+    print("%-6s %10.2f" % ("Mean", total / count))
+
+# ------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    main()
+
+# ------------------------------------------------------------------------------
+# END
+# ------------------------------------------------------------------------------
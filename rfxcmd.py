@@ -60,23 +60,25 @@ __status__ = "Development-Beta-1"
 __date__ = "$Date: 2014-11-27 08:05:33 +0100 (Thu, 27 Nov 2014) $"
 
 # Default modules
-import pdb
 import string
 import sys
 import os
 import time
-import datetime
 import binascii
 import traceback
-import subprocess
 import re
 import logging
 import signal
-import xml.dom.minidom as minidom
 from optparse import OptionParser
 import socket
 import select
-import inspect
+import errno
+import atexit
+
+# Check python version, before the lib modules that need 2.7 are imported
+if sys.hexversion < 0x02070000:
+    print "Error: Your Python need to be 2.7 or newer, please upgrade."
+    sys.exit(1)
 
 # RFXCMD modules
 try:
@@ -85,13 +87,6 @@ except ImportError:
     print "Error: importing module from lib folder"
     sys.exit(1)
 
-try:
-    from lib.rfx_command import *
-except ImportError:
-    print "Error: module lib/rfx_command not found"
-    sys.exit(1)
-
-
 try:
     from lib.rfx_utils import *
 except ImportError:
@@ -100,151 +95,29 @@ except ImportError:
 
 try:
     import lib.rfx_sensors
-    import lib.rfx_decode as rfxdecode
+    from lib.rfx_decoders import rfx_decoder
+    from lib.rfx_frame import FrameReader
     import lib.rfx_rrd as rfxrrd
-    import lib.rfx_xplcom as xpl
-    import lib.rfx_protocols as protocol
+    from lib.rfx_whitelist import WhitelistMatcher
+    from lib.rfx_trigger import Trigger, TriggerIndex
+    from lib.rfx_config import load_config, ConfigError
+    from lib.rfx_reload import Reloader
+    import lib.rfx_state as sensorstate
+    from lib.rfx_dedup import Deduplicator
+    from lib.rfx_metrics import metrics, StatsLogger
+    from lib.rfx_logging import queue_logging
 except ImportError as err:
     print("Error: %s " % str(err))
     sys.exit(1)
 
-# 3rd party modules
-# These might not be needed, depended on usage
-
-# SQLite
-try:
-    import sqlite3
-except ImportError:
-    pass
-
-# MySQL
-try:
-    import MySQLdb
-except ImportError:
-    pass
-
-# PgSQL
-try:
-    import psycopg2
-except ImportError:
-    pass
-
-# Serial
-try:
-    import serial
-except ImportError:
-    pass
+# The output modules, the database, serial and rrdtool modules, and the
+# protocol file module are imported when they are used, so a one-shot run
+# such as a simulate or a send from a trigger starts fast
 
 # ------------------------------------------------------------------------------
 # VARIABLE CLASSS
 # ------------------------------------------------------------------------------
 
-class config_data:
-    def __init__(
-        self,
-        serial_active = True,
-        serial_device = None,
-        serial_rate = 38400,
-        serial_timeout = 9,
-        mysql_active = False,
-        mysql_server = '',
-        mysql_database = '',
-        mysql_username = "",
-        mysql_password = "",
-        trigger_active = False,
-        trigger_onematch = False,
-        trigger_file = "",
-        trigger_timeout = 10,
-        sqlite_active = False,
-        sqlite_database = "",
-        sqlite_table = "",
-        pgsql_active = False,
-        pgsql_server = '',
-        pgsql_database = '',
-        pgsql_port = '',
-        pgsql_username = '',
-        pgsql_password = '',
-        pgsql_table = '',
-        loglevel = "info",
-        logfile = "rfxcmd.log",
-        graphite_active = False,
-        graphite_server = "",
-        graphite_port = "",
-        program_path = "",
-        xpl_active = False,
-        xpl_host = "",
-        xpl_sourcename = "rfxcmd-",
-        xpl_includehostname = True,
-        socketserver = False,
-        sockethost = "",
-        socketport = "",
-        whitelist_active = False,
-        whitelist_file = "",
-        daemon_active = False,
-        daemon_pidfile = "rfxcmd.pid",
-        process_rfxmsg = True,
-        weewx_active = False,
-        weewx_config = "weewx.xml",
-        rrd_active = False,
-        rrd_path = "",
-        barometric = 0,
-        log_msg = False,
-        log_msgfile = "",
-        protocol_startup = False,
-        protocol_file = "protocol.xml"
-        ):
-
-        self.serial_active = serial_active
-        self.serial_device = serial_device
-        self.serial_rate = serial_rate
-        self.serial_timeout = serial_timeout
-        self.mysql_active = mysql_active
-        self.mysql_server = mysql_server
-        self.mysql_database = mysql_database
-        self.mysql_username = mysql_username
-        self.mysql_password = mysql_password
-        self.pgsql_active = pgsql_active
-        self.pgsql_server = pgsql_server
-        self.pgsql_database = pgsql_database
-        self.pgsql_port = pgsql_port
-        self.pgsql_username = pgsql_username
-        self.pgsql_password = pgsql_password
-        self.pgsql_table = pgsql_table
-        self.trigger_active = trigger_active
-        self.trigger_onematch = trigger_onematch
-        self.trigger_file = trigger_file
-        self.trigger_timeout = trigger_timeout
-        self.sqlite_active = sqlite_active
-        self.sqlite_database = sqlite_database
-        self.sqlite_table = sqlite_table
-        self.loglevel = loglevel
-        self.logfile = logfile
-        self.graphite_active = graphite_active
-        self.graphite_server = graphite_server
-        self.graphite_port = graphite_port
-        self.program_path = program_path
-        self.xpl_active = xpl_active
-        self.xpl_host = xpl_host
-        self.xpl_sourcename = xpl_sourcename
-        self.xpl_includehostname = xpl_includehostname
-        self.socketserver = socketserver
-        self.sockethost = sockethost
-        self.socketport = socketport
-        self.whitelist_active = whitelist_active
-        self.whitelist_file = whitelist_file
-        self.daemon_active = daemon_active
-        self.daemon_pidfile = daemon_pidfile
-        self.process_rfxmsg = process_rfxmsg
-        self.weewx_active = weewx_active
-        self.weewx_config = weewx_config
-        self.rrd_active = rrd_active
-        self.rrd_path = rrd_path
-        self.barometric = barometric
-        self.log_msg = log_msg
-        self.log_msgfile = log_msgfile
-        self.protocol_startup = protocol_startup
-        self.protocol_file = protocol_file
-
 class cmdarg_data:
     def __init__(
         self,
@@ -284,36 +157,82 @@ class serial_data:
         self,
         port = None,
         rate = 38400,
-        timeout = 9
+        timeout = 9,
+        reader = None,
+        dedup = None
         ):
 
         self.port = port
         self.rate = rate
         self.timeout = timeout
+        self.reader = reader
+        self.dedup = dedup
 
 # Store the trigger data from xml file
 class trigger_data:
     def __init__(
         self,
-        data = ""
+        data = "",
+        index = None,
+        pool = None
         ):
 
         self.data = data
+        self.index = index
+        self.pool = pool
+
+# Store the database writer
+class database_data:
+    def __init__(
+        self,
+        writer = None
+        ):
+
+        self.writer = writer
+
+# Store the xPL publisher
+class xpl_data:
+    def __init__(
+        self,
+        publisher = None
+        ):
+
+        self.publisher = publisher
+
+# Store the graphite client
+class graphite_data:
+    def __init__(
+        self,
+        client = None
+        ):
+
+        self.client = client
+
+# Store the raw frame capture writer
+class capture_data:
+    def __init__(
+        self,
+        writer = None
+        ):
+
+        self.writer = writer
 
 # Store the whitelist data from xml file
 class whitelist_data:
     def __init__(
         self,
-        data = ""
+        data = "",
+        matcher = None
         ):
 
         self.data = data
+        self.matcher = matcher
 
 # Store the sensor id that should be received by WeeWx
 class weewx_data:
     def __init__(
         self,
-        data = ""
+        data = frozenset()
         ):
 
         self.data = data
@@ -336,7 +255,25 @@ def shutdown():
         serial_param.port.close()
         serial_param.port = None
 
+    if database.writer is not None:
+        logger.debug("Write queued database rows")
+        database.writer.close()
+
+    if graphite.client is not None:
+        logger.debug("Send queued graphite metrics")
+        graphite.client.close()
+
+    if xplsender.publisher is not None:
+        logger.debug("Close xPL publisher")
+        xplsender.publisher.close()
+
+    if capture.writer is not None:
+        logger.debug("Close message log")
+        capture.writer.close()
+
     logger.debug("Exit 0")
+    if loglistener is not None:
+        loglistener.stop()
     sys.stdout.flush()
     os._exit(0)
     
@@ -380,3263 +317,1904 @@ def daemonize():
 # ----------------------------------------------------------------------------
 
 def _line():
-    info = inspect.getframeinfo(inspect.currentframe().f_back)[0:3]
-    return '[%s:%d]' % (info[2], info[1])
+    # The frame is enough, inspect.getframeinfo() reads the source file
+    frame = sys._getframe(1)
+    return '[%s:%d]' % (frame.f_code.co_name, frame.f_lineno)
 
 # ----------------------------------------------------------------------------
 
-def send_graphite(CARBON_SERVER, CARBON_PORT, lines):
+def send_xpl(message):
     """
-    Send data to graphite
+    Add the message to the xPL messages of this frame
+    """
+    xplsender.publisher.add(message)
+
+# ----------------------------------------------------------------------------
+
+def send_graphite(lines):
+    """
+    Queue the lines for the Graphite client
     Credit: Frédéric Pégé
-    """ 
-    sock = None
-    for res in socket.getaddrinfo(CARBON_SERVER,int(CARBON_PORT), socket.AF_UNSPEC, socket.SOCK_STREAM):
-        af, socktype, proto, canonname, sa = res
-        try:
-            sock = socket.socket(af, socktype, proto)
-        except socket.error as msg:
-            sock = None
-            continue
-        try:
-            sock.connect(sa)
-        except socket.error as msg:
-            sock.close()
-            sock = None
-            continue
-        break
+    """
+    with metrics.time('graphite'):
+        graphite.client.send(lines)
+
+# ----------------------------------------------------------------------------
 
-    if sock is None:
-        print 'could not open socket'
+def start_graphite():
+    """
+    Start the Graphite client
+    """
+    from lib.rfx_graphite import GraphiteClient
+    try:
+        graphite.client = GraphiteClient(config.graphite_server, config.graphite_port, protocol=config.graphite_protocol,
+            batch_size=config.graphite_batch, interval=config.graphite_interval)
+    except ValueError as err:
+        print "Error in graphite configuration, " + str(err)
         sys.exit(1)
-    
-    message = '\n'.join(lines) + '\n' #all lines must end in a newline
-    sock.sendall(message)
-    sock.close()
+    metrics.register('graphite', graphite.client.stats)
 
 # ----------------------------------------------------------------------------
 
-def readbytes(number):
+def start_capture():
     """
-    Read x amount of bytes from serial port. 
-    Credit: Boris Smus http://smus.com
+    Open the message log
     """
-    buf = ''
-    for i in range(number):
-        try:
-            byte = serial_param.port.read()
-        except IOError, e:
-            print "Error: %s" % e
-        except OSError, e:
-            print "Error: %s" % e
-        buf += byte
-
-    return buf
+    from lib.rfx_capture import CaptureWriter
+    try:
+        capture.writer = CaptureWriter(config.log_msgfile, max_bytes=config.log_msgsize,
+            rotate_interval=config.log_msgrotate, backups=config.log_msgbackups,
+            compress=config.log_msgcompress, flush_interval=config.log_msgflush)
+    except IOError as err:
+        print "Error: cannot open message log %s, %s" % (config.log_msgfile, err)
+        sys.exit(1)
+    metrics.register('capture', capture.writer.stats)
 
 # ----------------------------------------------------------------------------
 
 def insert_database(timestamp, unixtime, packettype, subtype, seqnbr, battery, signal, data1, data2, data3,
         data4, data5, data6, data7, data8, data9, data10, data11, data12, data13):
     """
-    Choose in which database insert datas
+    Queue the row for the database writer, it is written to every active
+    database from the writer thread
     """
-    
     logger.debug('insert_database')
+    with metrics.time('database'):
+        database.writer.insert(timestamp, unixtime, packettype, subtype, seqnbr, battery, signal, data1, data2, data3,
+            data4, data5, data6, data7, data8, data9, data10, data11, data12, data13)
+
+# ----------------------------------------------------------------------------
+
+def start_database():
+    """
+    Start the database writer for the active databases
+    """
+    from lib.rfx_database import DatabaseWriter, MySQLBackend, SQLiteBackend, PgSQLBackend
+    backends = []
     
     # MYSQL
     if config.mysql_active:
         logger.debug('-> MySQL')
-        insert_mysql(timestamp, unixtime, packettype, subtype, seqnbr, battery, signal, data1, data2, data3,
-        data4, data5, data6, data7, data8, data9, data10, data11, data12, data13)
+        backends.append(MySQLBackend(config.mysql_server, config.mysql_username, config.mysql_password, config.mysql_database))
 
     # SQLITE
     if config.sqlite_active:
         logger.debug('-> SqLite')
-        insert_sqlite(timestamp, unixtime, packettype, subtype, seqnbr, battery, signal, data1, data2, data3,
-        data4, data5, data6, data7, data8, data9, data10, data11, data12, data13)
+        backends.append(SQLiteBackend(config.sqlite_database, config.sqlite_table))
 
     # PGSQL
     if config.pgsql_active:
         logger.debug('-> PGSql')
-        insert_pgsql(timestamp, unixtime, packettype, subtype, seqnbr, battery, signal, data1, data2, data3,
-        data4, data5, data6, data7, data8, data9, data10, data11, data12, data13)
+        backends.append(PgSQLBackend(config.pgsql_server, config.pgsql_port, config.pgsql_username,
+            config.pgsql_password, config.pgsql_database, config.pgsql_table))
+
+    try:
+        database.writer = DatabaseWriter(backends, batch_size=config.database_batch,
+            interval=config.database_interval)
+    except ValueError as err:
+        print "Error in database configuration, " + str(err)
+        sys.exit(1)
+    metrics.register('database', database.writer.stats)
 
 # ----------------------------------------------------------------------------
 
-def insert_mysql(timestamp, unixtime, packettype, subtype, seqnbr, battery, signal, data1, data2, data3, 
-    data4, data5, data6, data7, data8, data9, data10, data11, data12, data13):
+def trigger_process(result, values):
     """
-    Insert data to MySQL.
+    Queue the actions of the triggers that match the message. The placeholders
+    $raw$, $packettype$ and $subtype$ are always replaced, values is a list
+    of (placeholder, value) for the packet specific ones.
+    Return True if trigger_onematch stops the processing of the message.
     """
+    raw = result['raw']
+    with metrics.time('trigger'):
+        for trigger in triggerlist.index.candidates(result['packettype']):
+            if trigger.regex.match(raw):
+                logger.debug("Trigger match")
+                logger.debug("Message: %s, Action: %s", trigger.message, trigger.action)
+                placeholders = dict(values)
+                placeholders['raw'] = raw
+                placeholders['packettype'] = result['packettype']
+                placeholders['subtype'] = result['subtype']
+                action = trigger.render(placeholders)
+                triggerlist.pool.submit(action, trigger)
+                if config.trigger_onematch:
+                    logger.debug("Trigger onematch active, exit trigger")
+                    return True
+    return False
 
-    db = None
+# ----------------------------------------------------------------------------
 
-    try:
+def weewx_sensor(packettype, subtype, sensor_id):
+    """
+    Return True if the sensor is in the weewx sensor list
+    """
+    if (packettype + subtype, sensor_id) in weewxlist.data:
+        logger.debug("Weewx action, Sensor type: %s%s, id: %s", packettype, subtype, sensor_id)
+        return True
+    return False
 
-        if data13 == 0:
-            data13 = "0000-00-00 00:00:00"
-
-        db = MySQLdb.connect(config.mysql_server, config.mysql_username, config.mysql_password, config.mysql_database)
-        cursor = db.cursor()
-        sql = """
-            INSERT INTO rfxcmd (datetime, unixtime, packettype, subtype, seqnbr, battery, rssi, processed, data1, data2, data3, data4,
-                data5, data6, data7, data8, data9, data10, data11, data12, data13)
-            VALUES ('%s','%s','%s','%s','%s','%s','%s',0,'%s','%s','%s','%s','%s','%s','%s','%s','%s','%s','%s','%s','%s')
-            """ % (timestamp, unixtime, packettype, subtype, seqnbr, battery, signal, data1, data2, data3, data4, data5, data6, data7, 
-                data8, data9, data10, data11, data12, data13)
-        
-        cursor.execute(sql)
-        db.commit()
+# ----------------------------------------------------------------------------
+# Packet handlers, one for each packettype. The handler gets the result
+# from the decoder in lib/rfx_decoders.py and does the printout, CSV,
+# trigger, database, graphite, xPL, RRD and weewx output.
+# ----------------------------------------------------------------------------
 
-    except MySQLdb.Error, e:
+def process_0x00(result):
+    """
+    0x00 - Interface Control
+    """
+    return
 
-        logger.error("Line: " + _line())
-        logger.error("SqLite error: %d: %s" % (e.args[0], e.args[1]))
-        print "MySQL error %d: %s" % (e.args[0], e.args[1])
-        sys.exit(1)
+# ----------------------------------------------------------------------------
+
+def process_0x01(result):
+    """
+    0x01 - Interface Message
+    """
+    if cmdarg.printout_complete:
+
+        # Subtype
+        if result['subtype'] == '00':
+            print "Subtype\t\t\t= Interface response"
+        else:
+            print "Subtype\t\t\t= Unknown type (" + result['packettype'] + ")"
+
+        print "Sequence nbr\t\t= " + result['seqnbr']
+        print "Response on cmnd\t= " + rfx.rfx_cmnd[result['cmnd']]
+        print "Transceiver type\t= " + rfx.rfx_subtype_01_msg1[result['msg1']]
+        print "Firmware version\t= " + str(int(result['msg2'],16))
+
+        print "Protocols:"
+        for msg, protocols in (('msg3', rfx.rfx_subtype_01_msg3),
+                                ('msg4', rfx.rfx_subtype_01_msg4),
+                                ('msg5', rfx.rfx_subtype_01_msg5)):
+            value = int(result[msg],16)
+            for bit in range(7, -1, -1):
+                protocol_name = str(protocols[str(1 << bit)])
+                if testBit(value, bit):
+                    print("%-25s Enabled" % protocol_name)
+                else:
+                    print("%-25s Disabled" % protocol_name)
 
-    finally:
-        if db:
-            db.close()
+# ----------------------------------------------------------------------------
+
+def process_0x02(result):
+    """
+    0x02 - Receiver/Transmitter Message
+    """
+    timestamp = result['timestamp']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    id1 = result['id1']
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_02[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        if subtype == '01':
+            print "Message\t\t\t= " + rfx.rfx_subtype_02_msg1[id1]
+
+    # CSV
+    if cmdarg.printout_csv == True:
+        if subtype == '00':
+            sys.stdout.write("%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr ) )
+        else:
+            sys.stdout.write("%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, id1 ) )
+        sys.stdout.flush()
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        if subtype == '00':
+            insert_database(timestamp, result['unixtime'], packettype, subtype, seqnbr, 255, 255, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+        else:
+            insert_database(timestamp, result['unixtime'], packettype, subtype, seqnbr, 255, 255, str(id1), 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
 # ----------------------------------------------------------------------------
 
-def insert_sqlite(timestamp, unixtime, packettype, subtype, seqnbr, battery, signal, data1, data2, data3, 
-    data4, data5, data6, data7, data8, data9, data10, data11, data12, data13):
+def process_0x03(result):
     """
-    Insert data to SqLite.
+    0x03 - Undecoded Message
     """
+    timestamp = result['timestamp']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    indata = result['message']
 
-    cx = None
+    # PRINTOUT
+    if cmdarg.printout_complete:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_03[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Message\t\t\t= " + indata
 
-    try:
+    # CSV
+    if cmdarg.printout_csv:
+        sys.stdout.write("%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, indata ))
+        sys.stdout.flush()
 
-        cx = sqlite3.connect(config.sqlite_database)
-        cu = cx.cursor()
-        sql = """
-            INSERT INTO '%s' (datetime, unixtime, packettype, subtype, seqnbr, battery, rssi, processed, data1, data2, data3, data4,
-                data5, data6, data7, data8, data9, data10, data11, data12, data13)
-            VALUES('%s','%s','%s','%s','%s','%s','%s',0,'%s','%s','%s','%s','%s','%s','%s','%s','%s','%s','%s','%s','%s')
-            """ % (config.sqlite_table, timestamp, unixtime, packettype, subtype, seqnbr, battery, signal, data1, data2, data3, 
-                data4, data5, data6, data7, data8, data9, data10, data11, data12, data13)
-
-        cu.executescript(sql)
-        cx.commit()
-                
-    except sqlite3.Error, e:
+    # TRIGGER
+    if config.trigger_active:
+        if trigger_process(result, [("message", indata)]):
+            return
 
-        if cx:
-            cx.rollback()
-            
-        logger.error("Line: " + _line())
-        logger.error("SqLite error: %s" % e.args[0])
-        print "SqLite error: %s" % e.args[0]
-        sys.exit(1)
-            
-    finally:
-        if cx:
-            cx.close()
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, result['unixtime'], packettype, subtype, seqnbr, 255, 255, indata, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
 # ----------------------------------------------------------------------------
 
-def insert_pgsql(timestamp, unixtime, packettype, subtype, seqnbr, battery, signal, data1, data2, data3,
-        data4, data5, data6, data7, data8, data9, data10, data11, data12, data13):
+def process_0x10(result):
     """
-    Insert data to PgSQL
-    Credits: Pierre-Yves
+    0x10 Lighting1
     """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    housecode = result['housecode']
+    unitcode = result['unitcode']
+    command = result['command']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete:
+        print("Subtype\t\t\t= %s" % result['subtype_str'])
+        print("Seqnbr\t\t\t= %s" % str(seqnbr))
+        print("Housecode\t\t= %s" % str(housecode))
+        print("Unitcode\t\t= %s" % str(unitcode))
+        print("Command\t\t\t= %s" % str(command))
+        print("Signal level\t\t= %s" % str(signal))
+
+    # CSV
+    if cmdarg.printout_csv:
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(signal), housecode, command, str(unitcode) ))
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        if trigger_process(result, [("housecode", str(housecode)), ("unitcode", str(unitcode)),
+                                    ("command", command), ("signal", str(signal))]):
+            return
 
-    db = None
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, housecode, 0, command, unitcode, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
-    dsn = "dbname='%s' user='%s' host='%s' port=%s password=%s" \
-            % (config.pgsql_database, config.pgsql_username, config.pgsql_server, config.pgsql_port, config.pgsql_password)
-    
-    try:
-        if data13 == 0:
-            data13 = "NULL"
-        
-        db = psycopg2.connect(dsn)
-        cursor = db.cursor()
-        
-        sql = """
-                INSERT INTO %s (datetime, unixtime, packettype, subtype, seqnbr, battery, rssi, processed, data1, data2, data3, data4,
-                data5, data6, data7, data8, data9, data10, data11, data12, data13)
-                VALUES ('%s','%s','%s','%s','%s','%s','%s',0,'%s','%s','%s','%s','%s','%s','%s','%s','%s','%s','%s','%s', '%s UTC')
-                """ % (config.pgsql_table, timestamp, unixtime, packettype, subtype, seqnbr, battery, signal, data1, data2, data3, data4, data5, data6, data7,
-                data8, data9, data10, data11, data12, data13)
-        
-        logger.debug("SQL: %s" % str(sql))
-        
-        cursor.execute(sql)
-        db.commit()
-        
-    except psycopg2.DatabaseError, e:
-        logger.error("Line: " + _line())
-        logger.error("PgSQL error: %s" % e)
-        print "Error : (PgSQL Query) : %s " % e
-        sys.exit(1)
-    
-    finally:
-        if db:
-            db.close() 
+    # XPL
+    if config.xpl_active:
+        send_xpl('device=Lightning.'+housecode+str(unitcode)+'\ntype=command\ncurrent='+command+'\n')
+        send_xpl('device=Lightning.'+housecode+str(unitcode)+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
 
 # ----------------------------------------------------------------------------
 
-def decodePacket(message):
+def process_0x11(result):
     """
-    Decode incoming RFXtrx message.
+    0x11 Lighting2
     """
-    
-    timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
-    unixtime_utc = int(time.time())
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    unitcode = result['unitcode']
+    command = result['command']
+    dimlevel = result['dimlevel']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_11[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Id\t\t\t= " + sensor_id
+        print "Unitcode\t\t= " + str(unitcode)
+        print "Command\t\t\t= " + command
+        print "Dim level\t\t= " + dimlevel + "%"
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv:
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(signal), sensor_id, command, str(unitcode), dimlevel ))
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        if trigger_process(result, [("id", str(sensor_id)), ("unitcode", str(unitcode)),
+                                    ("command", command), ("dimlevel", dimlevel)]):
+            return
 
-    decoded = False
-    db = ""
-    
-    # Verify incoming message
-    logger.debug("Verify incoming packet")
-    if not test_rfx( ByteToHex(message) ):
-        logger.error("The incoming message is invalid (" + ByteToHex(message) + ") Line: " + _line())
-        if cmdarg.printout_complete == True:
-            print "Error: The incoming message is invalid " + _line()
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, sensor_id, 0, command, unitcode, int(dimlevel), 0, 0, 0, 0, 0, 0, 0, 0)
+
+    # XPL
+    if config.xpl_active:
+        send_xpl('device=Lightning.'+sensor_id+'\ntype=command\ncurrent='+command+'\n')
+        send_xpl('device=Lightning.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
+
+# ----------------------------------------------------------------------------
+
+def process_0x12(result):
+    """
+    0x12 Lighting3
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    system = result['system']
+    channel = result['channel']
+    command = result['command']
+    battery = result['battery']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_12[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "System\t\t\t= " + system
+        print "Channel\t\t\t= " + str(channel)
+        print "Command\t\t\t= " + command
+        print "Battery\t\t\t= " + str(battery)
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv:
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;\n" %(timestamp, packettype, subtype, seqnbr, str(battery), str(signal), str(system), command, str(channel) ))
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        if trigger_process(result, [("system", str(system)), ("channel", str(channel)),
+                                    ("command", command), ("signal", str(signal))]):
             return
-    else:
-        logger.debug("Verified OK")
-    
-    raw_message = ByteToHex(message)
-    raw_message = raw_message.replace(' ', '')
-    
-    packettype = ByteToHex(message[1])
-    logger.debug("PacketType: %s" % str(packettype))
-    
-    if len(message) > 2:
-        subtype = ByteToHex(message[2])
-        logger.debug("SubType: %s" % str(subtype))
-    
-    if len(message) > 3:
-        seqnbr = ByteToHex(message[3])
-        logger.debug("SeqNbr: %s" % str(seqnbr))
-        
-    if len(message) > 4:
-        id1 = ByteToHex(message[4])
-        logger.debug("Id1: %s" % str(id1))
-        
-    if len(message) > 5:
-        id2 = ByteToHex(message[5])
-        logger.debug("Id2: %s" % str(id2))
-    
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, str(system), 0, command, str(channel), 0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+    # XPL
+    if config.xpl_active:
+        send_xpl('device=Lightning.'+str(channel)+'\ntype=command\ncurrent='+command+'\n')
+        send_xpl('device=Lightning.'+str(channel)+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
+
+# ----------------------------------------------------------------------------
+
+def process_0x13(result):
+    """
+    0x13 Lighting4
+    """
+    timestamp = result['timestamp']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    code = result['code']
+    code_bin = result['code_bin']
+    pulse = result['pulse']
+    signal = result['signal']
+
+    # PRINTOUT
     if cmdarg.printout_complete:
-        print "Packettype\t\t= " + rfx.rfx_packettype[packettype]
-    
-    # ---------------------------------------
-    # Check if the packet is a special WeeWx packet
-    # 0A1100FF001100FF001100
-    # ---------------------------------------
-    if raw_message == "0A1100FF001100FF001100":
-        logger.debug("Incoming WeeWx packet, do not decode")
-        if cmdarg.printout_complete:
-            print("Info\t\t\t= Incoming WeeWx packet")
-        decoded = True
-        return
-        
-    # ---------------------------------------
-    # Verify correct length on packets
-    # ---------------------------------------
-    logger.debug("Verify correct packet length")
-    if packettype == '00' and len(message) <> 14:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '01' and len(message) <> 14:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '02' and len(message) <> 5:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '10' and len(message) <> 8:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '11' and len(message) <> 12:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '12' and len(message) <> 9:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '13' and len(message) <> 10:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '15' and len(message) <> 12:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '16' and len(message) <> 8:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '17' and len(message) <> 8:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '18' and len(message) <> 8:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '19' and len(message) <> 10:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '1A' and len(message) <> 13:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '20' and len(message) <> 9:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '28' and len(message) <> 7:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '30' and len(message) <> 7:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '40' and len(message) <> 10:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '41' and len(message) <> 7:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '42' and len(message) <> 9:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '4E' and len(message) <> 11:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '4F' and len(message) <> 11:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '50' and len(message) <> 9:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '51' and len(message) <> 9:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '52' and len(message) <> 11:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '53' and len(message) <> 10:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '54' and len(message) <> 14:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '55' and len(message) <> 12:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '56' and len(message) <> 17:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '57' and len(message) <> 10:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '58' and len(message) <> 14:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '59' and len(message) <> 14:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '5A' and len(message) <> 18:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '5B' and len(message) <> 20:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '5C' and len(message) <> 16:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '5D' and len(message) <> 9:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '70' and len(message) <> 8:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '71' and len(message) <> 11:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    if packettype == '72' and len(message) <> 10:
-        logger.error("Packet has wrong length, discarding")
-        decoded = True
-        packettype = None
-    
-    # ---------------------------------------
-    # If packet is OK and the log_msg is active
-    # then save the packet to log_msgfile designated
-    # file on disk
-    # ---------------------------------------
-    if decoded == False and config.log_msg == True:
-        logger.debug("Save packet to log_msgfile")
-        try:
-            data = str(ByteToHex(message))
-            data = data.replace(' ', '')
-            file = open(config.log_msgfile,"a+")
-            file.write(data + "\n")
-            file.close()
-        except Exception, e:
-            logger.error("Error when trying to write message log")
-            logger.error("Exception: %s" % str(e))
-            pass
-        
-    # ---------------------------------------
-    # 0x0 - Interface Control
-    # ---------------------------------------
-    if packettype == '00':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-    
-    # ---------------------------------------
-    # 0x01 - Interface Message
-    # ---------------------------------------
-    if packettype == '01':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        if cmdarg.printout_complete:
-            data = {
-            'packetlen' : ByteToHex(message[0]),
-            'packettype' : ByteToHex(message[1]),
-            'subtype' : ByteToHex(message[2]),
-            'seqnbr' : ByteToHex(message[3]),
-            'cmnd' : ByteToHex(message[4]),
-            'msg1' : ByteToHex(message[5]),
-            'msg2' : ByteToHex(message[6]),
-            'msg3' : ByteToHex(message[7]),
-            'msg4' : ByteToHex(message[8]),
-            'msg5' : ByteToHex(message[9]),
-            'msg6' : ByteToHex(message[10]),
-            'msg7' : ByteToHex(message[11]),
-            'msg8' : ByteToHex(message[12]),
-            'msg9' : ByteToHex(message[13])
-            }
-            
-            # Subtype
-            if data['subtype'] == '00':
-                print "Subtype\t\t\t= Interface response"
-            else:
-                print "Subtype\t\t\t= Unknown type (" + data['packettype'] + ")"
-            
-            # Seq
-            print "Sequence nbr\t\t= " + data['seqnbr']
-            
-            # Command
-            print "Response on cmnd\t= " + rfx.rfx_cmnd[data['cmnd']]
-            
-            # MSG 1
-            print "Transceiver type\t= " + rfx.rfx_subtype_01_msg1[data['msg1']]
-            
-            # MSG 2
-            print "Firmware version\t= " + str(int(data['msg2'],16))
-            
-            print "Protocols:"
-            
-            # ------------------------------------------------------
-            # MSG 3
-            
-            protocol = str(rfx.rfx_subtype_01_msg3['128'])
-            if testBit(int(data['msg3'],16),7) == 128:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg3['64'])
-            if testBit(int(data['msg3'],16),6) == 64:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg3['32'])
-            if testBit(int(data['msg3'],16),5) == 32:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg3['16'])
-            if testBit(int(data['msg3'],16),4) == 16:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg3['8'])
-            if testBit(int(data['msg3'],16),3) == 8:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg3['4'])
-            if testBit(int(data['msg3'],16),2) == 4:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg3['2'])
-            if testBit(int(data['msg3'],16),1) == 2:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg3['1'])
-            if testBit(int(data['msg3'],16),0) == 1:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            # ------------------------------------------------------
-            # MSG 4
-            
-            protocol = str(rfx.rfx_subtype_01_msg4['128'])
-            if testBit(int(data['msg4'],16),7) == 128:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg4['64'])
-            if testBit(int(data['msg4'],16),6) == 64:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg4['32'])
-            if testBit(int(data['msg4'],16),5) == 32:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg4['16'])
-            if testBit(int(data['msg4'],16),4) == 16:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg4['8'])
-            if testBit(int(data['msg4'],16),3) == 8:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg4['4'])
-            if testBit(int(data['msg4'],16),2) == 4:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg4['2'])
-            if testBit(int(data['msg4'],16),1) == 2:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg4['1'])
-            if testBit(int(data['msg4'],16),0) == 1:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            # ------------------------------------------------------
-            # MSG 5
-            
-            protocol = str(rfx.rfx_subtype_01_msg5['128'])
-            if testBit(int(data['msg5'],16),7) == 128:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg5['64'])
-            if testBit(int(data['msg5'],16),6) == 64:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg5['32'])
-            if testBit(int(data['msg5'],16),5) == 32:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg5['16'])
-            if testBit(int(data['msg5'],16),4) == 16:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg5['8'])
-            if testBit(int(data['msg5'],16),3) == 8:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg5['4'])
-            if testBit(int(data['msg5'],16),2) == 4:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg5['2'])
-            if testBit(int(data['msg5'],16),1) == 2:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-            protocol = str(rfx.rfx_subtype_01_msg5['1'])
-            if testBit(int(data['msg5'],16),0) == 1:
-                print("%-25s Enabled" % protocol)
-            else:
-                print("%-25s Disabled" % protocol)
-            
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x02 - Receiver/Transmitter Message
-    # ---------------------------------------
-    if packettype == '02':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        
-        decoded = True
-        
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_02[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_13[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Code\t\t\t= " + code
+        print "S1-S24\t\t\t= "  + code_bin
+        print "Pulse\t\t\t= " + str(pulse) + " usec"
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv:
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, code, code_bin, str(pulse), str(signal) ))
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        if trigger_process(result, [("code", code_bin), ("pulse", str(pulse)), ("signal", str(signal))]):
+            return
 
-            if subtype == '01':
-                print "Message\t\t\t= " + rfx.rfx_subtype_02_msg1[id1]
-        
-        # CSV
-        if cmdarg.printout_csv == True:
-            if subtype == '00':
-                sys.stdout.write("%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr ) )
-            else:
-                sys.stdout.write("%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, id1 ) )
-            sys.stdout.flush()
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            if subtype == '00':
-                insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, 255, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-            else:
-                insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, 255, str(id1), 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x03 - Undecoded Message
-    # ---------------------------------------
-    if packettype == '03':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        indata = ByteToHex(message)
-        
-        # remove all spaces
-        for x in string.whitespace:
-            indata = indata.replace(x,"")
-        
-        indata = indata[4:]
-        
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_03[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Message\t\t\t= " + indata
-        
-        # CSV
-        if cmdarg.printout_csv:
-            sys.stdout.write("%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, indata ))
-            sys.stdout.flush()
-            
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$message$", indata )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, 255, indata, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x10 Lighting1
-    # ---------------------------------------
-    if packettype == '10':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, result['unixtime'], packettype, subtype, seqnbr, 0, signal, 0, 0, str(code_bin), pulse, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
-        decoded = True
-        
-        # DATA
-        try:
-            housecode = rfx.rfx_subtype_10_housecode[ByteToHex(message[4])]
-        except Exception as err:
-            housecode = "Error: Unknown housecode"
-            logger.error("Unknown house command received, %s" % str(err))
-            pass
-            
-        unitcode = int(ByteToHex(message[5]), 16)
-        try:
-            command = rfx.rfx_subtype_10_cmnd[ByteToHex(message[6])]
-        except Exception as err:
-            command = "Error: Unknown command"
-            logger.error("Unknown command received, %s" % str(err))
-            pass
-        
-        signal = rfxdecode.decodeSignal(message[7])
-        
-        try:
-            subtype_str = str(rfx.rfx_subtype_10[subtype])
-        except Exception as err:
-            subtype = "Error: Unknown subtype"
-            logger.error("Unknown subtype received, %s" % str(err))
-            pass
-        
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print("Subtype\t\t\t= %s" % subtype_str)
-            print("Seqnbr\t\t\t= %s" % str(seqnbr))
-            print("Housecode\t\t= %s" % str(housecode))
-            print("Unitcode\t\t= %s" % str(unitcode))
-            print("Command\t\t\t= %s" % str(command))
-            print("Signal level\t\t= %s" % str(signal))
-
-        # CSV
-        if cmdarg.printout_csv:
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(signal), housecode, command, str(unitcode) ))
-            sys.stdout.flush()
-        
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$housecode$", str(housecode) )
-                    action = action.replace("$unitcode$", str(unitcode) )
-                    action = action.replace("$command$", command )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, housecode, 0, command, unitcode, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-
-        # XPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=Lightning.'+housecode+str(unitcode)+'\ntype=command\ncurrent='+command+'\n', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Lightning.'+housecode+str(unitcode)+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x11 Lighting2
-    # ---------------------------------------
-    if packettype == '11':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = ByteToHex(message[4]) + ByteToHex(message[5]) + ByteToHex(message[6]) + ByteToHex(message[7])
-        unitcode = int(ByteToHex(message[8]),16)
-        command = rfx.rfx_subtype_11_cmnd[ByteToHex(message[9])]
-        dimlevel = rfx.rfx_subtype_11_dimlevel[ByteToHex(message[10])]
-        signal = rfxdecode.decodeSignal(message[11])
-
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_11[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= " + sensor_id
+# ----------------------------------------------------------------------------
+
+def process_0x14(result):
+    """
+    0x14 Lighting5
+    """
+    timestamp = result['timestamp']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    unitcode = result['unitcode']
+    command = result['command']
+    level = result['level']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        print("Subtype\t\t\t= %s" % result['subtype_str'])
+        print("Seqnbr\t\t\t= %s" % str(seqnbr))
+        print("Id\t\t\t= %s" % str(sensor_id))
+
+        if subtype <> '03' and subtype <> '05':
+            print "Unitcode\t\t= Not used"
+            unitcode = 0
+        else:
             print "Unitcode\t\t= " + str(unitcode)
-            print "Command\t\t\t= " + command
-            print "Dim level\t\t= " + dimlevel + "%"
-            print "Signal level\t\t= " + str(signal)
-        
-        # CSV
-        if cmdarg.printout_csv:
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(signal), sensor_id, command, str(unitcode), dimlevel ))
-            sys.stdout.flush()
-
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$unitcode$", str(unitcode) )
-                    action = action.replace("$command$", command )
-                    action = action.replace("$dimlevel$", dimlevel )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, sensor_id, 0, command, unitcode, int(dimlevel), 0, 0, 0, 0, 0, 0, 0, 0)
-
-        # XPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=Lightning.'+sensor_id+'\ntype=command\ncurrent='+command+'\n', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Lightning.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x12 Lighting3
-    # ---------------------------------------
-    if packettype == '12':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        system = ByteToHex(message[4])
-        
-        if testBit(int(ByteToHex(message[5]),16),0) == 1:
-            channel = 1
-        elif testBit(int(ByteToHex(message[5]),16),1) == 2:
-            channel = 2
-        elif testBit(int(ByteToHex(message[5]),16),2) == 4:
-            channel = 3
-        elif testBit(int(ByteToHex(message[5]),16),3) == 8:
-            channel = 4
-        elif testBit(int(ByteToHex(message[5]),16),4) == 16:
-            channel = 5
-        elif testBit(int(ByteToHex(message[5]),16),5) == 32:
-            channel = 6
-        elif testBit(int(ByteToHex(message[5]),16),6) == 64:
-            channel = 7
-        elif testBit(int(ByteToHex(message[5]),16),7) == 128:
-            channel = 8
-        elif testBit(int(ByteToHex(message[6]),16),0) == 1:
-            channel = 9
-        elif testBit(int(ByteToHex(message[6]),16),1) == 2:
-            channel = 10
+
+        print "Command\t\t\t= " + command
+
+        if subtype == '00':
+            print "Level\t\t\t= " + level
+
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv:
+        if subtype == '00':
+            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, sensor_id, str(unitcode), command, level, str(signal) ))
+        else:
+            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, sensor_id, str(unitcode), command, str(signal) ))
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        values = [("id", str(sensor_id)), ("unitcode", str(unitcode)), ("command", command)]
+        if subtype == '00':
+            values.append(("level", level))
+        values.append(("signal", str(signal)))
+        if trigger_process(result, values):
+            return
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, result['unixtime'], packettype, subtype, seqnbr, 0, signal, sensor_id, 0, command, str(unitcode), level, 0, 0, 0, 0, 0, 0, 0, 0)
+
+    # XPL
+    if config.xpl_active:
+        send_xpl('device=Lightning.'+sensor_id+'\ntype=command\ncurrent='+command+'\n')
+        send_xpl('device=Lightning.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
+
+# ----------------------------------------------------------------------------
+
+def process_0x15(result):
+    """
+    0x15 Lighting6
+    Credit: Dimitri Clatot
+    """
+    timestamp = result['timestamp']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    groupcode = result['groupcode']
+    unitcode = result['unitcode']
+    command = result['command']
+    command_seqnbr = result['command_seqnbr']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_15[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "ID\t\t\t= "  + sensor_id
+        print "Groupcode\t\t= " + groupcode
+        print "Unitcode\t\t= " + str(unitcode)
+        print "Command\t\t\t= " + command
+        print "Command seqnbr\t\t= " + command_seqnbr
+        print "Seqnbr2\t\t\t= %s" % str(result['seqnbr2'])
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv:
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, sensor_id, str(signal), groupcode, command, str(unitcode), str(command_seqnbr) ))
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        if trigger_process(result, [("id", str(sensor_id)), ("groupcode", groupcode), ("unitcode", str(unitcode)),
+                                    ("command", command), ("signal", str(signal))]):
+            return
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, result['unixtime'], packettype, subtype, seqnbr, 255, signal, sensor_id, groupcode, command, unitcode, command_seqnbr, 0, 0, 0, 0, 0, 0, 0, 0)
+
+    # XPL
+    if config.xpl_active:
+        send_xpl('device=Lightning.'+sensor_id+'\ntype=command\ncurrent='+command+'\n')
+        send_xpl('device=Lightning.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
+
+# ----------------------------------------------------------------------------
+
+def process_0x16(result):
+    """
+    0x16 Chime
+    """
+    sound = result['sound']
+
+    # PRINTOUT
+    if cmdarg.printout_complete:
+        print "Subtype\t\t\t= %s" % str(rfx.rfx_subtype_16[result['subtype']])
+        print "Seqnbr\t\t\t= %s" % str(result['seqnbr'])
+        print "ID\t\t\t= %s" % str(result['id'])
+        if sound != None:
+            print "Sound\t\t\t= %s" % str(sound)
+        print "Signal level\t\t= %s" % str(result['signal'])
+
+    # TRIGGER
+    if config.trigger_active:
+        values = []
+        if sound != None:
+            values.append(("sound", sound))
+        if trigger_process(result, values):
+            return
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        logger.error("Database not supported yet for this sensor 0x16")
+
+# ----------------------------------------------------------------------------
+
+def process_not_completed(result):
+    """
+    0x17 Fan, 0x18 Curtain1, 0x19 Blinds1, 0x28 Camera1
+    Packets that are printed and triggered on, but not decoded
+    """
+    # The fan was always printed with the curtain subtypes
+    subtypes = {
+        '17' : rfx.rfx_subtype_18,
+        '18' : rfx.rfx_subtype_18,
+        '19' : rfx.rfx_subtype_19,
+        '28' : rfx.rfx_subtype_28
+        }
+
+    # PRINTOUT
+    if cmdarg.printout_complete:
+        print "Subtype\t\t\t= " + subtypes[result['packettype']][result['subtype']]
+        print "Seqnbr\t\t\t= " + result['seqnbr']
+        print "This sensor is not completed, please send printout to sebastian.sjoholm@gmail.com"
+
+    # TRIGGER
+    if config.trigger_active:
+        trigger_process(result, [])
+
+# ----------------------------------------------------------------------------
+
+def process_0x1A(result):
+    """
+    0x1A RTS
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    unitcode_str = result['unitcode_str']
+    command_str = result['command_str']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete:
+        print("Subtype\t\t\t= %s" % str(result['subtype_str']))
+        print("Seqnbr\t\t\t= %s" % str(seqnbr))
+        print("Id1-3\t\t\t= %s" % str(sensor_id))
+        print("Unitcode\t\t= %s" % unitcode_str)
+        print("Command\t\t\t= %s" % command_str)
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv:
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(255), str(signal), sensor_id, unitcode_str, command_str ) )
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        trigger_process(result, [("unitcode", str(result['unitcode'])), ("command", str(result['command']))])
+
+# ----------------------------------------------------------------------------
+
+def process_0x20(result):
+    """
+    0x20 Security1
+    Credit: Dimitri Clatot
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    status = result['status']
+    battery = result['battery']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_20[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Id\t\t\t= "  + sensor_id
+        print "Status\t\t\t= " + status
+        print "Battery\t\t\t= " + str(battery)
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv:
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(battery), str(signal), sensor_id, status ) )
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        if trigger_process(result, [("id", str(sensor_id)), ("status", status),
+                                    ("battery", str(battery)), ("signal", str(signal))]):
+            return
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, status, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+# ----------------------------------------------------------------------------
+
+def process_0x30(result):
+    """
+    0x30 Remote control and IR
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    id1 = result['id1']
+    command = result.get('command', '')
+    toggle = result['toggle']
+    signal = result.get('signal', 0)
+
+    # PRINTOUT
+    if cmdarg.printout_complete:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_30[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Id\t\t\t= " + id1
+        print "Command\t\t\t= " + command
+        if subtype == '04':
+            print "Toggle\t\t\t= " + toggle
+            print "CommandType\t= " + result['cmndtype']
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv:
+        logger.debug("CSV Output")
+        if subtype == '00' or subtype == '02':
+            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(signal), id1, command))
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        values = [("id", id1), ("command", command)]
+        if subtype == '04':
+            values.append(("toggle", toggle))
+        values.append(("signal", str(signal)))
+        if trigger_process(result, values):
+            return
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        if subtype == '00' or subtype == '02':
+            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 0, signal, id1, 0, command, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+# ----------------------------------------------------------------------------
+
+def process_0x40(result):
+    """
+    0x40 - Thermostat1
+    Credit: Jean-François Pucheu
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    temperature = result['temperature']
+    temperature_set = result['temperature_set']
+    mode = result['mode']
+    status = result['status']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_40[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Id\t\t\t= " + sensor_id
+        print "Temperature\t\t= " + str(temperature) + " C"
+        print "Temperature set\t\t= " + str(temperature_set) + " C"
+        print "Mode\t\t\t= " + mode
+        print "Status\t\t\t= " + status
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv:
+        logger.debug("CSV Output")
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(signal), mode, status, str(temperature_set), str(temperature) ))
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        if trigger_process(result, [("id", str(sensor_id)), ("temperature", str(temperature)),
+                                    ("temperatureset", str(temperature_set)), ("mode", mode),
+                                    ("status", status), ("signal", str(signal))]):
+            return
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, sensor_id, mode, status, 0, 0, 0, temperature_set, temperature, 0, 0, 0, 0, 0)
+
+    # XPL
+    if config.xpl_active:
+        send_xpl('device=Thermostat.'+sensor_id+'\ntype=temperature\ncurrent='+str(temperature)+'\nunits=C')
+        send_xpl('device=Thermostat.'+sensor_id+'\ntype=temperature_set\ncurrent='+str(temperature_set)+'\nunits=C')
+        send_xpl('device=Thermostat.'+sensor_id+'\ntype=mode\ncurrent='+mode+'\n')
+        send_xpl('device=Thermostat.'+sensor_id+'\ntype=status\ncurrent='+status+'\n')
+        send_xpl('device=Thermostat.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
+
+# ----------------------------------------------------------------------------
+
+def process_0x41(result):
+    """
+    0x41 Thermostat2
+    """
+    # PRINTOUT
+    if cmdarg.printout_complete:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_41[result['subtype']]
+        print "Seqnbr\t\t\t= " + result['seqnbr']
+
+    # TRIGGER
+    if config.trigger_active:
+        trigger_process(result, [])
+
+# ----------------------------------------------------------------------------
+
+def process_0x42(result):
+    """
+    0x42 Thermostat3
+    """
+    timestamp = result['timestamp']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    unitcode = result['unitcode']
+    command = result['command']
+    signal = result['signal']
+
+    logger.debug("Unitcode: %s", unitcode)
+    logger.debug("Command: %s", command)
+
+    # PRINTOUT
+    if cmdarg.printout_complete:
+        logger.debug("Printout data")
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_42[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Unitcode\t\t= " + unitcode
+        print "Command\t\t\t= " + command
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv:
+        logger.debug("Output in CSV")
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s\n" %(timestamp, packettype, subtype, seqnbr, str(signal), unitcode, command))
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        logger.debug("Check trigger")
+        if trigger_process(result, [("unitcode", unitcode), ("command", command), ("signal", str(signal))]):
+            return
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, result['unixtime'], packettype, subtype, seqnbr, 255, signal, unitcode, 0, command, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+    # XPL
+    if config.xpl_active:
+        send_xpl('device=Thermostat.'+unitcode+'\ntype=command\ncurrent='+command+'\nunits=C')
+        send_xpl('device=Thermostat.'+unitcode+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
+
+# ----------------------------------------------------------------------------
+
+def process_0x50(result):
+    """
+    0x50 - Temperature sensors
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    temperature = result['temperature']
+    battery = result['battery']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_50[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Id\t\t\t= " + sensor_id
+        print "Temperature\t\t= " + temperature + " C"
+        print "Battery\t\t\t= " + str(battery)
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv:
+        logger.debug("CSV Output")
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, sensor_id, str(battery), str(signal), temperature ))
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        logger.debug("Check trigger")
+        if trigger_process(result, [("id", str(sensor_id)), ("temperature", str(temperature)),
+                                    ("battery", str(battery)), ("signal", str(signal))]):
+            return
+
+    # GRAPHITE
+    if config.graphite_active == True:
+        logger.debug("Send to Graphite")
+        now = int( time.time() )
+        linesg=[]
+        linesg.append("%s.%s.temperature %s %d" % ( 'rfxcmd', sensor_id, temperature,now))
+        linesg.append("%s.%s.battery %s %d" % ( 'rfxcmd', sensor_id, battery,now))
+        linesg.append("%s.%s.signal %s %d"% ( 'rfxcmd', sensor_id, signal,now))
+        send_graphite(linesg)
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, 0, 0, 0, 0, float(temperature), 0, 0, 0, 0, 0)
+
+    # XPL
+    if config.xpl_active:
+        send_xpl('device=Temp.'+sensor_id+'\ntype=temp\ncurrent='+temperature+'\nunits=C')
+        send_xpl('device=Temp.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%')
+        send_xpl('device=Temp.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
+
+    # WEEWX
+    if config.weewx_active and weewx_sensor(packettype, subtype, sensor_id):
+        wwx.wwx_0x51_temp = temperature
+        wwx.wwx_0x51_batt = battery
+        wwx.wwx_0x51_rssi = signal
+
+# ----------------------------------------------------------------------------
+
+def process_0x51(result):
+    """
+    0x51 - Humidity sensors
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    humidity = result['humidity']
+    humidity_status = result['humidity_status']
+    battery = result['battery']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_51[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Id\t\t\t= " + sensor_id
+        print "Humidity\t\t= " + str(humidity)
+        print "Humidity Status\t\t= " + humidity_status
+        print "Battery\t\t\t= " + str(battery)
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv:
+        logger.debug("CSV Output")
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" %
+                        (timestamp, unixtime_utc, packettype, subtype, seqnbr, sensor_id, humidity_status, str(humidity), str(battery), str(signal)) )
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        logger.debug("Check trigger")
+        if trigger_process(result, [("id", str(sensor_id)), ("humidity", str(humidity)),
+                                    ("battery", str(battery)), ("signal", str(signal))]):
+            return
+
+    # GRAPHITE
+    if config.graphite_active == True:
+        logger.debug("Send to Graphite")
+        now = int( time.time() )
+        linesg=[]
+        linesg.append("%s.%s.humidity %s %d" % ( 'rfxcmd', sensor_id, humidity,now))
+        linesg.append("%s.%s.battery %s %d" % ( 'rfxcmd', sensor_id, battery,now))
+        linesg.append("%s.%s.signal %s %d"% ( 'rfxcmd', sensor_id, signal,now))
+        send_graphite(linesg)
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, humidity_status, humidity, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+    # XPL
+    if config.xpl_active:
+        send_xpl('device=Hum.'+sensor_id+'\ntype=humidity\ncurrent='+str(humidity)+'\nunits=%')
+        send_xpl('device=Hum.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%')
+        send_xpl('device=Hum.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
+
+    # WEEWX
+    if config.weewx_active and weewx_sensor(packettype, subtype, sensor_id):
+        wwx.wwx_0x51_hum = humidity
+        wwx.wwx_0x51_batt = battery
+        wwx.wwx_0x51_rssi = signal
+
+# ----------------------------------------------------------------------------
+
+def process_0x52(result):
+    """
+    0x52 - Temperature and humidity sensors
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    temperature = result['temperature']
+    humidity = result['humidity']
+    humidity_status = result['humidity_status']
+    battery = result['battery']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        logger.debug("Print data stdout")
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_52[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Id\t\t\t= " + sensor_id
+        print "Temperature\t\t= " + temperature + " C"
+        print "Humidity\t\t= " + str(humidity) + "%"
+        print "Humidity Status\t\t= " + humidity_status
+        print "Battery\t\t\t= " + str(battery)
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv == True:
+        logger.debug("CSV Output")
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" %
+                        (timestamp, unixtime_utc, packettype, subtype, seqnbr, sensor_id, humidity_status,
+                        temperature, str(humidity), str(battery), str(signal)) )
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        logger.debug("Check trigger")
+        if trigger_process(result, [("id", str(sensor_id)), ("temperature", str(temperature)),
+                                    ("humidity", str(humidity)), ("battery", str(battery)),
+                                    ("signal", str(signal))]):
+            return
+
+    # GRAPHITE
+    if config.graphite_active == True:
+        logger.debug("Send to Graphite")
+        now = int( time.time() )
+        linesg=[]
+        linesg.append("%s.%s.temperature %s %d" % ( 'rfxcmd', sensor_id, temperature,now))
+        linesg.append("%s.%s.humidity %s %d" % ( 'rfxcmd', sensor_id, humidity,now))
+        linesg.append("%s.%s.battery %s %d" % ( 'rfxcmd', sensor_id, battery,now))
+        linesg.append("%s.%s.signal %s %d"% ( 'rfxcmd', sensor_id, signal,now))
+        send_graphite(linesg)
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, humidity_status, humidity, 0, 0, 0, float(temperature), 0, 0, 0, 0, 0)
+
+    # XPL
+    if config.xpl_active:
+        logger.debug("Send to xPL")
+        send_xpl('device=HumTemp.'+sensor_id+'\ntype=temp\ncurrent='+temperature+'\nunits=C')
+        send_xpl('device=HumTemp.'+sensor_id+'\ntype=humidity\ncurrent='+str(humidity)+'\nunits=%')
+        send_xpl('device=HumTemp.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%')
+        send_xpl('device=HumTemp.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
+
+    # RRD
+    if config.rrd_active == True:
+        with metrics.time('rrd'):
+            rfxrrd.rrd2Metrics(packettype, sensor_id, temperature, humidity, config.rrd_path)
+
+    # WEEWX
+    if config.weewx_active and weewx_sensor(packettype, subtype, sensor_id):
+        wwx.wwx_0x52_temp = temperature
+        wwx.wwx_0x52_hum = humidity
+        wwx.wwx_0x52_batt = battery
+        wwx.wwx_0x52_rssi = signal
+
+# ----------------------------------------------------------------------------
+
+def process_0x54(result):
+    """
+    0x54 - Temperature, humidity and barometric sensors
+    Credit: Jean-Baptiste Bodart
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    temperature = result['temperature']
+    humidity = result['humidity']
+    humidity_status = result['humidity_status']
+    barometric = result['barometric']
+    forecast = result['forecast']
+    battery = result['battery']
+    signal = result['signal']
+
+    if config.barometric <> 0:
+        barometric = int(barometric) + config.barometric
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        logger.debug("Printout")
+        print("Subtype\t\t\t= %s " % str(rfx.rfx_subtype_54[subtype]))
+        print("Seqnbr\t\t\t= %s " % str(seqnbr))
+        print("Id\t\t\t= %s " % str(sensor_id))
+        print("Temperature\t\t= %s C " % str(temperature))
+        print("Humidity\t\t= %s " % str(humidity))
+        print("Humidity Status\t\t= %s " % str(humidity_status))
+        print("Barometric pressure\t= %s hPa" % str(barometric))
+        print("Forecast Status\t\t= %s " % str(forecast))
+        print("Signal level\t\t= %s " % str(signal))
+        print("Battery\t\t\t= %s " % str(battery))
+
+    # CSV
+    if cmdarg.printout_csv == True:
+        logger.debug("CSV")
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" %
+                        (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(battery), str(signal), sensor_id,
+                        forecast, humidity_status, str(humidity), str(barometric), str(temperature)))
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        logger.debug("Trigger")
+        if trigger_process(result, [("id", str(sensor_id)), ("temperature", str(temperature)),
+                                    ("humidity", str(humidity)), ("barometric", str(barometric)),
+                                    ("battery", str(battery)), ("signal", str(signal))]):
+            return
+
+    # GRAPHITE
+    if config.graphite_active == True:
+        logger.debug("Send to Graphite")
+        now = int( time.time() )
+        linesg=[]
+        linesg.append("%s.%s.temperature %s %d" % ( 'rfxcmd', sensor_id, temperature,now))
+        linesg.append("%s.%s.humidity %s %d" % ( 'rfxcmd', sensor_id, humidity,now))
+        linesg.append("%s.%s.barometric %s %d" % ( 'rfxcmd', sensor_id, barometric,now))
+        linesg.append("%s.%s.battery %s %d" % ( 'rfxcmd', sensor_id, battery,now))
+        linesg.append("%s.%s.signal %s %d"% ( 'rfxcmd', sensor_id, signal,now))
+        send_graphite(linesg)
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, forecast, humidity_status, humidity, barometric, 0, 0, float(temperature), 0, 0, 0, 0, 0)
+
+    # XPL
+    if config.xpl_active:
+        send_xpl('device=HumTempBaro.'+sensor_id+'\ntype=temp\ncurrent='+temperature+'\nunits=C')
+        send_xpl('device=HumTempBaro.'+sensor_id+'\ntype=humidity\ncurrent='+str(humidity)+'\nunits=%')
+        send_xpl('device=HumTempBaro.'+sensor_id+'\ntype=humidity\ncurrent='+str(barometric)+'\nunits=%')
+        send_xpl('device=HumTempBaro.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%')
+        send_xpl('device=HumTempBaro.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
+
+    # WEEWX
+    if config.weewx_active and weewx_sensor(packettype, subtype, sensor_id):
+        wwx.wwx_0x54_temp = temperature
+        wwx.wwx_0x54_hum = humidity
+        wwx.wwx_0x54_baro = barometric
+        wwx.wwx_0x54_batt = battery
+        wwx.wwx_0x54_rssi = signal
+
+# ----------------------------------------------------------------------------
+
+def process_0x55(result):
+    """
+    0x55 - Rain sensors
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    rainrate = result['rainrate']
+    raintotal = result['raintotal']
+    battery = result['battery']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_55[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Id\t\t\t= " + sensor_id
+
+        if subtype == '01' or subtype == '02':
+            print "Rain rate\t\t= " + str(rainrate) + " mm/hr"
+
+        if subtype <> '06':
+            print "Raintotal:\t\t= " + str(raintotal) + " mm"
+        else:
+            print "Raintotal:\t\t= Not implemented in rfxcmd, need example data"
+
+        print "Battery\t\t\t= " + str(battery)
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv == True:
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" %
+                        ( timestamp, unixtime_utc, packettype, subtype, seqnbr, result['id1'], result['id2'],
+                        str(rainrate), str(result['raintotal1']),
+                        str(battery), str(signal) ) )
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        if trigger_process(result, [("id", str(sensor_id)), ("rainrate", str(rainrate)),
+                                    ("raintotal", str(raintotal)), ("battery", str(battery)),
+                                    ("signal", str(signal))]):
+            return
+
+    # GRAPHITE
+    if config.graphite_active == True:
+        logger.debug("Send to Graphite")
+        now = int( time.time() )
+        linesg=[]
+        linesg.append("%s.%s.rainrate %s %d" % ( 'rfxcmd', sensor_id, rainrate,now))
+        linesg.append("%s.%s.raintotal %s %d" % ( 'rfxcmd', sensor_id, raintotal,now))
+        linesg.append("%s.%s.battery %s %d" % ( 'rfxcmd', sensor_id, battery,now))
+        linesg.append("%s.%s.signal %s %d"% ( 'rfxcmd', sensor_id, signal,now))
+        send_graphite(linesg)
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, 0, 0, 0, 0, float(rainrate), float(raintotal), 0, 0, 0, 0)
+
+    # WEEWX
+    if config.weewx_active and weewx_sensor(packettype, subtype, sensor_id):
+        wwx.wwx_0x55_rainrate = rainrate
+        wwx.wwx_0x55_raintotal = raintotal
+        wwx.wwx_0x55_batt = battery
+        wwx.wwx_0x55_rssi = signal
+
+# ----------------------------------------------------------------------------
+
+def process_0x56(result):
+    """
+    0x56 - Wind sensors
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    direction = result['direction']
+    av_speed = result['av_speed']
+    gust = result['gust']
+    temperature = result['temperature']
+    windchill = result['windchill']
+    battery = result['battery']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_56[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Id\t\t\t= " + sensor_id
+        print "Wind direction\t\t= " + str(direction) + " degrees"
+        if subtype <> "05":
+            print "Average wind\t\t= " + str(av_speed) + " mtr/sec"
+        if subtype == "04":
+            print "Temperature\t\t= " + str(temperature) + " C"
+            print "Wind chill\t\t= " + str(windchill) + " C"
+        print "Windgust\t\t= " + str(gust) + " mtr/sec"
+        print "Battery\t\t\t= " + str(battery)
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv == True:
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" %
+                        (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(battery), str(signal), sensor_id, str(temperature), str(av_speed), str(gust), str(direction), str(windchill) ) )
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        values = [("id", str(sensor_id)), ("direction", str(direction))]
+        if subtype <> "05":
+            values.append(("average", str(av_speed)))
+        if subtype == "04":
+            values.append(("temperature", str(temperature)))
+            values.append(("windchill", str(windchill)))
+        values.append(("windgust", str(gust)))
+        values.append(("battery", str(battery)))
+        values.append(("signal", str(signal)))
+        if trigger_process(result, values):
+            return
+
+    # GRAPHITE
+    if config.graphite_active == True:
+        logger.debug("Send to Graphite")
+        now = int( time.time() )
+        linesg=[]
+        linesg.append("%s.%s.direction %s %d" % ( 'rfxcmd', sensor_id, direction,now))
+        if subtype <> "05":
+            linesg.append("%s.%s.average %s %d" % ( 'rfxcmd', sensor_id, av_speed,now))
+        if subtype == "04":
+            linesg.append("%s.%s.chill %s %d" % ( 'rfxcmd', sensor_id, windchill,now))
+            linesg.append("%s.%s.temperature %s %d" % ( 'rfxcmd', sensor_id, temperature,now))
+        linesg.append("%s.%s.gust %s %d" % ( 'rfxcmd', sensor_id, gust, now))
+        linesg.append("%s.%s.battery %s %d" % ( 'rfxcmd', sensor_id, battery, now))
+        linesg.append("%s.%s.signal %s %d"% ( 'rfxcmd', sensor_id, signal, now))
+        send_graphite(linesg)
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, 0, 0, 0, 0, float(temperature), av_speed, gust, direction, float(windchill), 0)
+
+    # xPL
+    if config.xpl_active:
+        send_xpl('device=Wind.'+sensor_id+'\ntype=direction\ncurrent='+str(direction)+'\nunits=Degrees')
+
+        if subtype <> "05":
+            send_xpl('device=Wind.'+sensor_id+'\ntype=Averagewind\ncurrent='+str(av_speed)+'\nunits=mtr/sec')
+
+        if subtype == "04":
+            send_xpl('device=Wind.'+sensor_id+'\ntype=temperature\ncurrent='+str(temperature)+'\nunits=C')
+            send_xpl('device=Wind.'+sensor_id+'\ntype=windchill\ncurrent='+str(windchill)+'\nunits=C')
+
+        send_xpl('device=Wind.'+sensor_id+'\ntype=windgust\ncurrent='+str(gust)+'\nunits=mtr/sec')
+        send_xpl('device=Wind.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%')
+        send_xpl('device=Wind.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
+
+    # WEEWX
+    if config.weewx_active and weewx_sensor(packettype, subtype, sensor_id):
+        wwx.wwx_0x56_direction = direction
+        if subtype <> "05":
+            wwx.wwx_0x56_avspeed = av_speed
         else:
-            channel = 255
+            wwx.wwx_0x56_avspeed = "None"
+        if subtype == "04":
+            wwx.wwx_0x56_temp = temperature
+            wwx.wwx_0x56_chill = windchill
+        else:
+            wwx.wwx_0x56_temp = "None"
+            wwx.wwx_0x56_chill = "None"
+        wwx.wwx_0x56_gust = gust
+        wwx.wwx_0x56_batt = battery
+        wwx.wwx_0x56_rssi = signal
+
+# ----------------------------------------------------------------------------
 
-        command = rfx.rfx_subtype_12_cmnd[ByteToHex(message[7])]
-        battery = rfxdecode.decodeBattery(message[8])
-        signal = rfxdecode.decodeSignal(message[8])
+def process_0x57(result):
+    """
+    0x57 UV Sensor
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    uv = result['uv']
+    temperature = result['temperature']
+    battery = result['battery']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        logger.debug("Printout action")
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_57[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Id\t\t\t= " + sensor_id
+        print "UV\t\t\t= " + str(uv)
+        if subtype == '03':
+            print "Temperature\t\t= " + temperature + " C"
+        print "Battery\t\t\t= " + str(battery)
+        print "Signal level\t\t= " + str(signal)
 
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_12[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "System\t\t\t= " + system
-            print "Channel\t\t\t= " + str(channel)
-            print "Command\t\t\t= " + command
-            print "Battery\t\t\t= " + str(battery)
-            print "Signal level\t\t= " + str(signal)
-
-        # CSV 
-        if cmdarg.printout_csv:
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;\n" %(timestamp, packettype, subtype, seqnbr, str(battery), str(signal), str(system), command, str(channel) ))
-            sys.stdout.flush()
-
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$system$", str(system) )
-                    action = action.replace("$channel$", str(channel) )
-                    action = action.replace("$command$", command )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, str(system), 0, command, str(channel), 0, 0, 0, 0, 0, 0, 0, 0, 0)
-
-        # XPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=Lightning.'+str(channel)+'\ntype=command\ncurrent='+command+'\n', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Lightning.'+str(channel)+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x13 Lighting4
-    # ---------------------------------------
-    if packettype == '13':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-
-        # DATA
-        code = ByteToHex(message[4]) + ByteToHex(message[5]) + ByteToHex(message[6])
-        code1 = dec2bin(int(ByteToHex(message[4]),16))
-        code2 = dec2bin(int(ByteToHex(message[5]),16))
-        code3 = dec2bin(int(ByteToHex(message[6]),16))
-        code_bin = code1 + " " + code2 + " " + code3
-        pulse = ((int(ByteToHex(message[7]),16) * 256) + int(ByteToHex(message[8]),16))
-        signal = rfxdecode.decodeSignal(message[9])     
-        
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_13[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Code\t\t\t= " + code
-            print "S1-S24\t\t\t= "  + code_bin
-            print "Pulse\t\t\t= " + str(pulse) + " usec"
-            print "Signal level\t\t= " + str(signal)
-
-        # CSV
-        if cmdarg.printout_csv:
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, code, code_bin, str(pulse), str(signal) ))
-            sys.stdout.flush()
-
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$code$", code_bin )
-                    action = action.replace("$pulse$", str(pulse) )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 0, signal, 0, 0, str(code_bin), pulse, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x14 Lighting5
-    # ---------------------------------------
-    if packettype == '14':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2 + ByteToHex(message[6])
-        unitcode = int(ByteToHex(message[7]),16)
-        
-        if subtype == '00':
-            command = rfx.rfx_subtype_14_cmnd0[ByteToHex(message[8])]
-        elif subtype == '01':
-            command = rfx.rfx_subtype_14_cmnd1[ByteToHex(message[8])]
-        elif subtype == '02':
-            command = rfx.rfx_subtype_14_cmnd2[ByteToHex(message[8])]
-        elif subtype == '03':
-            command = rfx.rfx_subtype_14_cmnd3[ByteToHex(message[8])]
-        elif subtype == '04':
-            command = rfx.rfx_subtype_14_cmnd4[ByteToHex(message[8])]
-        elif subtype == '05':
-            command = rfx.rfx_subtype_14_cmnd5[ByteToHex(message[8])]
-        elif subtype == '06':
-            try:
-                command = rfx.rfx_subtype_14_cmnd5[ByteToHex(message[8])]
-            except Exception as err:
-                # if the value is between x06 and x84 it is 'select color'
-                # This should be improved, as it will not catch unknown values
-                logger.error("Value is not in the sensor list")
-                command = "Select Color"
-                pass
+    # CSV
+    if cmdarg.printout_csv:
+        logger.debug("CSVout action")
+        if subtype == '03':
+            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, sensor_id, str(uv), temperature, str(battery), str(signal) ) )
         else:
-            command = "Unknown"
-        
-        if subtype == "00":
-            level = ByteToHex(message[9])
+            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, sensor_id, str(uv), str(battery), str(signal) ) )
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        logger.debug("Trigger action")
+        values = [("id", str(sensor_id)), ("uv", str(uv))]
+        if subtype == '03':
+            values.append(("temperature", str(temperature)))
+        values.append(("battery", str(battery)))
+        values.append(("signal", str(signal)))
+        if trigger_process(result, values):
+            return
+
+    # GRAPHITE
+    if config.graphite_active == True:
+        logger.debug("Graphite action")
+        now = int( time.time() )
+        linesg=[]
+        if subtype == "03":
+            linesg.append("%s.%s.temperature %s %d" % ( 'rfxcmd', sensor_id, temperature,now))
+        linesg.append("%s.%s.uv %s %d" % ( 'rfxcmd', sensor_id, uv,now))
+        linesg.append("%s.%s.battery %s %d" % ( 'rfxcmd', sensor_id, battery,now))
+        linesg.append("%s.%s.signal %s %d"% ( 'rfxcmd', sensor_id, signal,now))
+        send_graphite(linesg)
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        logger.debug("Database action")
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, str(uv), 0, 0, 0, float(temperature), 0, 0, 0, 0, 0)
+
+    # xPL
+    if config.xpl_active:
+        logger.debug("xPL action")
+        send_xpl('device=UV.'+sensor_id+'\ntype=uv\ncurrent='+str(uv)+'\nunits=Index')
+        if subtype == "03":
+            send_xpl('device=UV.'+sensor_id+'\ntype=Temperature\ncurrent='+str(temperature)+'\nunits=Celsius')
+
+    # WEEWX
+    if config.weewx_active and weewx_sensor(packettype, subtype, sensor_id):
+        wwx.wwx_0x57_uv = uv
+        if subtype == "03":
+            wwx.wwx_0x57_temp = temperature
         else:
-            level = 0
-        
-        signal = rfxdecode.decodeSignal(message[10])
-        
-        try:
-            subtype_str = rfx.rfx_subtype_14[subtype]
-        except Exception as err:
-            logger.error("Error: Invalid subtype")
-            subtype_str = "Unknown"
-            pass
-            
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            print("Subtype\t\t\t= %s" % subtype_str)
-            print("Seqnbr\t\t\t= %s" % str(seqnbr))
-            print("Id\t\t\t= %s" % str(sensor_id))
-            
-            if subtype <> '03' and subtype <> '05':
-                print "Unitcode\t\t= Not used"
-                unitcode = 0
-            else:
-                print "Unitcode\t\t= " + str(unitcode)
-            
-            print "Command\t\t\t= " + command
-            
-            if subtype == '00':
-                print "Level\t\t\t= " + level
-            
-            print "Signal level\t\t= " + str(signal)
-    
-        # CSV
-        if cmdarg.printout_csv:
-            if subtype == '00':
-                sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, sensor_id, str(unitcode), command, level, str(signal) ))
-            else:
-                sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, sensor_id, str(unitcode), command, str(signal) ))
-            sys.stdout.flush()
-
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$unitcode$", str(unitcode) )
-                    action = action.replace("$command$", command )
-                    if subtype == '00':         
-                        action = action.replace("$level$", level )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 0, signal, sensor_id, 0, command, str(unitcode), level, 0, 0, 0, 0, 0, 0, 0, 0)
-        
-        # XPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=Lightning.'+sensor_id+'\ntype=command\ncurrent='+command+'\n', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Lightning.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x15 Lighting6
-    # Credit: Dimitri Clatot
-    # ---------------------------------------
-    if packettype == '15':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2
-        groupcode = rfx.rfx_subtype_15_groupcode[ByteToHex(message[6])]
-        unitcode = int(ByteToHex(message[7]),16)
-        command = rfx.rfx_subtype_15_cmnd[ByteToHex(message[8])]
-        command_seqnbr = ByteToHex(message[9])
-        seqnbr2 = ByteToHex(message[10])
-        signal = rfxdecode.decodeSignal(message[11])
-
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_15[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "ID\t\t\t= "  + sensor_id
-            print "Groupcode\t\t= " + groupcode
-            print "Unitcode\t\t= " + str(unitcode)
-            print "Command\t\t\t= " + command
-            print "Command seqnbr\t\t= " + command_seqnbr
-            print "Seqnbr2\t\t\t= %s" % str(seqnbr2)
-            print "Signal level\t\t= " + str(signal)
-
-        # CSV
-        if cmdarg.printout_csv:
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, sensor_id, str(signal), groupcode, command, str(unitcode), str(command_seqnbr) ))
-            sys.stdout.flush()
-            
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$groupcode$", groupcode )
-                    action = action.replace("$unitcode$", str(unitcode) )
-                    action = action.replace("$command$", command )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, sensor_id, groupcode, command, unitcode, command_seqnbr, 0, 0, 0, 0, 0, 0, 0, 0)
-
-        # XPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=Lightning.'+sensor_id+'\ntype=command\ncurrent='+command+'\n', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Lightning.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-    
-    # --------------------------------------------------------------------------
-    # 0x16 Chime
-    # --------------------------------------------------------------------------
-    if packettype == "16":
-        logger.debug("Decode packetType 0x%s - Start", str(packettype))
-        decoded = True
+            wwx.wwx_0x57_temp = "None"
+        wwx.wwx_0x57_batt = battery
+        wwx.wwx_0x57_rssi = signal
 
-        # DATA
-        sensor_id = id1 + id2
+# ----------------------------------------------------------------------------
 
-        if subtype == "00":
-            try:
-                sound = rfx.rfx_subtype_16_sound[ByteToHex(message[6])]
-            except Exception as err:
-                logger.error("Error: %s", str(err))
-                sound = "Unknown"
+def process_0x58(result):
+    """
+    0x58 Date/Time sensor
+    """
+    timestamp = result['timestamp']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    date_string = result['date']
+    time_string = result['time']
+    date_dow = result['dow']
+    battery = result['battery']
+    signal = result['signal']
+
+    logger.debug("DateTime: %s" % str(result['datetime']))
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        logger.debug("Printout action")
+        print("Subtype\t\t\t= %s" % str(rfx.rfx_subtype_58[subtype]))
+        print("Seqnbr\t\t\t= %s" % str(seqnbr))
+        print("Id\t\t\t= %s" % str(sensor_id))
+        print("Time\t\t\t= %s" % str(time_string))
+        print("Date (yy-mm-dd)\t\t= %s" % str(date_string))
+        print("Day of week (1-7)\t= %s" % str(date_dow))
+        print("Battery\t\t\t= %s" % str(battery))
+        print("Signal level\t\t= %s" % str(signal))
+
+    # CSV
+    if cmdarg.printout_csv:
+        logger.debug("CSVout action")
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, sensor_id, str(time_string), str(date_string), str(date_dow), str(battery), str(signal) ) )
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        logger.debug("Trigger action")
+        if trigger_process(result, [("id", str(sensor_id)), ("date", str(date_string)),
+                                    ("time", str(time_string)), ("dow", str(date_dow)),
+                                    ("battery", str(battery)), ("signal", str(signal))]):
+            return
 
-        elif subtype == "01":
-            sound = str(ByteToHex(message[6]))
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        logger.debug("Database action")
+        insert_database(timestamp, result['unixtime'], packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, str(date_dow), 0, 0, 0, 0, 0, 0, 0, 0, str(result['datetime']))
 
-        elif subtype == "02" or subtype == "03" or subtype == "04":
-            sound = None
+# ----------------------------------------------------------------------------
 
-        try:
-            signal = rfxdecode.decodeSignal(message[7])
-        except Exception as err:
-            logger.error("Error: %s", str(err))
-            signal = "Error"
-        
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print "Subtype\t\t\t= %s" % str(rfx.rfx_subtype_16[subtype])
-            print "Seqnbr\t\t\t= %s" % str(seqnbr)
-            print "ID\t\t\t= %s" % str(sensor_id)
-            if sound != None:
-                print "Sound\t\t\t= %s" % str(sound)
-            print "Signal level\t\t= %s" % str(signal)
-        
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: %s, Action: %s", str(trigger_message), str(action))
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    if sound != None:
-                        action = action.replace("$sound$", sound )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            logger.error("Database not supported yet for this sensor 0x16")
-            #insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        
-        logger.debug("Decode packetType 0x%s - End", str(packettype))
-        
-    
-    # ---------------------------------------
-    # 0x17 Fan (Transmitter only)
-    # ---------------------------------------
-    if packettype == '17':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_18[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "This sensor is not completed, please send printout to sebastian.sjoholm@gmail.com"
-
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        #if config.mysql_active or config.sqlite_active or config.pgsql_active:
-        #   insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-    
-    # ---------------------------------------
-    # 0x18 Curtain1 (Transmitter only)
-    # ---------------------------------------
-    if packettype == '18':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # PRINTOUT      
-        if cmdarg.printout_complete:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_18[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "This sensor is not completed, please send printout to sebastian.sjoholm@gmail.com"
-
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-
-        # DATABASE
-        #if config.mysql_active or config.sqlite_active or config.pgsql_active:
-        #   insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x19 Blinds1
-    # ---------------------------------------
-    if packettype == '19':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
+def process_0x59(result):
+    """
+    0x59 Current Sensor
+    """
+    sensor_id = result['id']
+    count = result['count']
+    channel1 = result['channel1']
+    channel2 = result['channel2']
+    channel3 = result['channel3']
+    battery = result['battery']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_5A[result['subtype']]
+        print "Seqnbr\t\t\t= " + result['seqnbr']
+        print "Id\t\t\t= " + sensor_id
+        print "Counter\t\t\t= " + str(count)
+        print "Channel 1\t\t= " + str(channel1) + "A"
+        print "Channel 2\t\t= " + str(channel2) + "A"
+        print "Channel 3\t\t= " + str(channel3) + "A"
+        print "Battery\t\t\t= " + str(battery)
+        print "Signal level\t\t= " + str(signal)
+
+    # TRIGGER
+    if config.trigger_active:
+        if trigger_process(result, [("id", str(sensor_id)), ("counter", str(count)),
+                                    ("channel1", str(channel1)), ("channel2", str(channel2)),
+                                    ("channel3", str(channel3)), ("battery", str(battery)),
+                                    ("signal", str(signal))]):
+            return
 
-        decoded = True
-        
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_19[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "This sensor is not completed, please send printout to sebastian.sjoholm@gmail.com"
-
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-
-        # DATABASE
-        #if config.mysql_active or config.sqlite_active or config.pgsql_active:
-        #   insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-    
-    # ---------------------------------------
-    # 0x1A RTS
-    # ---------------------------------------
-    if packettype == '1A':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2 + ByteToHex(message[6])
-        
-        try:
-            subtype_str = rfx.rfx_subtype_1A[subtype]
-        except Exception as err:
-            logger.error("Unknown subtype")
-            subtype = "Error: Unknown subtype"
-            pass
-        
-        if subtype == "00":
-            unitcode = ByteToHex(message[6])
-            if unitcode == "00":
-                unitcode_str = "All"
-            else:
-                unitcode_str = str(unitcode)
-        elif subtype == "01":
-            unitcode = ByteToHex(message[6])
-            unitcode_str = str(unitcode)
-        
-        command = ByteToHex(message[7])
-        try:
-            command_str = rfx.rfx_subtype_1A_cmnd[command]
-        except Exception as err:
-            logger.error("Unknown command received")
-            command_str = "Error: Unknown command received"
-            pass
-        
-        signal = rfxdecode.decodeSignal(message[8])
-        
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print("Subtype\t\t\t= %s" % str(subtype_str))
-            print("Seqnbr\t\t\t= %s" % str(seqnbr))
-            print("Id1-3\t\t\t= %s" % str(sensor_id))
-            print("Unitcode\t\t= %s" % unitcode_str)
-            print("Command\t\t\t= %s" % command_str)
-            print "Signal level\t\t= " + str(signal)
-        
-        # CSV
-        if cmdarg.printout_csv:
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(battery), str(signal), sensor_id, unitcode_str, command_str ) )
-            sys.stdout.flush()
-        
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", str(subtype) )
-                    action = action.replace("$unitcode$", str(unitcode) )
-                    action = action.replace("$command$", str(command) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        #if config.mysql_active or config.sqlite_active or config.pgsql_active:
-        #   insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-    
-    # ---------------------------------------
-    # 0x20 Security1
-    # Credit: Dimitri Clatot
-    # ---------------------------------------
-    if packettype == '20':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2 + ByteToHex(message[6])
-        status = rfx.rfx_subtype_20_status[ByteToHex(message[7])]
-        signal = rfxdecode.decodeSignal(message[8])
-        battery = rfxdecode.decodeBattery(message[8])
+    # XPL
+    if config.xpl_active:
+        send_xpl('device=Current.'+sensor_id+'\ntype=channel1\ncurrent='+str(channel1)+'\nunits=A')
+        send_xpl('device=Current.'+sensor_id+'\ntype=channel2\ncurrent='+str(channel2)+'\nunits=A')
+        send_xpl('device=Current.'+sensor_id+'\ntype=channel3\ncurrent='+str(channel3)+'\nunits=A')
+        send_xpl('device=Current.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%')
+        send_xpl('device=Current.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
 
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_20[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= "  + sensor_id
-            print "Status\t\t\t= " + status
-            print "Battery\t\t\t= " + str(battery)
-            print "Signal level\t\t= " + str(signal)
-
-        # CSV
-        if cmdarg.printout_csv:
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(battery), str(signal), sensor_id, status ) )
-            sys.stdout.flush()
-
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$status$", status )
-                    action = action.replace("$battery$", str(battery) )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-            
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, status, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x28 Camera1
-    # ---------------------------------------
-    if packettype == '28':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-    
-        decoded = True
-        
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_28[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "This sensor is not completed, please send printout to sebastian.sjoholm@gmail.com"
-        
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-
-        # DATABASE
-        #if config.mysql_active or config.sqlite_active or config.pgsql_active:
-        #   insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x30 Remote control and IR
-    # ---------------------------------------
-    if packettype == '30':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # Command type
-        if subtype == '04':
-            if ByteToHex(message[7]) == '00':
-                cmndtype = "PC"
-            elif ByteToHex(message[7]) == '01':
-                cmndtype = "AUX1"
-            elif ByteToHex(message[7]) == '02':
-                cmndtype = "AUX2"
-            elif ByteToHex(message[7]) == '03':
-                cmndtype = "AUX3"
-            elif ByteToHex(message[7]) == '04':
-                cmndtype = "AUX4"
-            else:
-                cmndtype = "Unknown"
-        
-        # Command
-        if subtype == '00':
-            command = rfx.rfx_subtype_30_atiremotewonder[ByteToHex(message[5])]
-        elif subtype == '01':
-            command = "Not implemented in RFXCMD"
-        elif subtype == '02':
-            command = rfx.rfx_subtype_30_medion[ByteToHex(message[5])]
-        elif subtype == '03':
-            command = "Not implemented in RFXCMD"
-        elif subtype == '04':
-            command = "Not implemented in RFXCMD"
-        
-        toggle = ByteToHex(message[6])
-        
-        if subtype == '00' or subtype == '02' or subtype == '03':
-            signal = rfxdecode.decodeSignal(message[6])
-        
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_30[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= " + id1
-            print "Command\t\t\t= " + command
-            if subtype == '04':
-                print "Toggle\t\t\t= " + toggle
-            if subtype == '04':
-                print "CommandType\t= " + cmndtype
-            print "Signal level\t\t= " + str(signal)
-        
-        # CSV 
-        if cmdarg.printout_csv:
-            logger.debug("CSV Output")
-            if subtype == '00' or subtype == '02':
-                sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(signal), id1, command))
-            elif subtype == '04' or subtype == '01' or subtype == '03':
-                command = "Not implemented in RFXCMD"
-            sys.stdout.flush()
-
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", id1 )
-                    action = action.replace("$command$", command )
-                    if subtype == '04':
-                        action = action.replace("$toggle$", toggle )
-                        action = action.replace("$command$", cmndtype )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            if subtype == '00' or subtype == '02':
-                insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 0, signal, id1, 0, command, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-            elif subtype == '04' or subtype == '01' or subtype == '03':
-                command = "Not implemented in RFXCMD"
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x40 - Thermostat1
-    # Credit: Jean-François Pucheu
-    # ---------------------------------------
-    if packettype == '40':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2
-        temperature = int(ByteToHex(message[6]), 16)
-        temperature_set = int(ByteToHex(message[7]), 16)
-        status_temp = str(testBit(int(ByteToHex(message[8]),16),0) + testBit(int(ByteToHex(message[8]),16),1))
-        status = rfx.rfx_subtype_40_status[status_temp]
-        if testBit(int(ByteToHex(message[8]),16),7) == 128:
-            mode = rfx.rfx_subtype_40_mode['1']
-        else:
-            mode = rfx.rfx_subtype_40_mode['0']
-        signal = rfxdecode.decodeSignal(message[9])
+# ----------------------------------------------------------------------------
 
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_40[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= " + sensor_id
+def process_0x5A(result):
+    """
+    0x5A Energy sensor
+    Credit: Jean-Michel ROY
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    count = result['count']
+    instant = result['instant']
+    usage = result['usage']
+    battery = result['battery']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_5A[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Id\t\t\t= " + sensor_id
+        print "Count\t\t\t= " + str(count)
+        print "Instant usage\t\t= " + str(instant) + " Watt"
+        print "Total usage\t\t= " + str(usage) + " Wh"
+        print "Battery\t\t\t= " + str(battery)
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv == True:
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" %
+                        (timestamp, unixtime_utc, packettype, subtype, seqnbr, sensor_id,
+                        str(instant), str(usage), str(battery), str(signal)) )
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        if trigger_process(result, [("id", str(sensor_id)), ("count", str(count)),
+                                    ("instant", str(instant)), ("total", str(usage)),
+                                    ("battery", str(battery)), ("signal", str(signal))]):
+            return
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, count, 0, 0, 0, float(instant), 0, 0,float(usage), 0, 0)
+
+    # XPL
+    if config.xpl_active:
+        send_xpl('device=Energy.'+sensor_id+'\ntype=instant_usage\ncurrent='+str(instant)+'\nunits=W')
+        send_xpl('device=Energy.'+sensor_id+'\ntype=total_usage\ncurrent='+str(usage)+'\nunits=Wh')
+        send_xpl('device=Energy.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%')
+        send_xpl('device=Energy.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
+
+    # RRD
+    if config.rrd_active == True:
+        with metrics.time('rrd'):
+            rfxrrd.rrd1Metric(packettype, sensor_id, instant, config.rrd_path)
+
+# ----------------------------------------------------------------------------
+
+def process_0x5B(result):
+    """
+    0x5B Current Sensor
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    count = result['count']
+    channel1 = result['channel1']
+    channel2 = result['channel2']
+    channel3 = result['channel3']
+    total = result['total']
+    battery = result['battery']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_5B[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Id\t\t\t= " + sensor_id
+        print "Counter\t\t\t= " + str(count)
+        print "Channel 1\t\t= " + str(channel1) + "A"
+        print "Channel 2\t\t= " + str(channel2) + "A"
+        print "Channel 3\t\t= " + str(channel3) + "A"
+        if total <> 0:
+            print("Total\t\t\t= %s Wh" % str(round(total,1)))
+        print "Battery\t\t\t= " + str(battery)
+        print "Signal level\t\t= " + str(signal)
+
+    # TRIGGER
+    if config.trigger_active:
+        if trigger_process(result, [("id", str(sensor_id)), ("counter", str(count)),
+                                    ("channel1", str(channel1)), ("channel2", str(channel2)),
+                                    ("channel3", str(channel3)), ("battery", str(battery)),
+                                    ("signal", str(signal)), ("total", str(total))]):
+            return
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, count, 0, 0, 0, float(channel1), float(channel2), float(channel3), float(total), 0, 0)
+
+    # XPL
+    if config.xpl_active:
+        send_xpl('device=Current.'+sensor_id+'\ntype=channel1\ncurrent='+str(channel1)+'\nunits=A')
+        send_xpl('device=Current.'+sensor_id+'\ntype=channel2\ncurrent='+str(channel2)+'\nunits=A')
+        send_xpl('device=Current.'+sensor_id+'\ntype=channel3\ncurrent='+str(channel3)+'\nunits=A')
+        if total <> 0:
+            send_xpl('device=Current.'+sensor_id+'\ntype=total\ncurrent='+str(total)+'\nunits=Wh')
+        send_xpl('device=Current.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%')
+        send_xpl('device=Current.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
+
+# ----------------------------------------------------------------------------
+
+def process_0x5C(result):
+    """
+    0x5C Power Sensors
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    sensor_id = result['id']
+    voltage = result['voltage']
+    current = result['current']
+    power = result['power']
+    energy = result['energy']
+    powerfactor = result['powerfactor']
+    freq = result['freq']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        print("Subtype\t\t\t= %s" % str(rfx.rfx_subtype_5C[subtype]))
+        print("Seqnbr\t\t\t= %s" % str(seqnbr))
+        print("Id\t\t\t= %s" % str(sensor_id))
+        print("Voltage\t\t\t= %s Volt" % (str(voltage)))
+        print("Current\t\t\t= %s Ampere" % str(current))
+        print("Instant power\t\t= %s Watt" % str(power))
+        print("Total usage\t\t= %s kWh" % str(energy))
+        print("Power factor\t\t= %s " % str(powerfactor))
+        print("Frequency\t\t= %s Hz" % str(freq))
+        print("Signal level\t\t= %s" % str(signal))
+
+    # TRIGGER
+    if config.trigger_active:
+        if trigger_process(result, [("id", str(sensor_id)), ("voltage", str(voltage)),
+                                    ("current", str(current)), ("instantpower", str(power)),
+                                    ("totalusage", str(energy)), ("powerfactor", str(powerfactor)),
+                                    ("frequency", str(freq)), ("signal", str(signal))]):
+            return
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, sensor_id, 0, 0, 0, 0, voltage, freq, float(power), float(current), float(powerfactor), float(energy), 0, 0)
+
+    # XPL
+    if config.xpl_active:
+        send_xpl('device=Current.'+sensor_id+'\ntype=voltage\ncurrent='+str(voltage)+'\nunits=V')
+        send_xpl('device=Current.'+sensor_id+'\ntype=current\ncurrent='+str(current)+'\nunits=A')
+        send_xpl('device=Current.'+sensor_id+'\ntype=instantpower\ncurrent='+str(power)+'\nunits=Watt')
+        send_xpl('device=Current.'+sensor_id+'\ntype=totalusage\ncurrent='+str(energy)+'\nunits=kWh')
+        send_xpl('device=Current.'+sensor_id+'\ntype=powerfactor\ncurrent='+str(powerfactor)+'\nunits=%')
+        send_xpl('device=Current.'+sensor_id+'\ntype=frequency\ncurrent='+str(freq)+'\nunits=Hz')
+        send_xpl('device=Current.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%')
+
+# ----------------------------------------------------------------------------
+
+def process_not_implemented(result):
+    """
+    0x5E Gas Usage Sensor, 0x5F Water Usage Sensor, 0x72 FS20
+    Packets that are printed and triggered on, but not decoded
+    """
+    subtypes = {
+        '5E' : rfx.rfx_subtype_5E,
+        '5F' : rfx.rfx_subtype_5F,
+        '72' : rfx.rfx_subtype_72
+        }
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        print "Subtype\t\t\t= " + subtypes[result['packettype']][result['subtype']]
+        print "Not implemented in RFXCMD, please send sensor data to sebastian.sjoholm@gmail.com"
+
+    # TRIGGER
+    if config.trigger_active:
+        trigger_process(result, [])
+
+# ----------------------------------------------------------------------------
+
+def process_0x70(result):
+    """
+    0x70 RFXsensor
+    """
+    timestamp = result['timestamp']
+    unixtime_utc = result['unixtime']
+    packettype = result['packettype']
+    subtype = result['subtype']
+    seqnbr = result['seqnbr']
+    id1 = result['id1']
+    temperature = result['temperature']
+    voltage = result['voltage']
+    signal = result['signal']
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_70[subtype]
+        print "Seqnbr\t\t\t= " + seqnbr
+        print "Id\t\t\t= " + id1
+
+        if subtype == '00':
             print "Temperature\t\t= " + str(temperature) + " C"
-            print "Temperature set\t\t= " + str(temperature_set) + " C"
-            print "Mode\t\t\t= " + mode
-            print "Status\t\t\t= " + status
-            print "Signal level\t\t= " + str(signal)
-
-        # CSV 
-        if cmdarg.printout_csv:
-            logger.debug("CSV Output")
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(signal), mode, status, str(temperature_set), str(temperature) ))
-            sys.stdout.flush()
-    
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$temperature$", str(temperature) )
-                    action = action.replace("$temperatureset$", str(temperature_set) )
-                    action = action.replace("$mode$", mode )
-                    action = action.replace("$status$", status )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, sensor_id, mode, status, 0, 0, 0, temperature_set, temperature, 0, 0, 0, 0, 0)
-
-        # XPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=Thermostat.'+sensor_id+'\ntype=temperature\ncurrent='+temperature+'\nunits=C', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Thermostat.'+sensor_id+'\ntype=temperature_set\ncurrent='+temperature_set+'\nunits=C', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Thermostat.'+sensor_id+'\ntype=mode\ncurrent='+mode+'\n', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Thermostat.'+sensor_id+'\ntype=status\ncurrent='+mode+'\n', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Thermostat.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Thermostat.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x41 Thermostat2
-    # ---------------------------------------
-    if packettype == '41':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_41[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            # TODO
-        
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x42 Thermostat3
-    # ---------------------------------------
-    if packettype == '42':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
+
+        if subtype == '01' or subtype == '02':
+            print "Voltage\t\t\t= " + str(voltage) + " mV"
+
+        if subtype == '03':
+            print "Message\t\t\t= " + result['message']
+
+        print "Signal level\t\t= " + str(signal)
+
+    # CSV
+    if cmdarg.printout_csv == True:
         if subtype == '00':
-            unitcode = ByteToHex(message[4])
-        elif subtype == '01':
-            unitcode = ByteToHex(message[4]) + ByteToHex(message[5]) + ByteToHex(message[6])
-        else:
-            unitcode = "00"
-        
-        logger.debug("Unitcode: " + unitcode)
-        
+            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(signal), id1, str(temperature)))
+        if subtype == '01' or subtype == '02':
+            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(signal), id1, str(voltage)))
+        sys.stdout.flush()
+
+    # TRIGGER
+    if config.trigger_active:
+        values = [("id", id1)]
         if subtype == '00':
-            command = rfx.rfx_subtype_42_cmd00[ByteToHex(message[7])]
-        elif subtype == '01':
-            command = rfx.rfx_subtype_42_cmd01[ByteToHex(message[7])]
-        else:
-            command = '0'
+            values.append(("temperature", str(temperature)))
+        if subtype == '01' or subtype == '02':
+            values.append(("voltage", str(voltage)))
+        if subtype == '03':
+            values.append(("message", result['message']))
+        values.append(("signal", str(signal)))
+        if trigger_process(result, values):
+            return
+
+    # DATABASE
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, id1, result['msg1'], result['msg2'], 0, 0, 0, voltage, float(temperature), 0, 0, 0, 0, 0)
+
+# ----------------------------------------------------------------------------
+
+def process_0x71(result):
+    """
+    0x71 RFXmeter
+    """
+    id1 = result['id1']
+    sensor_power = result['power']
+
+    # PRINTOUT
+    if cmdarg.printout_complete == True:
+        print "Subtype\t\t\t= " + rfx.rfx_subtype_71[result['subtype']]
+        print "Seqnbr\t\t\t= " + result['seqnbr']
+        print "Id\t\t\t= " + id1
+        print "Power\t\t\t= " + str(sensor_power)
+
+    # TRIGGER
+    if config.trigger_active:
+        if trigger_process(result, [("id", id1), ("power", str(sensor_power))]):
+            return
+
+    # CSV
+    if cmdarg.printout_csv == True:
+        sys.stdout.write("%s;%s;%s;%s;%s;%s;%s\n" % (result['timestamp'], result['unixtime'], result['packettype'], result['subtype'], result['seqnbr'], result['id'], str(sensor_power)))
+        sys.stdout.flush()
+
+# ----------------------------------------------------------------------------
+# Packet handler for each packettype with a decoder in rfx_decoder
+# ----------------------------------------------------------------------------
 
-        logger.debug("Command: " + command)
+rfx_handler = {
+    '00' : process_0x00,
+    '01' : process_0x01,
+    '02' : process_0x02,
+    '03' : process_0x03,
+    '10' : process_0x10,
+    '11' : process_0x11,
+    '12' : process_0x12,
+    '13' : process_0x13,
+    '14' : process_0x14,
+    '15' : process_0x15,
+    '16' : process_0x16,
+    '17' : process_not_completed,
+    '18' : process_not_completed,
+    '19' : process_not_completed,
+    '1A' : process_0x1A,
+    '20' : process_0x20,
+    '28' : process_not_completed,
+    '30' : process_0x30,
+    '40' : process_0x40,
+    '41' : process_0x41,
+    '42' : process_0x42,
+    '50' : process_0x50,
+    '51' : process_0x51,
+    '52' : process_0x52,
+    '54' : process_0x54,
+    '55' : process_0x55,
+    '56' : process_0x56,
+    '57' : process_0x57,
+    '58' : process_0x58,
+    '59' : process_0x59,
+    '5A' : process_0x5A,
+    '5B' : process_0x5B,
+    '5C' : process_0x5C,
+    '5E' : process_not_implemented,
+    '5F' : process_not_implemented,
+    '70' : process_0x70,
+    '71' : process_0x71,
+    '72' : process_not_implemented
+    }
 
-        signal = rfxdecode.decodeSignal(message[8])
+# ----------------------------------------------------------------------------
 
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            logger.debug("Printout data")
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_42[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Unitcode\t\t= " + unitcode
-            print "Command\t\t\t= " + command
-            print "Signal level\t\t= " + str(signal)
-
-        # CSV 
-        if cmdarg.printout_csv:
-            logger.debug("Output in CSV")
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s\n" %(timestamp, packettype, subtype, seqnbr, str(signal), unitcode, command))
-            sys.stdout.flush()
-
-        # TRIGGER
-        if config.trigger_active:
-            logger.debug("Check trigger")
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$unitcode$", unitcode )
-                    action = action.replace("$command$", command )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, unitcode, 0, command, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-
-        # XPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=Thermostat.'+unitcode+'\ntype=command\ncurrent='+command+'\nunits=C', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Thermostat.'+unitcode+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
+def decodePacket(message, unixtime=None):
+    """
+    Decode incoming RFXtrx message, received at unixtime (default now).
+    """
 
-    # ---------------------------------------
-    # 0x50 - Temperature sensors
-    # ---------------------------------------
-    if packettype == '50':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2
-        temperature = rfxdecode.decodeTemperature(message[6], message[7])
-        signal = rfxdecode.decodeSignal(message[8])
-        battery = rfxdecode.decodeBattery(message[8])
-        
-        # PRINTOUT
-        if cmdarg.printout_complete:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_50[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= " + sensor_id
-            print "Temperature\t\t= " + temperature + " C"
-            print "Battery\t\t\t= " + str(battery)
-            print "Signal level\t\t= " + str(signal)
-
-        # CSV
-        if cmdarg.printout_csv:
-            logger.debug("CSV Output")
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, sensor_id, str(battery), str(signal), temperature ))
-            sys.stdout.flush()
-            
-        # TRIGGER
-        if config.trigger_active:
-            logger.debug("Check trigger")
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$temperature$", str(temperature) )
-                    action = action.replace("$battery$", str(battery) )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-                else:
-                    logger.debug("No trigger match")
-        
-        # GRAPHITE
-        if config.graphite_active == True:
-            logger.debug("Send to Graphite")
-            now = int( time.time() )
-            linesg=[]
-            linesg.append("%s.%s.temperature %s %d" % ( 'rfxcmd', sensor_id, temperature,now))
-            linesg.append("%s.%s.battery %s %d" % ( 'rfxcmd', sensor_id, battery,now))
-            linesg.append("%s.%s.signal %s %d"% ( 'rfxcmd', sensor_id, signal,now))
-            send_graphite(config.graphite_server, config.graphite_port, linesg)
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, 0, 0, 0, 0, float(temperature), 0, 0, 0, 0, 0)
-        
-        # XPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=Temp.'+sensor_id+'\ntype=temp\ncurrent='+temperature+'\nunits=C', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Temp.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Temp.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        # WEEWX
-        if config.weewx_active:
-            for sensor in weewxlist.data:
-                type = sensor.getElementsByTagName('type')[0].childNodes[0].nodeValue
-                id = sensor.getElementsByTagName('id')[0].childNodes[0].nodeValue
-                sensor_type = packettype + subtype
-                if type == sensor_type and id == sensor_id:
-                    logger.debug("Weewx action, Sensor type: %s, id: %s" % (str(type), str(id)))
-                    wwx.wwx_0x51_temp = temperature
-                    wwx.wwx_0x51_batt = battery
-                    wwx.wwx_0x51_rssi = signal
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x51 - Humidity sensors
-    # ---------------------------------------
-    if packettype == '51':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2
-        humidity = int(ByteToHex(message[6]),16)
-        humidity_status = rfx.rfx_subtype_51_humstatus[ByteToHex(message[7])]
-        signal = rfxdecode.decodeSignal(message[8])
-        battery = rfxdecode.decodeBattery(message[8])
-        
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_51[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= " + sensor_id
-            print "Humidity\t\t= " + str(humidity)
-            print "Humidity Status\t\t= " + humidity_status
-            print "Battery\t\t\t= " + str(battery)
-            print "Signal level\t\t= " + str(signal)
-        
-        # CSV
-        if cmdarg.printout_csv:
-            logger.debug("CSV Output")
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" %
-                            (timestamp, unixtime_utc, packettype, subtype, seqnbr, sensor_id, humidity_status, str(humidity), str(battery), str(signal)) )
-            sys.stdout.flush()
-        
-        # TRIGGER
-        if config.trigger_active:
-            logger.debug("Check trigger")
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$humidity$", str(humidity) )
-                    action = action.replace("$battery$", str(battery) )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        # GRAPHITE
-        if config.graphite_active == True:
-            logger.debug("Send to Graphite")
-            now = int( time.time() )
-            linesg=[]
-            linesg.append("%s.%s.humidity %s %d" % ( 'rfxcmd', sensor_id, humidity,now))
-            linesg.append("%s.%s.battery %s %d" % ( 'rfxcmd', sensor_id, battery,now))
-            linesg.append("%s.%s.signal %s %d"% ( 'rfxcmd', sensor_id, signal,now))
-            send_graphite(config.graphite_server, config.graphite_port, linesg)
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, humidity_status, humidity, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-        
-        # XPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=Hum.'+sensor_id+'\ntype=humidity\ncurrent='+str(humidity)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Hum.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Hum.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        # WEEWX
-        if config.weewx_active:
-            for sensor in weewxlist.data:
-                type = sensor.getElementsByTagName('type')[0].childNodes[0].nodeValue
-                id = sensor.getElementsByTagName('id')[0].childNodes[0].nodeValue
-                sensor_type = packettype + subtype
-                if type == sensor_type and id == sensor_id:
-                    logger.debug("Weewx action, Sensor type: %s, id: %s" % (str(type), str(id)))
-                    wwx.wwx_0x51_hum = humidity
-                    wwx.wwx_0x51_batt = battery
-                    wwx.wwx_0x51_rssi = signal
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x52 - Temperature and humidity sensors
-    # ---------------------------------------
-    if packettype == '52':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2
-        temperature = rfxdecode.decodeTemperature(message[6], message[7])
-        humidity = int(ByteToHex(message[8]),16)
-        humidity_status = rfx.rfx_subtype_52_humstatus[ByteToHex(message[9])]
-        signal = rfxdecode.decodeSignal(message[10])
-        battery = rfxdecode.decodeBattery(message[10])
-        
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            logger.debug("Print data stdout")
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_52[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= " + sensor_id
-            print "Temperature\t\t= " + temperature + " C"
-            print "Humidity\t\t= " + str(humidity) + "%"
-            print "Humidity Status\t\t= " + humidity_status
-            print "Battery\t\t\t= " + str(battery)
-            print "Signal level\t\t= " + str(signal)
-        
-        # CSV
-        if cmdarg.printout_csv == True:
-            logger.debug("CSV Output")
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" %
-                            (timestamp, unixtime_utc, packettype, subtype, seqnbr, sensor_id, humidity_status,
-                            temperature, str(humidity), str(battery), str(signal)) )
-            sys.stdout.flush()
-        
-        # TRIGGER
-        if config.trigger_active:
-            logger.debug("Check trigger")
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$temperature$", str(temperature) )
-                    action = action.replace("$humidity$", str(humidity) )
-                    action = action.replace("$battery$", str(battery) )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # GRAPHITE
-        if config.graphite_active == True:
-            logger.debug("Send to Graphite")
-            now = int( time.time() )
-            linesg=[]
-            linesg.append("%s.%s.temperature %s %d" % ( 'rfxcmd', sensor_id, temperature,now))
-            linesg.append("%s.%s.humidity %s %d" % ( 'rfxcmd', sensor_id, humidity,now))
-            linesg.append("%s.%s.battery %s %d" % ( 'rfxcmd', sensor_id, battery,now))
-            linesg.append("%s.%s.signal %s %d"% ( 'rfxcmd', sensor_id, signal,now))
-            send_graphite(config.graphite_server, config.graphite_port, linesg)
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, humidity_status, humidity, 0, 0, 0, float(temperature), 0, 0, 0, 0, 0)
-        
-        # XPL
-        if config.xpl_active:
-            logger.debug("Send to xPL")
-            xpl.send(config.xpl_host, 'device=HumTemp.'+sensor_id+'\ntype=temp\ncurrent='+temperature+'\nunits=C', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=HumTemp.'+sensor_id+'\ntype=humidity\ncurrent='+str(humidity)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=HumTemp.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=HumTemp.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        # RRD
-        if config.rrd_active == True:
-            rfxrrd.rrd2Metrics(packettype, sensor_id, temperature, humidity, config.rrd_path)
-        
-        # WEEWX
-        if config.weewx_active:
-            for sensor in weewxlist.data:
-                type = sensor.getElementsByTagName('type')[0].childNodes[0].nodeValue
-                id = sensor.getElementsByTagName('id')[0].childNodes[0].nodeValue
-                sensor_type = packettype + subtype
-                if type == sensor_type and id == sensor_id:
-                    logger.debug("Weewx action, Sensor type: %s, id: %s" % (str(type), str(id)))
-                    wwx.wwx_0x52_temp = temperature
-                    wwx.wwx_0x52_hum = humidity
-                    wwx.wwx_0x52_batt = battery
-                    wwx.wwx_0x52_rssi = signal
-            
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x53 - Barometric
-    # RESERVED FOR FUTURE
-    # ---------------------------------------
+    if unixtime is None:
+        unixtime = time.time()
+    timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(unixtime))
+    unixtime_utc = int(unixtime)
 
-    # ---------------------------------------
-    # 0x54 - Temperature, humidity and barometric sensors
-    # Credit: Jean-Baptiste Bodart
-    # ---------------------------------------
-    if packettype == '54':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2
-        temperature = rfxdecode.decodeTemperature(message[6], message[7])
-        humidity = int(ByteToHex(message[8]),16)
-        try:
-            humidity_status = rfx.rfx_subtype_54_humstatus[ByteToHex(message[9])]
-        except:
-            logger.debug("Humidity status [" + ByteToHex(message[9]) + "] is unknown (" + ByteToHex(message) + ")")
-            humidity_status = "Unknown"
-        barometric_high = ByteToHex(message[10])
-        barometric_low = ByteToHex(message[11])
-        barometric_high = clearBit(int(barometric_high,16),7)
-        barometric_high = barometric_high << 8
-        barometric = ( barometric_high + int(barometric_low,16) )
-        if config.barometric <> 0:
-            barometric = int(barometric) + int(config.barometric)
-        forecast = rfx.rfx_subtype_54_forecast[ByteToHex(message[12])]
-        signal = rfxdecode.decodeSignal(message[13])
-        battery = rfxdecode.decodeBattery(message[13])
-        
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            logger.debug("Printout")
-            print("Subtype\t\t\t= %s " % str(rfx.rfx_subtype_54[subtype]))
-            print("Seqnbr\t\t\t= %s " % str(seqnbr))
-            print("Id\t\t\t= %s " % str(sensor_id))
-            print("Temperature\t\t= %s C " % str(temperature))
-            print("Humidity\t\t= %s " % str(humidity))
-            if not humidity_status == False:
-                print("Humidity Status\t\t= %s " % str(humidity_status))
-            print("Barometric pressure\t= %s hPa" % str(barometric))
-            print("Forecast Status\t\t= %s " % str(forecast))
-            print("Signal level\t\t= %s " % str(signal))
-            print("Battery\t\t\t= %s " % str(battery))
-        
-        # CSV
-        if cmdarg.printout_csv == True:
-            logger.debug("CSV")
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" %
-                            (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(battery), str(signal), sensor_id,
-                            forecast, humidity_status, str(humidity), str(barometric), str(temperature)))
-            sys.stdout.flush()
-        
-        # TRIGGER
-        if config.trigger_active:   
-            logger.debug("Trigger")
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$temperature$", str(temperature) )
-                    action = action.replace("$humidity$", str(humidity) )
-                    action = action.replace("$barometric$", str(barometric) )
-                    action = action.replace("$battery$", str(battery) )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # GRAPHITE
-        if config.graphite_active == True:
-            logger.debug("Send to Graphite")
-            now = int( time.time() )
-            linesg=[]
-            linesg.append("%s.%s.temperature %s %d" % ( 'rfxcmd', sensor_id, temperature,now))
-            linesg.append("%s.%s.humidity %s %d" % ( 'rfxcmd', sensor_id, humidity,now))
-            linesg.append("%s.%s.barometric %s %d" % ( 'rfxcmd', sensor_id, barometric,now))
-            linesg.append("%s.%s.battery %s %d" % ( 'rfxcmd', sensor_id, battery,now))
-            linesg.append("%s.%s.signal %s %d"% ( 'rfxcmd', sensor_id, signal,now))
-            send_graphite(config.graphite_server, config.graphite_port, linesg)
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, forecast, humidity_status, humidity, barometric, 0, 0, float(temperature), 0, 0, 0, 0, 0)
-        
-        # XPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=HumTempBaro.'+sensor_id+'\ntype=temp\ncurrent='+temperature+'\nunits=C', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=HumTempBaro.'+sensor_id+'\ntype=humidity\ncurrent='+str(humidity)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=HumTempBaro.'+sensor_id+'\ntype=humidity\ncurrent='+str(barometric)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=HumTempBaro.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=HumTempBaro.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        # WEEWX
-        if config.weewx_active:
-            for sensor in weewxlist.data:
-                type = sensor.getElementsByTagName('type')[0].childNodes[0].nodeValue
-                id = sensor.getElementsByTagName('id')[0].childNodes[0].nodeValue
-                sensor_type = packettype + subtype
-                if type == sensor_type and id == sensor_id:
-                    logger.debug("Weewx action, Sensor type: %s, id: %s" % (str(type), str(id)))
-                    wwx.wwx_0x54_temp = temperature
-                    wwx.wwx_0x54_hum = humidity
-                    wwx.wwx_0x54_baro = barometric
-                    wwx.wwx_0x54_batt = battery
-                    wwx.wwx_0x54_rssi = signal
-         
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
+    raw_message = binascii.hexlify(message).upper()
 
-    # ---------------------------------------
-    # 0x55 - Rain sensors
-    # ---------------------------------------
-    if packettype == '55':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2
-        rainrate_high = ByteToHex(message[6])
-        rainrate_low = ByteToHex(message[7])
-        if subtype == '01':
-            rainrate = int(rainrate_high,16) * 0x100 + int(rainrate_low,16)
-        elif subtype == '02':
-            rainrate = float( int(rainrate_high,16) * 0x100 + int(rainrate_low,16) ) / 100
-        else:
-            rainrate = 0
-        raintotal1 = ByteToHex(message[8])
-        raintotal2 = ByteToHex(message[9])
-        raintotal3 = ByteToHex(message[10])
-        if subtype <> '06':
-            raintotal = float( (int(raintotal1, 16) * 0x1000) + (int(raintotal2, 16) * 0x100) + int(raintotal3, 16) ) / 10
-        else:
-            raintotal = 0
-        signal = rfxdecode.decodeSignal(message[11])
-        battery = rfxdecode.decodeBattery(message[11])
-        
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_55[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= " + sensor_id
-            
-            if subtype == '01' or subtype == '02':
-                print "Rain rate\t\t= " + str(rainrate) + " mm/hr"
-            
-            if subtype <> '06':
-                print "Raintotal:\t\t= " + str(raintotal) + " mm"
-            else:
-                print "Raintotal:\t\t= Not implemented in rfxcmd, need example data"
-            
-            print "Battery\t\t\t= " + str(battery)
-            print "Signal level\t\t= " + str(signal)
-        
-        # CSV
-        if cmdarg.printout_csv == True:
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" %
-                            ( timestamp, unixtime_utc, packettype, subtype, seqnbr, id1, id2,
-                            str(rainrate), str(int(raintotal1,16)), 
-                            str(battery), str(signal) ) )
-            sys.stdout.flush()
-        
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$rainrate$", str(rainrate) )
-                    action = action.replace("$raintotal$", str(raintotal) )
-                    action = action.replace("$battery$", str(battery) )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # GRAPHITE
-        if config.graphite_active == True:
-            logger.debug("Send to Graphite")
-            now = int( time.time() )
-            linesg=[]
-            linesg.append("%s.%s.rainrate %s %d" % ( 'rfxcmd', sensor_id, rainrate,now))
-            linesg.append("%s.%s.raintotal %s %d" % ( 'rfxcmd', sensor_id, raintotal,now))
-            linesg.append("%s.%s.battery %s %d" % ( 'rfxcmd', sensor_id, battery,now))
-            linesg.append("%s.%s.signal %s %d"% ( 'rfxcmd', sensor_id, signal,now))
-            send_graphite(config.graphite_server, config.graphite_port, linesg)
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, 0, 0, 0, 0, float(rainrate), float(raintotal), 0, 0, 0, 0)
-        
-        # WEEWX
-        if config.weewx_active:
-            for sensor in weewxlist.data:
-                type = sensor.getElementsByTagName('type')[0].childNodes[0].nodeValue
-                id = sensor.getElementsByTagName('id')[0].childNodes[0].nodeValue
-                sensor_type = packettype + subtype
-                if type == sensor_type and id == sensor_id:
-                    logger.debug("Weewx action, Sensor type: %s, id: %s" % (str(type), str(id)))
-                    wwx.wwx_0x55_rainrate = rainrate
-                    wwx.wwx_0x55_raintotal = raintotal
-                    wwx.wwx_0x55_batt = battery
-                    wwx.wwx_0x55_rssi = signal
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-    
-    # ---------------------------------------
-    # 0x56 - Wind sensors
-    # ---------------------------------------
-    if packettype == '56':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2
-        direction = ( ( int(ByteToHex(message[6]),16) * 256 ) + int(ByteToHex(message[7]),16) )
-        if subtype <> "05":
-            av_speed = ( ( int(ByteToHex(message[8]),16) * 256 ) + int(ByteToHex(message[9]),16) ) * 0.1
-        else:
-            av_speed = 0;
-        gust = ( ( int(ByteToHex(message[10]),16) * 256 ) + int(ByteToHex(message[11]),16) ) * 0.1
-        if subtype == "04":
-            temperature = rfxdecode.decodeTemperature(message[12], message[13])
-        else:
-            temperature = 0
-        if subtype == "04":
-            windchill = rfxdecode.decodeTemperature(message[14], message[15])
-        else:
-            windchill = 0
-        signal = rfxdecode.decodeSignal(message[16])
-        battery = rfxdecode.decodeBattery(message[16])
-        
-        # PRINTOUT
+    # Verify incoming message
+    logger.debug("Verify incoming packet")
+    if not test_rfx( raw_message ):
+        metrics.count('invalid')
+        logger.error("The incoming message is invalid (" + ByteToHex(message) + ") Line: " + _line())
         if cmdarg.printout_complete == True:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_56[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= " + sensor_id
-            print "Wind direction\t\t= " + str(direction) + " degrees"
-            if subtype <> "05":
-                print "Average wind\t\t= " + str(av_speed) + " mtr/sec"
-            if subtype == "04":
-                print "Temperature\t\t= " + str(temperature) + " C"
-                print "Wind chill\t\t= " + str(windchill) + " C" 
-            print "Windgust\t\t= " + str(gust) + " mtr/sec"
-            print "Battery\t\t\t= " + str(battery)
-            print "Signal level\t\t= " + str(signal)
-        
-        # CSV
-        if cmdarg.printout_csv == True:
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" %
-                            (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(battery), str(signal), sensor_id, str(temperature), str(av_speed), str(gust), str(direction), str(windchill) ) )
-            sys.stdout.flush()
-        
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$direction$", str(direction) )
-                    if subtype <> "05":
-                        action = action.replace("$average$", str(av_speed) )
-                    if subtype == "04":
-                        action = action.replace("$temperature$", str(temperature) )
-                        action = action.replace("$windchill$", str(windchill) )
-                    action = action.replace("$windgust$", str(gust) )
-                    action = action.replace("$battery$", str(battery) )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # GRAPHITE
-        if config.graphite_active == True:
-            logger.debug("Send to Graphite")
-            now = int( time.time() )
-            linesg=[]
-            linesg.append("%s.%s.direction %s %d" % ( 'rfxcmd', sensor_id, direction,now))
-            if subtype <> "05":
-                linesg.append("%s.%s.average %s %d" % ( 'rfxcmd', sensor_id, av_speed,now))
-            if subtype == "04":
-                linesg.append("%s.%s.chill %s %d" % ( 'rfxcmd', sensor_id, windchill,now))
-                linesg.append("%s.%s.temperature %s %d" % ( 'rfxcmd', sensor_id, temperature,now))
-            linesg.append("%s.%s.gust %s %d" % ( 'rfxcmd', sensor_id, gust, now))
-            linesg.append("%s.%s.battery %s %d" % ( 'rfxcmd', sensor_id, battery, now))
-            linesg.append("%s.%s.signal %s %d"% ( 'rfxcmd', sensor_id, signal, now))
-            send_graphite(config.graphite_server, config.graphite_port, linesg)
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, 0, 0, 0, 0, float(temperature), av_speed, gust, direction, float(windchill), 0)
-        
-        # xPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=Wind.'+sensor_id+'\ntype=direction\ncurrent='+str(direction)+'\nunits=Degrees', config.xpl_sourcename, config.xpl_includehostname)
-            
-            if subtype <> "05":
-                xpl.send(config.xpl_host, 'device=Wind.'+sensor_id+'\ntype=Averagewind\ncurrent='+str(av_speed)+'\nunits=mtr/sec', config.xpl_sourcename, config.xpl_includehostname)
-            
-            if subtype == "04":
-                xpl.send(config.xpl_host, 'device=Wind.'+sensor_id+'\ntype=temperature\ncurrent='+str(temperature)+'\nunits=C', config.xpl_sourcename, config.xpl_includehostname)
-                xpl.send(config.xpl_host, 'device=Wind.'+sensor_id+'\ntype=windchill\ncurrent='+str(windchill)+'\nunits=C', config.xpl_sourcename, config.xpl_includehostname)
-            
-            xpl.send(config.xpl_host, 'device=Wind.'+sensor_id+'\ntype=windgust\ncurrent='+str(gust)+'\nunits=mtr/sec', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Wind.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Wind.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        # WEEWX
-        if config.weewx_active:
-            for sensor in weewxlist.data:
-                type = sensor.getElementsByTagName('type')[0].childNodes[0].nodeValue
-                id = sensor.getElementsByTagName('id')[0].childNodes[0].nodeValue
-                sensor_type = packettype + subtype
-                if type == sensor_type and id == sensor_id:
-                    logger.debug("Weewx action, Sensor type: %s, id: %s" % (str(type), str(id)))
-                    wwx.wwx_0x56_direction = direction
-                    if subtype <> "05":
-                        wwx.wwx_0x56_avspeed = av_speed
-                    else:
-                        wwx.wwx_0x56_avspeed = "None"
-                    if subtype == "04":
-                        wwx.wwx_0x56_temp = temperature
-                        wwx.wwx_0x56_chill = windchill
-                    else:
-                        wwx.wwx_0x56_temp = "None"
-                        wwx.wwx_0x56_chill = "None"
-                    wwx.wwx_0x56_gust = gust
-                    wwx.wwx_0x56_batt = battery
-                    wwx.wwx_0x56_rssi = signal
-            
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
+            print "Error: The incoming message is invalid " + _line()
+            return
+    else:
+        logger.debug("Verified OK")
 
-    # ---------------------------------------
-    # 0x57 UV Sensor
-    # ---------------------------------------
-    if packettype == '57':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2
-        uv = int(ByteToHex(message[6]), 16) * 10
-        temperature = rfxdecode.decodeTemperature(message[6], message[8])
-        signal = rfxdecode.decodeSignal(message[9])
-        battery = rfxdecode.decodeBattery(message[9])
-            
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            logger.debug("Printout action")
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_57[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= " + sensor_id
-            print "UV\t\t\t= " + str(uv)
-            if subtype == '03':
-                print "Temperature\t\t= " + temperature + " C"
-            print "Battery\t\t\t= " + str(battery)
-            print "Signal level\t\t= " + str(signal)
-        
-        # CSV
-        if cmdarg.printout_csv:
-            logger.debug("CSVout action")
-            if subtype == '03':
-                sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, sensor_id, str(uv), temperature, str(battery), str(signal) ) )
-            else:
-                sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, sensor_id, str(uv), str(battery), str(signal) ) )
-            sys.stdout.flush()
-        
-        # TRIGGER
-        if config.trigger_active:
-            logger.debug("Trigger action")
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$uv$", str(uv) )
-                    if subtype == '03':
-                        action = action.replace("$temperature$", str(temperature) )
-                    action = action.replace("$battery$", str(battery) )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # GRAPHITE
-        if config.graphite_active == True:
-            logger.debug("Graphite action")
-            now = int( time.time() )
-            linesg=[]
-            if subtype == "03":
-                linesg.append("%s.%s.temperature %s %d" % ( 'rfxcmd', sensor_id, temperature,now))
-            linesg.append("%s.%s.uv %s %d" % ( 'rfxcmd', sensor_id, uv,now))
-            linesg.append("%s.%s.battery %s %d" % ( 'rfxcmd', sensor_id, battery,now))
-            linesg.append("%s.%s.signal %s %d"% ( 'rfxcmd', sensor_id, signal,now))
-            send_graphite(config.graphite_server, config.graphite_port, linesg)
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            logger.debug("Database action")
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, str(uv), 0, 0, 0, float(temperature), 0, 0, 0, 0, 0)
-        
-        # xPL
-        if config.xpl_active:
-            logger.debug("xPL action")
-            xpl.send(config.xpl_host, 'device=UV.'+sensor_id+'\ntype=uv\ncurrent='+str(uv)+'\nunits=Index', config.xpl_sourcename, config.xpl_includehostname)
-            if subtype == "03":
-                xpl.send(config.xpl_host, 'device=UV.'+sensor_id+'\ntype=Temperature\ncurrent='+str(temperature)+'\nunits=Celsius', config.xpl_sourcename, config.xpl_includehostname)
-        
-        # WEEWX
-        if config.weewx_active:
-            for sensor in weewxlist.data:
-                type = sensor.getElementsByTagName('type')[0].childNodes[0].nodeValue
-                id = sensor.getElementsByTagName('id')[0].childNodes[0].nodeValue
-                sensor_type = packettype + subtype
-                if type == sensor_type and id == sensor_id:
-                    logger.debug("Weewx action, Sensor type: %s, id: %s" % (str(type), str(id)))
-                    wwx.wwx_0x57_uv = uv
-                    if subtype == "03":
-                        wwx.wwx_0x57_temp = temperature
-                    else:
-                        wwx.wwx_0x57_temp = "None"
-                    wwx.wwx_0x57_batt = battery
-                    wwx.wwx_0x57_rssi = signal
-            
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
+    packettype = raw_message[2:4]
+    logger.debug("PacketType: %s", packettype)
 
-    # ---------------------------------------
-    # 0x58 Date/Time sensor
-    # ---------------------------------------
-    if packettype == '58':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2
-        date_yy = int(ByteToHex(message[6]), 16)
-        date_mm = int(ByteToHex(message[7]), 16)
-        date_dd = int(ByteToHex(message[8]), 16)
-        date_string = "20%s-%s-%s" % (str(date_yy).zfill(2), str(date_mm).zfill(2), str(date_dd).zfill(2))
-        date_dow = int(ByteToHex(message[9]), 16)
-        time_hr = int(ByteToHex(message[10]), 16)
-        time_min = int(ByteToHex(message[11]), 16)
-        time_sec = int(ByteToHex(message[12]), 16)
-        time_string = "%s:%s:%s" % (str(time_hr), str(time_min), str(time_sec))
-        datetime_string = "%s %s" % (str(date_string), str(time_string))
-        logger.debug("DateTime: %s" % str(datetime_string))
-        signal = rfxdecode.decodeSignal(message[13])
-        battery = rfxdecode.decodeBattery(message[13])
-            
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            logger.debug("Printout action")
-            print("Subtype\t\t\t= %s" % str(rfx.rfx_subtype_58[subtype]))
-            print("Seqnbr\t\t\t= %s" % str(seqnbr))
-            print("Id\t\t\t= %s" % str(sensor_id))
-            print("Time\t\t\t= %s" % str(time_string))
-            print("Date (yy-mm-dd)\t\t= %s" % str(date_string))
-            print("Day of week (1-7)\t= %s" % str(date_dow))
-            print("Battery\t\t\t= %s" % str(battery))
-            print("Signal level\t\t= %s" % str(signal))
-        
-        # CSV
-        if cmdarg.printout_csv:
-            logger.debug("CSVout action")
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, packettype, subtype, seqnbr, sensor_id, str(time_string), str(date_string), str(date_dow), str(battery), str(signal) ) )
-            sys.stdout.flush()
-        
-        # TRIGGER
-        if config.trigger_active:
-            logger.debug("Trigger action")
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$date$", str(date_string) )
-                    action = action.replace("$time$", str(time_string) )
-                    action = action.replace("$dow$", str(date_dow) )
-                    action = action.replace("$battery$", str(battery) )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            logger.debug("Database action")
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, str(date_dow), 0, 0, 0, 0, 0, 0, 0, 0, str(datetime_string))
-        
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-    
-    # ---------------------------------------
-    # 0x59 Current Sensor
-    # ---------------------------------------
-    if packettype == '59':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-    
-        # DATA
-        sensor_id = id1 + id2
-        count = int(ByteToHex(message[6]),16)
-        channel1 = (int(ByteToHex(message[7]),16) * 0x100 + int(ByteToHex(message[8]),16)) * 0.1
-        channel2 = (int(ByteToHex(message[9]),16) * 0x100 + int(ByteToHex(message[10]),16)) * 0.1
-        channel3 = (int(ByteToHex(message[11]),16) * 0x100 + int(ByteToHex(message[12]),16)) * 0.1
-        signal = rfxdecode.decodeSignal(message[13])
-        battery = rfxdecode.decodeBattery(message[13])
-    
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_5A[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= " + sensor_id
-            print "Counter\t\t\t= " + str(count)
-            print "Channel 1\t\t= " + str(channel1) + "A"
-            print "Channel 2\t\t= " + str(channel2) + "A"
-            print "Channel 3\t\t= " + str(channel3) + "A"
-            print "Battery\t\t\t= " + str(battery)
-            print "Signal level\t\t= " + str(signal)
-        
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$counter$", str(count) )
-                    action = action.replace("$channel1$", str(channel1) )
-                    action = action.replace("$channel2$", str(channel2) )
-                    action = action.replace("$channel3$", str(channel3) )
-                    action = action.replace("$battery$", str(battery) )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # XPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=channel1\ncurrent='+str(channel1)+'\nunits=A', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=channel2\ncurrent='+str(channel2)+'\nunits=A', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=channel3\ncurrent='+str(channel3)+'\nunits=A', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
+    if cmdarg.printout_complete:
+        print "Packettype\t\t= " + rfx.rfx_packettype[packettype]
 
     # ---------------------------------------
-    # 0x5A Energy sensor
-    # Credit: Jean-Michel ROY
-    # ---------------------------------------
-    if packettype == '5A':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2
-        signal = rfxdecode.decodeSignal(message[17])
-        count = int(ByteToHex(message[6]), 16)
-        battery = rfxdecode.decodeBattery(message[17])
-        instant = int(ByteToHex(message[7]), 16) * 0x1000000 + int(ByteToHex(message[8]), 16) * 0x10000 + int(ByteToHex(message[9]), 16) * 0x100  + int(ByteToHex(message[10]), 16)
-        usage = int ((int(ByteToHex(message[11]), 16) * 0x10000000000 + int(ByteToHex(message[12]), 16) * 0x100000000 +int(ByteToHex(message[13]), 16) * 0x1000000 + int(ByteToHex(message[14]), 16) * 0x10000 + int(ByteToHex(message[15]), 16) * 0x100 + int(ByteToHex(message[16]), 16) ) / 223.666)
-        
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_5A[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= " + sensor_id
-            print "Count\t\t\t= " + str(count)
-            print "Instant usage\t\t= " + str(instant) + " Watt"
-            print "Total usage\t\t= " + str(usage) + " Wh"
-            print "Battery\t\t\t= " + str(battery)
-            print "Signal level\t\t= " + str(signal)
-        
-        # CSV
-        if cmdarg.printout_csv == True:
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s;%s;%s\n" %
-                            (timestamp, unixtime_utc, packettype, subtype, seqnbr, sensor_id,
-                            str(instant), str(usage), str(battery), str(signal)) )
-            sys.stdout.flush()
-        
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$count$", str(count) )
-                    action = action.replace("$instant$", str(instant) )
-                    action = action.replace("$total$", str(usage) )
-                    action = action.replace("$battery$", str(battery) )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, count, 0, 0, 0, float(instant), 0, 0,float(usage), 0, 0)
-        
-        # XPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=Energy.'+sensor_id+'\ntype=instant_usage\ncurrent='+str(instant)+'\nunits=W', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Energy.'+sensor_id+'\ntype=total_usage\ncurrent='+str(usage)+'\nunits=Wh', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Energy.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Energy.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        # RRD
-        if config.rrd_active == True:
-            rfxrrd.rrd1Metric(packettype, sensor_id, instant, config.rrd_path)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
-    # ---------------------------------------
-    # 0x5B Current Sensor
-    # ---------------------------------------
-    if packettype == '5B':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2
-        count = int(ByteToHex(message[6]),16)
-        channel1 = (int(ByteToHex(message[7]),16) * 0x100 + int(ByteToHex(message[8]),16)) * 0.1
-        channel2 = (int(ByteToHex(message[9]),16) * 0x100 + int(ByteToHex(message[10]),16)) * 0.1
-        channel3 = (int(ByteToHex(message[11]),16) * 0x100 + int(ByteToHex(message[12]),16)) * 0.1
-        total = float ((int(ByteToHex(message[13]), 16) * 0x10000000000 + int(ByteToHex(message[14]), 16) * 0x100000000 +int(ByteToHex(message[15]), 16) * 0x1000000 + int(ByteToHex(message[16]), 16) * 0x10000 + int(ByteToHex(message[17]), 16) * 0x100 + int(ByteToHex(message[18]), 16) ) / 223.666)
-        signal = rfxdecode.decodeSignal(message[19])
-        battery = rfxdecode.decodeBattery(message[19])
-        
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_5B[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= " + sensor_id
-            print "Counter\t\t\t= " + str(count)
-            print "Channel 1\t\t= " + str(channel1) + "A"
-            print "Channel 2\t\t= " + str(channel2) + "A"
-            print "Channel 3\t\t= " + str(channel3) + "A"
-            if total <> 0:
-                print("Total\t\t\t= %s Wh" % str(round(total,1)))
-            print "Battery\t\t\t= " + str(battery)
-            print "Signal level\t\t= " + str(signal)
-        
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$counter$", str(count) )
-                    action = action.replace("$channel1$", str(channel1) )
-                    action = action.replace("$channel2$", str(channel2) )
-                    action = action.replace("$channel3$", str(channel3) )
-                    action = action.replace("$battery$", str(battery) )
-                    action = action.replace("$signal$", str(signal) )
-                    action = action.replace("$total$", str(total) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, count, 0, 0, 0, float(channel1), float(channel2), float(channel3), float(total), 0, 0)
-        
-        # XPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=channel1\ncurrent='+str(channel1)+'\nunits=A', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=channel2\ncurrent='+str(channel2)+'\nunits=A', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=channel3\ncurrent='+str(channel3)+'\nunits=A', config.xpl_sourcename, config.xpl_includehostname)
-            if total <> 0:
-                xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=total\ncurrent='+str(total)+'\nunits=Wh', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=battery\ncurrent='+str(battery*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-    
-    # ---------------------------------------
-    # 0x5C Power Sensors
-    # ---------------------------------------
-    if packettype == '5C':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2
-        voltage = int(ByteToHex(message[6]),16)
-        current = (int(ByteToHex(message[7]),16) * 0x100 + int(ByteToHex(message[8]),16)) * 0.01
-        power = (int(ByteToHex(message[9]),16) * 0x100 + int(ByteToHex(message[10]),16)) * 0.1
-        energy = (int(ByteToHex(message[11]),16) * 0x100 + int(ByteToHex(message[12]),16)) * 0.01
-        powerfactor = (int(ByteToHex(message[13]), 16)) * 0.01
-        freq = int(ByteToHex(message[14]), 16)
-        signal = rfxdecode.decodeSignal(message[15])
-        
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            print("Subtype\t\t\t= %s" % str(rfx.rfx_subtype_5C[subtype]))
-            print("Seqnbr\t\t\t= %s" % str(seqnbr))
-            print("Id\t\t\t= %s" % str(sensor_id))
-            print("Voltage\t\t\t= %s Volt" % (str(voltage)))
-            print("Current\t\t\t= %s Ampere" % str(current))
-            print("Instant power\t\t= %s Watt" % str(power))
-            print("Total usage\t\t= %s kWh" % str(energy))
-            print("Power factor\t\t= %s " % str(powerfactor))
-            print("Frequency\t\t= %s Hz" % str(freq))
-            print("Signal level\t\t= %s" % str(signal))
-            
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", str(sensor_id) )
-                    action = action.replace("$voltage$", str(voltage) )
-                    action = action.replace("$current$", str(current) )
-                    action = action.replace("$instantpower$", str(instantpower) )
-                    action = action.replace("$totalusage$", str(totalusage) )
-                    action = action.replace("$powerfactor$", str(powerfactor) )
-                    action = action.replace("$frequency$", str(freq) )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, battery, signal, sensor_id, 0, 0, 0, 0, voltage, freq, float(instantpower), float(current), float(powerfactor), float(totalusage), 0, 0)
-        
-        # XPL
-        if config.xpl_active:
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=voltage\ncurrent='+str(channel1)+'\nunits=V', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=current\ncurrent='+str(channel2)+'\nunits=A', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=instantpower\ncurrent='+str(channel3)+'\nunits=Watt', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=totalusage\ncurrent='+str(channel3)+'\nunits=kWh', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=powerfactor\ncurrent='+str(channel3)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=frequency\ncurrent='+str(channel3)+'\nunits=Hz', config.xpl_sourcename, config.xpl_includehostname)
-            xpl.send(config.xpl_host, 'device=Current.'+sensor_id+'\ntype=signal\ncurrent='+str(signal*10)+'\nunits=%', config.xpl_sourcename, config.xpl_includehostname)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-    
-    # ---------------------------------------
-    # 0x5E Gas Usage Sensor
-    # ---------------------------------------
-    if packettype == '5E':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        
-        decoded = True
-        
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_5E[subtype]
-            print "Not implemented in RFXCMD, please send sensor data to sebastian.sjoholm@gmail.com"
-        
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-    
-    # ---------------------------------------
-    # 0x5F Water Usage Sensor
-    # ---------------------------------------
-    if packettype == '5F':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        
-        decoded = True
-        
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_5F[subtype]
-            print "Not implemented in RFXCMD, please send sensor data to sebastian.sjoholm@gmail.com"
-        
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-    
-    # ---------------------------------------
-    # 0x70 RFXsensor
+    # Check if the packet is a special WeeWx packet
+    # 0A1100FF001100FF001100
     # ---------------------------------------
-    if packettype == '70':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        decoded = True
-        
-        # DATA
-        if subtype == '00':
-            temperature = float(rfxdecode.decodeTemperature(message[5], message[6]))
-            temperature = temperature * 0.1
-        else:
-            temperature = 0
-        if subtype == '01' or subtype == '02':
-            voltage_hi = int(ByteToHex(message[5]), 16) * 256
-            voltage_lo = int(ByteToHex(message[6]), 16)
-            voltage = voltage_hi + voltage_lo
-        else:
-            voltage = 0
-        signal = rfxdecode.decodeSignal(message[7])
-        
-        if subtype == '03':
-            sensor_message = rfx.rfx_subtype_70_msg03[message[6]]
-        
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_70[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= " + id1
-        
-            if subtype == '00':
-                print "Temperature\t\t= " + str(temperature) + " C"
-            
-            if subtype == '01' or subtype == '02':
-                print "Voltage\t\t\t= " + str(voltage) + " mV"
-            
-            if subtype == '03':
-                print "Message\t\t\t= " + sensor_message
-            
-            print "Signal level\t\t= " + str(signal)
-            
-        # CSV
-        if cmdarg.printout_csv == True:
-            if subtype == '00':
-                sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(signal), id1, str(temperature)))
-            if subtype == '01' or subtype == '02':
-                sys.stdout.write("%s;%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, str(signal), id1, str(voltage)))
-            sys.stdout.flush()
-        
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", id1 )
-                    if subtype == '00':
-                        action = action.replace("$temperature$", str(temperature) )
-                    if subtype == '01' or subtype == '02':
-                        action = action.replace("$voltage$", str(voltage) )
-                    if subtype == '03':
-                        action = action.replace("$message$", sensor_message )
-                    action = action.replace("$signal$", str(signal) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-                    
-        # DATABASE
-        if config.mysql_active or config.sqlite_active or config.pgsql_active:
-            insert_database(timestamp, unixtime_utc, packettype, subtype, seqnbr, 255, signal, id1, ByteToHex(message[5]), ByteToHex(message[6]), 0, 0, 0, voltage, float(temperature), 0, 0, 0, 0, 0)
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-        
+    if raw_message == "0A1100FF001100FF001100":
+        logger.debug("Incoming WeeWx packet, do not decode")
+        if cmdarg.printout_complete:
+            print("Info\t\t\t= Incoming WeeWx packet")
+        return
+
     # ---------------------------------------
-    # 0x71 RFXmeter
+    # Look up the decoder and verify correct
+    # length on packets
     # ---------------------------------------
-    if packettype == '71':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        
-        decoded = True
-        
-        # DATA
-        sensor_id = id1 + id2
-        sensor_power = ''
-        
-        try:
-            sensor_power = rfxdecode.decodePower(message[7], message[8], message[9])
-        except Exception, e:
-            logger.error("Exception: %s" % str(e))
-        
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_71[subtype]
-            print "Seqnbr\t\t\t= " + seqnbr
-            print "Id\t\t\t= " + id1
-            print "Power\t\t\t= " + str(sensor_power)
-            
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    action = action.replace("$id$", id1 )
-                    action = action.replace("$power$", str(sensor_power) )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-            
-        # CSV
-        if cmdarg.printout_csv == True:
-            sys.stdout.write("%s;%s;%s;%s;%s;%s;%s\n" % (timestamp, unixtime_utc, packettype, subtype, seqnbr, id1 + id2, str(sensor_power)))
-            sys.stdout.flush()
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-    
+    length, decoder = rfx_decoder.get(packettype, (None, None))
+
+    logger.debug("Verify correct packet length")
+    if length is not None and len(message) <> length:
+        metrics.count('invalid')
+        logger.error("Packet has wrong length, discarding")
+        return
+
     # ---------------------------------------
-    # 0x72 FS20
+    # If packet is OK and the log_msg is active
+    # then save the packet to log_msgfile designated
+    # file on disk
     # ---------------------------------------
-    if packettype == '72':
-        logger.debug("Decode packetType 0x" + str(packettype) + " - Start")
-        
-        decoded = True
-        
-        # PRINTOUT
-        if cmdarg.printout_complete == True:
-            print "Subtype\t\t\t= " + rfx.rfx_subtype_72[subtype]
-            print "Not implemented in RFXCMD, please send sensor data to sebastian.sjoholm@gmail.com"
-        
-        # TRIGGER
-        if config.trigger_active:
-            for trigger in triggerlist.data:
-                trigger_message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-                action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-                rawcmd = ByteToHex ( message )
-                rawcmd = rawcmd.replace(' ', '')
-                if re.match(trigger_message, rawcmd):
-                    logger.debug("Trigger match")
-                    logger.debug("Message: " + trigger_message + ", Action: " + action)
-                    action = action.replace("$raw$", raw_message )
-                    action = action.replace("$packettype$", packettype )
-                    action = action.replace("$subtype$", subtype )
-                    logger.debug("Execute shell")
-                    command = Command(action)
-                    command.run(timeout=config.trigger_timeout)
-                    if config.trigger_onematch:
-                        logger.debug("Trigger onematch active, exit trigger")
-                        return
-        
-        logger.debug("Decode packetType 0x" + str(packettype) + " - End")
-    
+    if capture.writer is not None:
+        logger.debug("Save packet to log_msgfile")
+        capture.writer.write(raw_message)
+
     # ---------------------------------------
     # Not decoded message
-    # ---------------------------------------   
-    
+    # ---------------------------------------
+
     # The packet is not decoded, then print it on the screen
-    if decoded == False:
+    if decoder is None:
+        metrics.count('undecoded')
         logger.error("Message not decoded. Line: " + _line())
         logger.error("Message: " + ByteToHex(message))
         print timestamp + " " + ByteToHex(message)
         print "RFXCMD cannot decode message, see http://code.google.com/p/rfxcmd/wiki/ for more information."
-    
+        return
+
+    # ---------------------------------------
+    # Decode and process the message
+    # ---------------------------------------
+    logger.debug("Decode packetType 0x%s - Start", packettype)
+    started = time.time()
+    result = decoder(message)
+    decoded = time.time()
+    result['timestamp'] = timestamp
+    result['unixtime'] = unixtime_utc
+    sensorstate.sensors.update(result)
+    events.publish(result)
+    rfx_handler[packettype](result)
+
+    # Send the xPL messages of the frame together
+    if xplsender.publisher is not None:
+        with metrics.time('xpl'):
+            xplsender.publisher.flush()
+    metrics.observe('decode', decoded - started)
+    metrics.observe('handler', time.time() - decoded)
+    metrics.count('decoded')
+    metrics.count('packettype.' + packettype)
+    logger.debug("Decode packetType 0x%s - End", packettype)
+
     # decodePackage END
     return
 
@@ -3665,6 +2243,7 @@ def read_socket():
                 serial_param.port.flushOutput()
                 logger.debug("SerialPort flush output")
                 serial_param.port.flushInput()
+                serial_param.reader.reset()
                 logger.debug("SerialPort flush input")
             
             timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
@@ -3710,7 +2289,7 @@ def test_rfx( message ):
     Return true if valid, False if not
     """
 
-    logger.debug("Test message: " + message)
+    logger.debug("Test message: %s", message)
         
     # Remove all invalid characters
     message = stripped(message)
@@ -3734,19 +2313,21 @@ def test_rfx( message ):
         logger.debug("Error: Packet length not even")
         return False
     
+    data = bytearray(message.decode('hex'))
+    
     # Check that first byte is not 00
-    if ByteToHex(message.decode('hex')[0]) == "00":
+    if data[0] == 0:
         logger.debug("Error: Packet first byte is 00")
         return False
     
     # Length more than one byte
-    if not len(message.decode('hex')) > 1:
+    if not len(data) > 1:
         logger.debug("Error: Packet is not longer than one byte")
         return False
     
     # Check if string is the length that it reports to be
-    cmd_len = int( ByteToHex( message.decode('hex')[0]),16 )
-    if not len(message.decode('hex')) == (cmd_len + 1):
+    cmd_len = data[0]
+    if not len(data) == (cmd_len + 1):
         logger.debug("Error: Packet length is not valid")
         return False
 
@@ -3780,83 +2361,82 @@ def send_rfx( message ):
 
 def read_rfx():
     """
-    Read message from RFXtrx and decode the decode the message
+    Read all complete messages from RFXtrx and decode them, returns the
+    last processed message
+    """
+    rawcmd = None
+    
+    started = time.time()
+    try:
+        messages = serial_param.reader.read()
+    except IOError, err:
+        metrics.count('read.errors')
+        print("Error: " + str(err))
+        logger.error("Serial read error: %s, Line: %s" % (str(err),_line()))
+        return None
+    metrics.observe('read', time.time() - started)
+    metrics.count('frames_in', len(messages))
+    
+    for message in messages:
+        rawcmd = process_rfx(message)
+    
+    return rawcmd
+
+# ----------------------------------------------------------------------------
+
+def process_rfx(message):
+    """
+    Check one message from RFXtrx against the whitelist and decode it
     """
-    message = None
-    byte = None
+    received = time.time()
     
     try:
         
+        rawcmd = binascii.hexlify(message).upper()
+        logger.debug("Message: %s", rawcmd)
+        
+        # Whitelist
+        if config.whitelist_active:
+        
+            logger.debug("Check whitelist")
+            matched = whitelist.matcher.match(rawcmd)
+            metrics.observe('whitelist', time.time() - received)
+            if matched:
+                logger.debug("Whitelist match")
+            else:
+                if cmdarg.printout_complete:
+                    print("Sensor not included in whitelist")
+                logger.debug("No match in whitelist, no process")
+                metrics.count('filtered')
+                return rawcmd
+        
+        # Repeated transmission of the same frame
+        if serial_param.dedup is not None:
+            checked = time.time()
+            duplicate = serial_param.dedup.is_duplicate(message)
+            metrics.observe('dedup', time.time() - checked)
+            if duplicate:
+                logger.debug("Duplicate frame, suppressed (%d)", serial_param.dedup.suppressed)
+                metrics.count('duplicates')
+                return rawcmd
+        
+        if cmdarg.printout_complete == True:
+            print("------------------------------------------------")
+            print("Received\t\t= " + ByteToHex( message ))
+            print("Date/Time\t\t= " + time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(received)))
+            print("Packet Length\t\t= " + ByteToHex( message[0] ))
+        
+        logger.debug('Decode packet')
         try:
-            if serial_param.port.inWaiting() != 0:
-                timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                logger.debug("Timestamp: " + timestamp)
-                logger.debug("SerWaiting: " + str(serial_param.port.inWaiting()))
-                byte = serial_param.port.read()
-                logger.debug("Byte: " + str(ByteToHex(byte)))
-        except IOError, err:
-            print("Error: " + str(err))
-            logger.error("Serial read error: %s, Line: %s" % (str(err),_line()))
+            decodePacket( message )
+        except KeyError:
+            metrics.count('errors')
+            logger.error("Error: unrecognizable packet (" + ByteToHex(message) + ") Line: " + _line())
+            if cmdarg.printout_complete == True:
+                print("Error: unrecognizable packet")
+        metrics.observe('total', time.time() - received)
         
-        if byte:
-            message = byte + readbytes( ord(byte) )
-            logger.debug("Message: " + str(ByteToHex(message)))
-            
-            # First byte indicate length of message, must be other than 00
-            if ByteToHex(message[0]) <> "00":
-            
-                # Verify length
-                logger.debug("Verify length")
-                if (len(message) - 1) == ord(message[0]):
-                
-                    logger.debug("Length OK")
-                    
-                    # Whitelist
-                    if config.whitelist_active:
-                    
-                        logger.debug("Check whitelist")
-                        whitelist_match = False
-                        for sensor in whitelist.data:
-                            sensor = sensor.childNodes[0].nodeValue
-                            logger.debug("Tag: " + sensor)
-                            rawcmd = ByteToHex ( message )
-                            rawcmd = rawcmd.replace(' ', '')
-                            if re.match(sensor, rawcmd):
-                                logger.debug("Whitelist match")
-                                whitelist_match = True
-                                pass
-                    
-                        if whitelist_match == False:
-                            if cmdarg.printout_complete:
-                                print("Sensor not included in whitelist")
-                            logger.debug("No match in whitelist, no process")
-                            return rawcmd
-                    
-                    if cmdarg.printout_complete == True:
-                        print("------------------------------------------------")
-                        print("Received\t\t= " + ByteToHex( message ))
-                        print("Date/Time\t\t= " + timestamp)
-                        print("Packet Length\t\t= " + ByteToHex( message[0] ))
-                    
-                    logger.debug('Decode packet')
-                    try:
-                        decodePacket( message )
-                    except KeyError:
-                        logger.error("Error: unrecognizable packet (" + ByteToHex(message) + ") Line: " + _line())
-                        if cmdarg.printout_complete == True:
-                            print("Error: unrecognizable packet")
-                    
-                    rawcmd = ByteToHex ( message )
-                    rawcmd = rawcmd.replace(' ', '')
-                    
-                    return rawcmd
-                
-                else:
-                    logger.error("Error: Incoming packet not valid length. Line: "  + _line())
-                    if cmdarg.printout_complete == True:
-                        print("------------------------------------------------")
-                        print("Received\t\t= " + ByteToHex( message ))
-                        print("Incoming packet not valid, waiting for next...")
+        return rawcmd
                 
     except OSError, e:
         logger.error("Error in message: " + str(ByteToHex(message)) + " Line: " + _line())
@@ -3867,101 +2447,134 @@ def read_rfx():
 
 # ----------------------------------------------------------------------------
 
-def read_config( configFile, configItem):
+def load_whitelist(filename):
     """
-    Read item from the configuration file
+    Parse the whitelist file, return the entries and the matcher
     """
-    logger.debug('Open configuration file')
-    logger.debug('File: ' + configFile)
-    
-    if os.path.exists( configFile ):
-
-        #open the xml file for reading:
-        f = open( configFile,'r')
-        data = f.read()
-        f.close()
-    
-        # xml parse file data
-        logger.debug('Parse config XML data')
-        try:
-            dom = minidom.parseString(data)
-        except:
-            print "Error: problem in the config.xml file, cannot process it"
-            logger.debug('Error in config.xml file')
-            
-        # Get config item
-        logger.debug('Get the configuration item: ' + configItem)
-        
-        try:
-            xmlTag = dom.getElementsByTagName( configItem )[0].toxml()
-            logger.debug('Found: ' + xmlTag)
-            xmlData = xmlTag.replace('<' + configItem + '>','').replace('</' + configItem + '>','')
-            logger.debug('--> ' + xmlData)
-        except:
-            logger.debug('The item tag not found in the config file')
-            xmlData = ""
-            
-        logger.debug('Return')
-        
-    else:
-        logger.error("Error: Config file does not exists. Line: " + _line())
-        
-    return xmlData
-
-# ----------------------------------------------------------------------------
+    import xml.dom.minidom as minidom
+    xmldoc = minidom.parse(filename)
+    data = [sensor.childNodes[0].nodeValue for sensor in xmldoc.documentElement.getElementsByTagName('sensor')]
+    for sensor in data:
+        logger.debug("Tags: " + sensor)
+    return data, WhitelistMatcher(data)
 
 def read_whitelistfile():
     """
     Read whitelist file to list
     """
     try:
-        xmldoc = minidom.parse( config.whitelist_file )
+        whitelist.data, whitelist.matcher = load_whitelist(config.whitelist_file)
+    except re.error as err:
+        print "Error in " + config.whitelist_file + " file, " + str(err)
+        sys.exit(1)
     except:
         print "Error in " + config.whitelist_file + " file"
         sys.exit(1)
-
-    whitelist.data = xmldoc.documentElement.getElementsByTagName('sensor')
-
-    for sensor in whitelist.data:
-        logger.debug("Tags: " + sensor.childNodes[0].nodeValue)
         
 # ----------------------------------------------------------------------------
 
+def load_triggers(filename):
+    """
+    Parse the trigger file, return the triggers and their index
+    """
+    import xml.dom.minidom as minidom
+    xmldoc = minidom.parse(filename)
+    data = []
+    for trigger in xmldoc.documentElement.getElementsByTagName('trigger'):
+        message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
+        action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
+        logger.debug("Message: " + message + ", Action: " + action)
+        try:
+            data.append(Trigger(message, action))
+        except re.error as err:
+            raise re.error(message + ": " + str(err))
+    return data, TriggerIndex(data)
+
 def read_triggerfile():
     """
     Read trigger file to list
     """
     try:
-        xmldoc = minidom.parse( config.trigger_file )
+        triggerlist.data, triggerlist.index = load_triggers(config.trigger_file)
+    except re.error as err:
+        print "Error in " + config.trigger_file + " file, " + str(err)
+        sys.exit(1)
     except:
         print "Error in " + config.trigger_file + " file"
         sys.exit(1)
 
-    triggerlist.data = xmldoc.documentElement.getElementsByTagName('trigger')
+# ----------------------------------------------------------------------------
 
-    for trigger in triggerlist.data:
-        message = trigger.getElementsByTagName('message')[0].childNodes[0].nodeValue
-        action = trigger.getElementsByTagName('action')[0].childNodes[0].nodeValue
-        logger.debug("Message: " + message + ", Action: " + action)
+def start_triggerpool():
+    """
+    Start the worker pool that runs the trigger actions
+    """
+    from lib.rfx_command import CommandPool
+    try:
+        triggerlist.pool = CommandPool(workers=config.trigger_workers, queue_size=config.trigger_queue,
+                                       policy=config.trigger_policy, timeout=config.trigger_timeout)
+    except ValueError as err:
+        print "Error in trigger configuration, " + str(err)
+        sys.exit(1)
+    metrics.register('trigger', triggerlist.pool.stats)
+    logger.debug("Trigger workers: %s, queue: %s, policy: %s" % (config.trigger_workers, config.trigger_queue, config.trigger_policy))
 
 # ----------------------------------------------------------------------------
 
+def load_weewx(filename):
+    """
+    Parse the weewx file, return the set of (type, id) of the sensors
+    """
+    import xml.dom.minidom as minidom
+    xmldoc = minidom.parse(filename)
+    data = set()
+    for sensor in xmldoc.documentElement.getElementsByTagName('sensor'):
+        type = sensor.getElementsByTagName('type')[0].childNodes[0].nodeValue
+        id = sensor.getElementsByTagName('id')[0].childNodes[0].nodeValue
+        logger.debug("Type: " + type + ", id: " + id)
+        data.add((type, id))
+    return frozenset(data)
+
 def read_weewxfile():
     """
     Read weewx file to list
     """
     try:
-        xmldoc = minidom.parse( config.weewx_config )
+        weewxlist.data = load_weewx(config.weewx_config)
     except:
         print "Error in " + config.weewx_config + " file"
         sys.exit(1)
 
-    weewxlist.data = xmldoc.documentElement.getElementsByTagName('sensor')
+# ----------------------------------------------------------------------------
 
-    for sensor in weewxlist.data:
-        type = sensor.getElementsByTagName('type')[0].childNodes[0].nodeValue
-        id = sensor.getElementsByTagName('id')[0].childNodes[0].nodeValue
-        logger.debug("Type: " + type + ", id: " + id)
+def reload_files():
+    """
+    Rebuild the whitelist, trigger and weewx tables from their files and
+    swap them in. The listener keeps using the old tables until the new
+    ones are complete, a file with errors keeps its old table.
+    """
+    if config.whitelist_active:
+        try:
+            data, matcher = load_whitelist(config.whitelist_file)
+            whitelist.data, whitelist.matcher = data, matcher
+            logger.info("Reloaded %s, %d entries" % (config.whitelist_file, len(data)))
+        except Exception as err:
+            logger.error("Error in " + config.whitelist_file + " file, not reloaded: " + str(err))
+
+    if config.trigger_active:
+        try:
+            data, index = load_triggers(config.trigger_file)
+            triggerlist.data, triggerlist.index = data, index
+            logger.info("Reloaded %s, %d triggers" % (config.trigger_file, len(data)))
+        except Exception as err:
+            logger.error("Error in " + config.trigger_file + " file, not reloaded: " + str(err))
+
+    if config.weewx_active:
+        try:
+            weewxlist.data = load_weewx(config.weewx_config)
+            logger.info("Reloaded %s, %d sensors" % (config.weewx_config, len(weewxlist.data)))
+        except Exception as err:
+            logger.error("Error in " + config.weewx_config + " file, not reloaded: " + str(err))
 
 # ----------------------------------------------------------------------------
 
@@ -3977,16 +2590,6 @@ def print_version():
 
 # ----------------------------------------------------------------------------
 
-def check_pythonversion():
-    """
-    Check python version
-    """
-    if sys.hexversion < 0x02060000:
-        print "Error: Your Python need to be 2.6 or newer, please upgrade."
-        sys.exit(1)
-
-# ----------------------------------------------------------------------------
-
 def option_simulate(indata):
     """
     Simulate incoming packet, decode and process
@@ -4009,16 +2612,7 @@ def option_simulate(indata):
     # Whitelist
     if config.whitelist_active:
         logger.debug("Check whitelist")
-        whitelist_match = False
-        for sensor in whitelist.data:
-            sensor = sensor.getElementsByTagName('sensor')[0].childNodes[0].nodeValue
-            logger.debug("Sensor: " + sensor)
-            rawcmd = ByteToHex ( message )
-            rawcmd = rawcmd.replace(' ', '')
-            if re.match(sensor, rawcmd):
-                whitelist_match = True
-        
-        if whitelist_match == False:
+        if not whitelist.matcher.match(binascii.hexlify(message).upper()):
             if cmdarg.printout_complete:
                 print("Sensor not included in whitelist")
             logger.debug("No match in whitelist")
@@ -4046,7 +2640,137 @@ def option_simulate(indata):
         logger.error("Error: unrecognizable packet (" + ByteToHex(message) + ") Line: " + _line())
         logger.error("Error: %s" %err)
         print "Error: unrecognizable packet"
+    
+    close_outputs()
+        
+    logger.debug('Exit 0')
+    sys.exit(0)
+
+# ----------------------------------------------------------------------------
+
+def close_outputs():
+    """
+    Let the trigger actions finish and send what the output threads have queued
+    """
+    # Let the trigger actions finish
+    if triggerlist.pool is not None:
+        triggerlist.pool.close()
+
+    # Write the queued rows
+    if database.writer is not None:
+        database.writer.close()
+
+    # Send the queued metrics
+    if graphite.client is not None:
+        graphite.client.close()
+
+    if xplsender.publisher is not None:
+        xplsender.publisher.close()
+    
+    if capture.writer is not None:
+        capture.writer.close()
+
+# ----------------------------------------------------------------------------
+
+def option_replay(filename, speed):
+    """
+    Feed the frames of a capture file through whitelist, decode and all
+    outputs. speed 1 keeps the original timing, 10 is ten times faster and
+    0 replays as fast as possible. Print throughput and stage latency.
+    """
+    from lib.rfx_capture import read_capture
+    # The message log grows while it is read when rfxcmd writes to it
+    if config.log_msg and os.path.realpath(filename) == os.path.realpath(config.log_msgfile):
+        print "Error: cannot replay the active message log %s, replay a copy of it" % filename
+        sys.exit(1)
+    try:
+        open(filename).close()
+    except (IOError, OSError) as err:
+        print "Error: cannot read capture file %s, %s" % (filename, err)
+        sys.exit(1)
+
+    if config.dedup_active:
+        serial_param.dedup = Deduplicator(config.dedup_window, config.dedup_windows, config.dedup_size)
+
+    metrics.reset()
+    count = 0
+    errors = 0
+    filtered = 0
+    start = time.time()
+    origin = None
+
+    for unixtime, frame in read_capture(filename):
+        # Invalid line, already logged by read_capture
+        if frame is None:
+            count += 1
+            errors += 1
+            continue
         
+        # Wait until the frame is due
+        if speed > 0 and unixtime is not None:
+            if origin is None:
+                origin = unixtime
+            delay = start + (unixtime - origin) / speed - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+        received = time.time()
+        count += 1
+        try:
+            message = frame.decode("hex")
+        except TypeError:
+            logger.error("Error: invalid frame in capture file (" + frame + ")")
+            errors += 1
+            continue
+
+        if config.whitelist_active:
+            matched = whitelist.matcher.match(frame.upper())
+            metrics.observe('whitelist', time.time() - received)
+            if not matched:
+                filtered += 1
+                continue
+
+        if serial_param.dedup is not None:
+            checked = time.time()
+            duplicate = serial_param.dedup.is_duplicate(message, unixtime)
+            metrics.observe('dedup', time.time() - checked)
+            if duplicate:
+                filtered += 1
+                continue
+
+        if cmdarg.printout_complete:
+            print "------------------------------------------------"
+            print "Received\t\t= " + ByteToHex(message)
+
+        try:
+            decodePacket(message, unixtime)
+        except Exception as err:
+            logger.error("Error: unrecognizable packet (" + ByteToHex(message) + ") Line: " + _line())
+            logger.error("Error: %s" % err)
+            errors += 1
+        metrics.observe('total', time.time() - received)
+
+    processed = time.time()
+    close_outputs()
+    finished = time.time()
+    outputs = [('trigger', triggerlist.pool), ('database', database.writer), ('graphite', graphite.client)]
+    outputs = [(name, output.stats()) for name, output in outputs if output is not None]
+
+    elapsed = processed - start
+    print "Replay of %s" % filename
+    print "Frames\t\t\t= %d (%d filtered, %d errors)" % (count, filtered, errors)
+    print "Time\t\t\t= %.3f s, outputs drained in %.3f s" % (elapsed, finished - processed)
+    print "Throughput\t\t= %.1f frames/s" % (count / elapsed if elapsed > 0 else 0.0)
+    print "%-12s %10s %10s %10s %10s %10s" % ("Stage", "count", "mean ms", "p50 ms", "p99 ms", "max ms")
+    snapshot = metrics.snapshot()
+    for stage in ('whitelist', 'dedup', 'decode', 'handler', 'trigger', 'database', 'graphite', 'xpl', 'rrd', 'total'):
+        if stage in snapshot:
+            s = snapshot[stage]
+            print "%-12s %10d %10.3f %10.3f %10.3f %10.3f" % (stage, s['count'], s['mean'] * 1000,
+                s['p50'] * 1000, s['p99'] * 1000, s['max'] * 1000)
+    for name, stats in outputs:
+        print "%-12s %s" % (name, ", ".join(["%s=%s" % item for item in sorted(stats.items())]))
+
     logger.debug('Exit 0')
     sys.exit(0)
 
@@ -4059,12 +2783,26 @@ def option_listen():
     logger.debug("Start listening...")
     
     if config.serial_active:
+        if config.dedup_active:
+            logger.debug("Duplicate frame suppression active")
+            serial_param.dedup = Deduplicator(config.dedup_window, config.dedup_windows, config.dedup_size)
+            metrics.register('dedup', serial_param.dedup.stats)
+        
         logger.debug("Open serial port")
         open_serialport()
 
+    # Reload the whitelist, trigger and weewx files on SIGHUP or when they change
+    files = [config.whitelist_file if config.whitelist_active else None,
+             config.trigger_file if config.trigger_active else None,
+             config.weewx_config if config.weewx_active else None]
+    if any(files):
+        reloader = Reloader(reload_files, files, config.reload_interval)
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, lambda signum, frame: reloader.request())
+
     if config.socketserver:
         try:
-            serversocket = RFXcmdSocketAdapter(config.sockethost,int(config.socketport))
+            serversocket = RFXcmdSocketAdapter(config.sockethost,config.socketport)
         except:
             logger.error("Error starting socket server. Line: " + _line())
             print("Error: can not start server socket, another instance already running?")
@@ -4074,12 +2812,30 @@ def option_listen():
         else:
             logger.debug("Cannot start socket interface")
 
+    # Write the stats to the log
+    if config.stats_interval > 0:
+        if not logger.isEnabledFor(logging.INFO):
+            print("Warning: stats_interval is set, but the stats are logged at level info and loglevel is %s" % config.loglevel)
+        statslogger = StatsLogger(config.stats_interval)
+
+    if config.prometheus_active:
+        from lib.rfx_exporter import MetricsServer, exposition
+        try:
+            metricsserver = MetricsServer(config.prometheus_host, config.prometheus_port,
+                lambda: exposition(metrics.report(), sensorstate.sensors.query()))
+        except socket.error as err:
+            logger.error("Error starting metrics server: %s" % err)
+            print("Error: can not start metrics server on port %d, %s" % (config.prometheus_port, err))
+            exit(1)
+        logger.debug("Metrics server started on port %d" % config.prometheus_port)
+
     if config.serial_active:
         # Flush buffer
         logger.debug("Serialport flush output")
         serial_param.port.flushOutput()
         logger.debug("Serialport flush input")
         serial_param.port.flushInput()
+        serial_param.reader.reset()
 
         # Send RESET
         logger.debug("Send rfxcmd_reset (" + rfxcmd.reset + ")")
@@ -4092,6 +2848,7 @@ def option_listen():
         serial_param.port.flushOutput()
         logger.debug("Serialport flush input")
         serial_param.port.flushInput()
+        serial_param.reader.reset()
 
         # Send STATUS
         logger.debug("Send rfxcmd_status (" + rfxcmd.status + ")")
@@ -4103,6 +2860,7 @@ def option_listen():
         if config.protocol_startup:
             logger.debug("Protocol AutoStart activated")
             try:
+                import lib.rfx_protocols as protocol
                 pMessage = protocol.set_protocolfile(config.protocol_file)
                 logger.debug("Send set protocol message (" + pMessage + ")")
                 serial_param.port.write( pMessage.decode('hex') )
@@ -4113,26 +2871,23 @@ def option_listen():
                 pass
         
     try:
-        while 1:
-            # Let it breath
-            # Without this sleep it will cause 100% CPU in windows
-            time.sleep(0.01)
-            
-            if config.serial_active:
-                # Read serial port
-                if config.process_rfxmsg == True:
-                    rawcmd = read_rfx()
-                    if rawcmd:
-                        logger.debug("Processed: " + str(rawcmd))
-            
-            # Read socket
-            if config.socketserver:
-                read_socket()
+        if sys.platform == 'win32':
+            listen_poll()
+        else:
+            listen_select()
             
     except KeyboardInterrupt:
         logger.debug("Received keyboard interrupt")
-        logger.debug("Close server socket")
-        serversocket.netAdapter.shutdown()
+        if config.stats_interval > 0:
+            statslogger.stop()
+        
+        if config.prometheus_active:
+            logger.debug("Close metrics server")
+            metricsserver.shutdown()
+        
+        if config.socketserver:
+            logger.debug("Close server socket")
+            serversocket.shutdown()
         
         if config.serial_active:
             logger.debug("Close serial port")
@@ -4143,6 +2898,72 @@ def option_listen():
 
 # ----------------------------------------------------------------------------
 
+def listen_select():
+    """
+    Wait on the serial port and the socket message queue with select(),
+    process data as soon as it arrives and sleep while idle
+    """
+    waitlist = []
+    
+    if config.serial_active and config.process_rfxmsg == True:
+        waitlist.append(serial_param.port)
+    
+    if config.socketserver:
+        waitlist.append(messageWakeup)
+    
+    logger.debug("Wait for data on %d descriptors" % len(waitlist))
+    
+    while 1:
+        # Wake up to expire an incomplete frame if no more data arrives
+        timeout = None
+        if serial_param.port in waitlist and serial_param.reader.partial_since is not None:
+            timeout = serial_param.reader.timeout
+        
+        try:
+            readable = select.select(waitlist, [], [], timeout)[0]
+        except select.error, err:
+            # Interrupted by a signal, wait again
+            if err.args[0] == errno.EINTR:
+                continue
+            raise
+        
+        # Read serial port, on timeout only the incomplete frame is checked
+        if serial_param.port in readable or not readable:
+            rawcmd = read_rfx()
+            if rawcmd:
+                logger.debug("Processed: %s", rawcmd)
+        
+        # Read socket, process everything that is queued
+        if messageWakeup in readable:
+            messageWakeup.clear()
+            while not messageQueue.empty():
+                read_socket()
+
+# ----------------------------------------------------------------------------
+
+def listen_poll():
+    """
+    Poll the serial port and the socket message queue, used on platforms
+    where select() does not work on serial ports
+    """
+    while 1:
+        # Let it breath
+        # Without this sleep it will cause 100% CPU in windows
+        time.sleep(0.01)
+        
+        if config.serial_active:
+            # Read serial port
+            if config.process_rfxmsg == True:
+                rawcmd = read_rfx()
+                if rawcmd:
+                    logger.debug("Processed: %s", rawcmd)
+        
+        # Read socket
+        if config.socketserver:
+            read_socket()
+
+# ----------------------------------------------------------------------------
+
 def option_getstatus():
     """
     Get status from RFXtrx device and print on screen
@@ -4151,6 +2972,7 @@ def option_getstatus():
     # Flush buffer
     serial_param.port.flushOutput()
     serial_param.port.flushInput()
+    serial_param.reader.reset()
 
     # Send RESET
     serial_param.port.write(rfxcmd.reset.decode('hex'))
@@ -4159,6 +2981,7 @@ def option_getstatus():
     # Flush buffer
     serial_param.port.flushOutput()
     serial_param.port.flushInput()
+    serial_param.reader.reset()
 
     # Send STATUS
     send_rfx(rfxcmd.status.decode('hex'))
@@ -4206,6 +3029,7 @@ def option_send():
     serial_param.port.flushOutput()
     logger.debug("Serialport flush input")
     serial_param.port.flushInput()
+    serial_param.reader.reset()
 
     # Send RESET
     logger.debug("Send RFX reset")
@@ -4217,6 +3041,7 @@ def option_send():
     serial_param.port.flushOutput()
     logger.debug("Serialport flush input")
     serial_param.port.flushInput()
+    serial_param.reader.reset()
 
     if cmdarg.rawcmd:
         timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
@@ -4283,180 +3108,13 @@ def option_bsend():
 
 def read_configfile():
     """
-    Read items from the configuration file
+    Read the configuration file, exit if it is missing or invalid
     """
-    if os.path.exists( cmdarg.configfile ):
-
-        # ----------------------
-        # Serial device
-        if (read_config(cmdarg.configfile, "serial_active") == "yes"):
-            config.serial_active = True
-        else:
-            config.serial_active = False
-        config.serial_device = read_config( cmdarg.configfile, "serial_device")
-        config.serial_rate = read_config( cmdarg.configfile, "serial_rate")
-        config.serial_timeout = read_config( cmdarg.configfile, "serial_timeout")
-
-        logger.debug("Serial device: " + str(config.serial_device))
-        logger.debug("Serial rate: " + str(config.serial_rate))
-        logger.debug("Serial timeout: " + str(config.serial_timeout))
-
-        # ----------------------
-        # Process
-        if (read_config(cmdarg.configfile, "process_rfxmsg") == "yes"):
-            config.process_rfxmsg = True
-        else:
-            config.process_rfxmsg = False
-        logger.debug("Process RFXmsg: " + str(config.process_rfxmsg))
-        
-        # ----------------------
-        # MySQL
-        if (read_config(cmdarg.configfile, "mysql_active") == "yes"):
-            config.mysql_active = True
-        else:
-            config.mysql_active = False
-        config.mysql_server = read_config( cmdarg.configfile, "mysql_server")
-        config.mysql_database = read_config( cmdarg.configfile, "mysql_database")
-        config.mysql_username = read_config( cmdarg.configfile, "mysql_username")
-        config.mysql_password = read_config( cmdarg.configfile, "mysql_password")
-    
-        # ----------------------
-        # TRIGGER
-        if (read_config( cmdarg.configfile, "trigger_active") == "yes"):
-            config.trigger_active = True
-        else:
-            config.trigger_active = False
-
-        if (read_config( cmdarg.configfile, "trigger_onematch") == "yes"):
-            config.trigger_onematch = True
-        else:
-            config.trigger_onematch = False
-
-        config.trigger_file = read_config( cmdarg.configfile, "trigger_file")
-        config.trigger_timeout = read_config( cmdarg.configfile, "trigger_timeout")
-
-        # ----------------------
-        # SQLITE
-        if (read_config(cmdarg.configfile, "sqlite_active") == "yes"):
-            config.sqlite_active = True
-        else:
-            config.sqlite_active = False        
-        config.sqlite_database = read_config(cmdarg.configfile, "sqlite_database")
-        config.sqlite_table = read_config(cmdarg.configfile, "sqlite_table")
-
-        # ----------------------
-        # PGSQL
-        if (read_config(cmdarg.configfile, "pgsql_active") == "yes"):
-            config.pgsql_active = True
-        else:
-            config.pgsql_active = False
-        config.pgsql_server = read_config(cmdarg.configfile, "pgsql_server")
-        config.pgsql_database = read_config(cmdarg.configfile, "pgsql_database")
-        config.pgsql_port = read_config(cmdarg.configfile, "pgsql_port")
-        config.pgsql_username = read_config(cmdarg.configfile, "pgsql_username")
-        config.pgsql_password = read_config(cmdarg.configfile, "pgsql_password")
-        config.pgsql_table = read_config(cmdarg.configfile, "pgsql_table")
-
-        # ----------------------
-        # GRAPHITE
-        if (read_config(cmdarg.configfile, "graphite_active") == "yes"):
-            config.graphite_active = True
-        else:
-            config.graphite_active = False
-        config.graphite_server = read_config(cmdarg.configfile, "graphite_server")
-        config.graphite_port = read_config(cmdarg.configfile, "graphite_port")
-
-        # ----------------------
-        # XPL
-        if (read_config(cmdarg.configfile, "xpl_active") == "yes"):
-            config.xpl_active = True
-            config.xpl_host = read_config(cmdarg.configfile, "xpl_host")
-            config.xpl_sourcename = read_config(cmdarg.configfile, "xpl_sourcename")
-            if (read_config(cmdarg.configfile, "xpl_includehostname") == "yes"):
-                config.xpl_includehostname = True
-            else:
-                config.xpl_includehostname = False
-        else:
-            config.xpl_active = False
-
-        # ----------------------
-        # SOCKET SERVER
-        if (read_config(cmdarg.configfile, "socketserver") == "yes"):
-            config.socketserver = True
-        else:
-            config.socketserver = False
-        config.sockethost = read_config( cmdarg.configfile, "sockethost")
-        config.socketport = read_config( cmdarg.configfile, "socketport")
-        logger.debug("SocketServer: " + str(config.socketserver))
-        logger.debug("SocketHost: " + str(config.sockethost))
-        logger.debug("SocketPort: " + str(config.socketport))
-        
-        # -----------------------
-        # WHITELIST
-        if (read_config(cmdarg.configfile, "whitelist_active") == "yes"):
-            config.whitelist_active = True
-        else:
-            config.whitelist_active = False         
-        config.whitelist_file = read_config( cmdarg.configfile, "whitelist_file")
-        logger.debug("Whitelist_active: " + str(config.whitelist_active))
-        logger.debug("Whitelist_file: " + str(config.whitelist_file))
-
-        # -----------------------
-        # DAEMON
-        if (read_config(cmdarg.configfile, "daemon_active") == "yes"):
-            config.daemon_active = True
-        else:
-            config.daemon_active = False
-        config.daemon_pidfile = read_config( cmdarg.configfile, "daemon_pidfile")
-        logger.debug("Daemon_active: " + str(config.daemon_active))
-        logger.debug("Daemon_pidfile: " + str(config.daemon_pidfile))
-        
-        # -----------------------
-        # WEEWX
-        if (read_config(cmdarg.configfile, "weewx_active") == "yes"):
-            config.weewx_active = True
-        else:
-            config.weewx_active = False
-        config.weewx_config = read_config( cmdarg.configfile, "weewx_config")
-        logger.debug("WeeWx_active: " + str(config.weewx_active))
-        logger.debug("WeeWx_config: " + str(config.weewx_config))
-        
-        # ------------------------
-        # RRD
-        if (read_config(cmdarg.configfile, "rrd_active") == "yes"):
-            config.rrd_active = True
-        else:
-            config.rrd_active = False
-        
-        # If RRD path is empty, then use the script path
-        config.rrd_path = read_config( cmdarg.configfile, "rrd_path")
-        if not config.rrd_path:
-            config.rrd_path = os.path.dirname(os.path.realpath(__file__))
-        
-        # ------------------------
-        # BAROMETRIC
-        config.barometric = read_config(cmdarg.configfile, "barometric")
-        
-        # ------------------------
-        # LOG MESSAGES
-        if (read_config(cmdarg.configfile, "log_msg") == "yes"):
-            config.log_msg = True
-        else:
-            config.log_msg = False
-        config.log_msgfile = read_config(cmdarg.configfile, "log_msgfile")
-        
-        # ------------------------
-        # PROTOCOLS
-        if (read_config(cmdarg.configfile, "protocol_startup") == "yes"):
-            config.protocol_startup = True
-        else:
-            config.protocol_startup = False
-        config.protocol_file = read_config(cmdarg.configfile, "protocol_file")
-        
-    else:
-        # config file not found, set default values
-        print "Error: Configuration file not found (" + cmdarg.configfile + ")"
-        logger.error("Error: Configuration file not found (" + cmdarg.configfile + ") Line: " + _line())
+    try:
+        return load_config(cmdarg.configfile, os.path.dirname(os.path.realpath(__file__)))
+    except ConfigError as err:
+        print("Error: %s" % str(err))
+        sys.exit(1)
 
 # ----------------------------------------------------------------------------
 
@@ -4467,6 +3125,7 @@ def open_serialport():
 
     # Check that serial module is loaded
     try:
+        import serial
         logger.debug("Serial extension version: " + serial.VERSION)
     except:
         print "Error: You need to install Serial extension for Python"
@@ -4497,6 +3156,9 @@ def open_serialport():
     if not serial_param.port.isOpen():
         serial_param.port.open()
 
+    serial_param.reader = FrameReader(serial_param.port)
+    metrics.register('serial', serial_param.reader.stats)
+
 # ----------------------------------------------------------------------------
 
 def close_serialport():
@@ -4516,94 +3178,69 @@ def close_serialport():
 
 # ----------------------------------------------------------------------------
 
-def logger_init(configfile, name, debug):
+def logger_init(config, name, debug):
     """
 
     Init loghandler and logging
     
     Input: 
     
-        - configfile = location of the config.xml
+        - config = the configuration, for loglevel and logfile
         - name = name
         - debug = True will send log to stdout, False to file
         
     Output:
     
         - Returns logger handler
-        - In case of no configfile found, return False
     
     """
-    program_path = os.path.dirname(os.path.realpath(__file__))
-    dom = None
+    #formatter = logging.Formatter(fmt='%(asctime)s - %(levelname)s - %(module)s - %(message)s')
+    formatter = logging.Formatter('%(asctime)s - %(threadName)s - %(module)s:%(lineno)d - %(levelname)s - %(message)s')
+    loglevel = config.loglevel.upper()
+    logger = logging.getLogger(name)
     
-    if os.path.exists( os.path.join(program_path, configfile) ):
-        
-        # Read config file
-        f = open(os.path.join(program_path, configfile),'r')
-        data = f.read()
-        f.close()
-        
-        try:
-            dom = minidom.parseString(data)
-        except:
-            print("Error: problem in the %s file, cannot process it" % str(configfile))
-            return False
-        
-        if dom:
-            
-            #formatter = logging.Formatter(fmt='%(asctime)s - %(levelname)s - %(module)s - %(message)s')
-            formatter = logging.Formatter('%(asctime)s - %(threadName)s - %(module)s:%(lineno)d - %(levelname)s - %(message)s')
-            
-            # Get loglevel from config file
-            try:
-                xmlTag = dom.getElementsByTagName( 'loglevel' )[0].toxml()
-                loglevel = xmlTag.replace('<loglevel>','').replace('</loglevel>','')
-                loglevel = loglevel.upper()
-            except:
-                loglevel = "ERROR"
-            
-            # Get logfile from config file
-            try:
-                xmlTag = dom.getElementsByTagName( 'logfile' )[0].toxml()
-                logfile = xmlTag.replace('<logfile>','').replace('</logfile>','')
-            except:
-                logfile = None
-                pass
-            
-            if debug:
-                loglevel = "DEBUG"
-                handler = logging.StreamHandler()
-                handler.setFormatter(formatter)
-                logger = logging.getLogger(name)
-                logger.setLevel(logging.getLevelName(loglevel))
-                logger.addHandler(handler)
-            
-            if logfile:
-                handler = logging.FileHandler(logfile)
-                handler.setFormatter(formatter)
-                logger = logging.getLogger(name)
-                logger.setLevel(logging.getLevelName(loglevel))
-                logger.addHandler(handler)
-            
-            return logger
-        
-    else:
-        logger.error("Error: Cannot find configuration file (%s)" % str(configfile))
-        return False
+    global loglistener
+    handlers = []
+    
+    if debug:
+        loglevel = "DEBUG"
+        handler = logging.StreamHandler()
+        handler.setFormatter(formatter)
+        handlers.append(handler)
+    
+    if config.logfile:
+        handler = logging.FileHandler(config.logfile)
+        handler.setFormatter(formatter)
+        handlers.append(handler)
+    
+    logger.setLevel(logging.getLevelName(loglevel))
+    
+    # Drop the calls below loglevel at the first check in the logging
+    # module, the hot path has a logger.debug() for each step
+    logging.disable(logging.getLevelName(loglevel) - 1)
+    
+    # The handlers are called from the log thread once it is started
+    if handlers:
+        loglistener = queue_logging(logger, *handlers)
+    
+    return logger
     
 # ----------------------------------------------------------------------------
 
 def main():
 
     global logger
+    global config
 
     # Get directory of the rfxcmd script
-    config.program_path = os.path.dirname(os.path.realpath(__file__))
+    program_path = os.path.dirname(os.path.realpath(__file__))
 
     parser = OptionParser()
     parser.add_option("-d", "--device", action="store", type="string", dest="device", help="The serial device of the RFXCOM, example /dev/ttyUSB0")
     parser.add_option("-l", "--listen", action="store_true", dest="listen", help="Listen for messages from RFX device")
     parser.add_option("-x", "--simulate", action="store", type="string", dest="simulate", help="Simulate one incoming data message")
+    parser.add_option("-r", "--replay", action="store", type="string", dest="replay", help="Replay the messages of a capture file (log_msgfile)")
+    parser.add_option("--speed", action="store", type="float", dest="speed", default=1.0, help="Replay speed, 1 = original timing, 0 = as fast as possible (default: 1)")
     parser.add_option("-s", "--sendmsg", action="store", type="string", dest="sendmsg", help="Send one message to RFX device")
     parser.add_option("-f", "--rfxstatus", action="store_true", dest="rfxstatus", help="Get RFX device status")
     parser.add_option("-o", "--config", action="store", type="string", dest="config", help="Specify the configuration file")
@@ -4624,28 +3261,21 @@ def main():
     if options.config:
         cmdarg.configfile = options.config
     else:
-        cmdarg.configfile = os.path.join(config.program_path, "config.xml")
+        cmdarg.configfile = os.path.join(program_path, "config.xml")
+
+    # ----------------------------------------------------------
+    # PROCESS CONFIG.XML
+    config = read_configfile()
 
     # ----------------------------------------------------------
     # LOGHANDLER
-    if options.debug:
-        logger = logger_init(cmdarg.configfile,'rfxcmd', True)
-    else:
-        logger = logger_init(cmdarg.configfile,'rfxcmd', False)
-    
-    if not logger:
-        print("Error: Cannot find configuration file (%s)" % str(configfile))
-        sys.exit(1)
+    logger = logger_init(config, 'rfxcmd', options.debug)
     
     logger.debug("Python version: %s.%s.%s" % sys.version_info[:3])
     logger.debug("RFXCMD Version: " + __version__)
     logger.debug(__date__.replace('$', ''))
-    
-    # ----------------------------------------------------------
-    # PROCESS CONFIG.XML
     logger.debug("Configfile: " + cmdarg.configfile)
-    logger.debug("Read configuration file")
-    read_configfile()
+    logger.debug("Configuration loaded in %.2f ms" % (config.load_time * 1000))
 
     # ----------------------------------------------------------
     # VERBOSE OUTPUT
@@ -4668,6 +3298,7 @@ def main():
     # Print protocol list
     if options.listprotocol:
         logger.debug("List protocol file to screen")
+        import lib.rfx_protocols as protocol
         protocol.print_protocolfile(config.protocol_file)
     
     # ----------------------------------------------------------
@@ -4705,6 +3336,7 @@ def main():
     if config.sqlite_active:
         logger.debug("SqLite active, Check sqlite3 version")
         try:
+            import sqlite3
             logger.debug("SQLite3 version: " + sqlite3.sqlite_version)
         except ImportError:
             print "Error: You need to install SQLite extension for Python"
@@ -4742,11 +3374,9 @@ def main():
     # ----------------------------------------------------------
     # SERIAL
     if options.device:
-        config.device = options.device
+        config = config.replace(device=options.device)
     elif config.serial_device:
-        config.device = config.serial_device
-    else:
-        config.device = None
+        config = config.replace(device=config.serial_device)
 
     # ----------------------------------------------------------
     # DAEMON
@@ -4796,11 +3426,46 @@ def main():
             logger.debug("Start daemon")
             daemonize()
 
+    # ----------------------------------------------------------
+    # OUTPUT THREADS
+    # Started after daemonize(), threads do not survive the fork
+    if loglistener is not None:
+        loglistener.start()
+        atexit.register(loglistener.stop)
+
+    if config.trigger_active:
+        logger.debug("Start trigger workers")
+        start_triggerpool()
+
+    if config.mysql_active or config.sqlite_active or config.pgsql_active:
+        logger.debug("Start database writer")
+        start_database()
+
+    if config.xpl_active:
+        logger.debug("Start xPL publisher")
+        import lib.rfx_xplcom as xpl
+        xplsender.publisher = xpl.Publisher(config.xpl_host, config.xpl_sourcename, config.xpl_includehostname)
+        metrics.register('xpl', xplsender.publisher.stats)
+
+    if config.graphite_active:
+        logger.debug("Start Graphite client")
+        start_graphite()
+
+    # Not when replaying, the replayed frames would be logged again
+    if config.log_msg and not options.replay:
+        logger.debug("Start message log")
+        start_capture()
+
     # ----------------------------------------------------------
     # SIMULATE
     if options.simulate:
         option_simulate(options.simulate)
 
+    # ----------------------------------------------------------
+    # REPLAY
+    if options.replay:
+        option_replay(options.replay, options.speed)
+
     # ----------------------------------------------------------
     # LISTEN
     if options.listen:
@@ -4830,7 +3495,8 @@ if __name__ == '__main__':
     signal.signal(signal.SIGTERM, handler)
 
     # Init objects
-    config = config_data()
+    config = None
+    loglistener = None
     cmdarg = cmdarg_data()
     rfx = lib.rfx_sensors.rfx_data()
     rfxcmd = rfxcmd_data()
@@ -4842,12 +3508,21 @@ if __name__ == '__main__':
     # Whitelist
     whitelist = whitelist_data()
 
+    # Database writer
+    database = database_data()
+
+    # Graphite client
+    graphite = graphite_data()
+
+    # xPL publisher
+    xplsender = xpl_data()
+
+    # Message log
+    capture = capture_data()
+
     # WeeWxlist
     weewxlist = weewx_data()
 
-    # Check python version
-    check_pythonversion()
-    
     main()
 
 # ------------------------------------------------------------------------------
@@ -0,0 +1,96 @@
+#!/usr/bin/python
+# coding=UTF-8
+
+# ------------------------------------------------------------------------------
+#
+#   RFXEMU.PY
+#
+#   Copyright (C) 2012-2014 Sebastian Sjoholm, sebastian.sjoholm@gmail.com
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Website: http://code.google.com/p/rfxcmd/
+#
+#   NOTES
+#
+#   RFXtrx emulator on a pseudo-terminal, for testing rfxcmd without a
+#   device. Start it and run rfxcmd with the printed device, e.g.
+#
+#   ./rfxemu.py -r 100 -l /tmp/rfxtrx
+#   ./rfxcmd.py -l -d /tmp/rfxtrx
+#
+# ------------------------------------------------------------------------------
+
+import os
+import sys
+import time
+import signal
+import optparse
+
+from lib.rfx_emulator import Emulator
+from lib.rfx_capture import read_capture
+
+# ------------------------------------------------------------------------------
+
+def handler(signum=None, frame=None):
+    raise KeyboardInterrupt
+
+# ------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    parser = optparse.OptionParser()
+    parser.add_option("-r", "--rate", action="store", type="float", dest="rate", default=10.0, help="Frames per second, 0 = as fast as rfxcmd reads (default: 10)")
+    parser.add_option("-n", "--count", action="store", type="int", dest="count", default=0, help="Stop sending after this many frames (default: no limit)")
+    parser.add_option("-f", "--file", action="store", type="string", dest="file", help="Send the frames of a capture file (log_msgfile) instead of the built-in ones")
+    parser.add_option("-l", "--link", action="store", type="string", dest="link", help="Create a symlink to the pseudo-terminal, e.g. /tmp/rfxtrx")
+    (options, args) = parser.parse_args()
+
+    frames = None
+    if options.file:
+        try:
+            frames = [frame for unixtime, frame in read_capture(options.file) if frame is not None]
+        except (IOError, OSError) as err:
+            print "Error: cannot read %s, %s" % (options.file, err)
+            sys.exit(1)
+
+    try:
+        emulator = Emulator(frames, rate=options.rate, count=options.count)
+    except ValueError as err:
+        print "Error: %s" % err
+        sys.exit(1)
+    device = emulator.device
+    if options.link:
+        if os.path.islink(options.link):
+            os.remove(options.link)
+        os.symlink(emulator.device, options.link)
+        device = options.link
+
+    print "RFXtrx emulator on %s, %s frames/s" % (device, options.rate or "max")
+    sys.stdout.flush()
+    signal.signal(signal.SIGINT, handler)
+    signal.signal(signal.SIGTERM, handler)
+    emulator.start()
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+
+    emulator.stop()
+    if options.link:
+        os.remove(options.link)
+    stats = emulator.stats()
+    print "\nSent %(sent)d frames, dropped %(dropped)d, answered %(commands)d commands" % stats
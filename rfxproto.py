@@ -74,6 +74,13 @@ except ImportError as err:
     print("Error: %s" % str(err))
     sys.exit(1)
 
+# RFXCMD modules
+try:
+    from lib.rfx_frame import FrameReader
+except ImportError as err:
+    print("Error: %s" % str(err))
+    sys.exit(1)
+
 # ------------------------------------------------------------------------------
 class rfxcmd_data:
     def __init__(
@@ -150,24 +157,6 @@ def print_version():
     print __date__.replace('$', '')
     return
 
-# ------------------------------------------------------------------------------
-def readbytes(number):
-    """
-    Read amount of bytes from serial device
-    """
-    buf = ''
-    for i in range(number):
-        try:
-            byte = s.device.read()
-        except IOError as err:
-            print("Error: %s" % str(err))
-            return False
-        except OSError as err:
-            print("Error: %s" % str(err))
-            return False
-        buf += byte
-    return buf
-
 # ------------------------------------------------------------------------------
 def rfx_setmode(protocol, state):
     """
@@ -483,34 +472,27 @@ def rfx_sendmsg(message=None):
     
     # Waiting reply
     result = None
-    byte = None
+    reader = FrameReader(s.device)
     logger.debug("Wait for the reply")
     try:
         while 1:
             time.sleep(0.01)
             try:
                 try:
-                    if s.device.inWaiting() != 0:
-                        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                        logger.debug("Timestamp: " + timestamp)
-                        logger.debug("SerWaiting: " + str(s.device.inWaiting()))
-                        byte = s.device.read()
-                        logger.debug("Byte: " + str(ByteToHex(byte)))
+                    messages = reader.read()
                 except IOError, err:
                     logger.error("Serial read error: %s" % str(err))
                     print("Serial error: " + str(err))
                     break
                 
                 try:
-                    if byte is not None:
-                        if ord(byte) == 13:
-                            result = byte + readbytes( ord(byte) )
-                            logger.debug("Message: " + str(ByteToHex(result)))
+                    if messages:
+                        result = messages[0]
+                        logger.debug("Message: " + str(ByteToHex(result)))
+                        if ord(result[0]) == 13:
                             break
                         else:
                             logger.debug("Wrong message received")
-                            result = byte + readbytes( ord(byte) )
-                            logger.debug("Message: " + str(ByteToHex(result)))
                             print("Error: Wrong or no response received")
                             sys.exit(1)
                             
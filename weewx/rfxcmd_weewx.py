@@ -31,6 +31,9 @@ FORECAST_MAP = { 0:'Partly Cloudy', 1:'Rainy', 2:'Cloudy', 3:'Sunny',
 HUMIDITY_STATUS = { "00":"Dry", "01":"Comfort", "02":"Normal", "03":"Wet"}		
 TRENDS = { 0:'Stable', 1:'Rising', 2:'Falling', 3:'Undefined' }
 
+# Sensors read in genLoopPackets
+LOOP_SENSORS = ('0x52', '0x53', '0x54', '0x55', '0x56', '0x57')
+
 def loader(config_dict, engine):
 	"""Used to load the driver."""
 	# The WMR driver needs the altitude in meters. Get it from the Station data
@@ -90,6 +93,14 @@ class RfxCmd(weewx.abstractstation.AbstractStation):
 		self.socket_port = int(stn_dict.get('socket_port', 55000))
 		self.writelog("Socket port = %s" % str(self.socket_port))
 		self.socket_message = stn_dict.get('socket_message', '0A1100FF001100FF001100')
+		self.socket_timeout = float(stn_dict.get('socket_timeout', 10))
+		# Request all sensors at once, keep the connection open between loops
+		self.batch = self.to_bool(stn_dict.get('batch', False))
+		self.writelog("Batch = %s" % str(self.batch))
+		self.persistent = self.to_bool(stn_dict.get('persistent', False))
+		self.writelog("Persistent = %s" % str(self.persistent))
+		self.sock = None
+		self.rfile = None
 		
 		# Sensor
 		self.legacy = self.to_bool(stn_dict.get('legacy', False))
@@ -174,52 +185,95 @@ class RfxCmd(weewx.abstractstation.AbstractStation):
 		start_ts = self.the_time = time.time()
 		self.writelog("Init done")
 	
-	def get_rfxdata(self, sensor):
-		syslog.syslog(syslog.LOG_ERR, "RfxCmd: Get data")
-		
-		data = None
-		rbufsize = -1
-		wbufsize = 0
-		packet_recv = False
-		sock = None
-		
-		self.writelog("Get data for sensor %s " % str(sensor))
-		message = "WEEWX;" + sensor
+	def rfx_connect(self):
+		"""Open the connection to RFXcmd, in persistent mode it is kept open"""
 		self.writelog("Remote: %s:%s" % (str(self.socket_server), str(self.socket_port)))
 		self.writelog("Open socket connection")
-		try:
-			sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-			sock.connect((self.socket_server, self.socket_port))
-			self.writelog("Socket OK")
-		except Exception as err:
-			self.writelog("Exception: %s " % str(err))
-			syslog.syslog(syslog.LOG_ERR, "RfxCmd: Exception: %s " % str(err))
-			data = None
-			sock = None
-			pass
-		
-		if sock:
+		sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+		sock.settimeout(self.socket_timeout)
+		sock.connect((self.socket_server, self.socket_port))
+		rfile = sock.makefile('rb', -1)
+		if self.persistent:
+			sock.sendall("PERSISTENT\n")
+			if rfile.readline().strip() != "OK":
+				sock.close()
+				raise socket.error("RFXcmd does not support persistent connections")
+			self.sock = sock
+			self.rfile = rfile
+		self.writelog("Socket OK")
+		return sock, rfile
+	
+	def rfx_disconnect(self):
+		if self.sock:
+			self.writelog("Close socket")
 			try:
-				self.writelog("Send socket command = %s" % str(message))
-				rfile = sock.makefile('rb', rbufsize)
-				wfile = sock.makefile('wb', wbufsize)
-				wfile.write( message +"\n" )
-				data = rfile.read()
+				self.sock.close()
+			except socket.error:
+				pass
+		self.sock = None
+		self.rfile = None
+	
+	def rfx_request(self, message):
+		"""Send one request to RFXcmd and return the reply, None on failure"""
+		self.writelog("Send socket command = %s" % str(message))
+		for attempt in range(2):
+			try:
+				if self.persistent:
+					sock, rfile = self.sock, self.rfile
+					if sock is None:
+						sock, rfile = self.rfx_connect()
+					sock.sendall(message + "\n")
+					data = rfile.readline()
+					if not data:
+						# Closed by RFXcmd, reconnect once
+						raise socket.error("connection closed")
+					data = data.rstrip("\n")
+				else:
+					sock, rfile = self.rfx_connect()
+					sock.sendall(message + "\n")
+					data = rfile.read()
+					self.writelog("Close socket")
+					sock.close()
 				self.writelog("Received data: %s " % str(data))
-				self.writelog("Close socket")
-				sock.close()
+				return data
 			except socket.error as err:
-				data = None
+				self.rfx_disconnect()
 				self.writelog("Error: Failed to connect to remote")
 				self.writelog("Exception: %s " % str(err))
 				syslog.syslog(syslog.LOG_ERR, "RfxCmd: Exception: %s " % str(err))
-				pass
-		
+				if not self.persistent:
+					break
+		return None
+	
+	def get_rfxdata(self, sensor):
+		syslog.syslog(syslog.LOG_ERR, "RfxCmd: Get data")
+		self.writelog("Get data for sensor %s " % str(sensor))
+		data = self.rfx_request("WEEWX;" + sensor)
 		if data:
 			return data
 		else:
 			return None
-		
+	
+	def get_rfxbatch(self, sensors):
+		"""Get the data of all sensors in one request, return a dict"""
+		self.writelog("Get data for sensors %s " % ", ".join(sensors))
+		data = self.rfx_request("WEEWX;" + ",".join(sensors))
+		batch = {}
+		if data:
+			if "=" not in data and len(sensors) == 1:
+				batch[sensors[0]] = data
+			else:
+				for item in data.split("|"):
+					sensor, sep, value = item.partition("=")
+					if sep and value:
+						batch[sensor] = value
+		return batch
+	
+	def sensor_data(self, sensor, batch):
+		if batch is None:
+			return self.get_rfxdata(sensor)
+		return batch.get(sensor)
+	
 	def genLoopPackets(self):
 		while True:
 			# Determine how long to sleep
@@ -233,6 +287,13 @@ class RfxCmd(weewx.abstractstation.AbstractStation):
 			self.the_time += self.loop_interval
 			packet_recv = 0
 			
+			# All sensors in one request
+			batch = None
+			if self.batch:
+				sensors = [sensor for sensor in LOOP_SENSORS if getattr(self, 'sensor_' + sensor)]
+				if sensors:
+					batch = self.get_rfxbatch(sensors)
+			
 			# --------------------------------------------------------------------------------------
 			# Sensor 0x52 
 			# --------------------------------------------------------------------------------------
@@ -240,7 +301,7 @@ class RfxCmd(weewx.abstractstation.AbstractStation):
 				self.writelog("0x52: --- Start ---")
 				result = None
 				_packet = {'dateTime': int(self.the_time+0.5), 'usUnits' : weewx.METRIC }
-				result = self.get_rfxdata("0x52")
+				result = self.sensor_data("0x52", batch)
 				self.writelog("0x52: Data: %s " % str(result))
 				if result:
 					data = result.split(';')
@@ -276,7 +337,7 @@ class RfxCmd(weewx.abstractstation.AbstractStation):
 				self.writelog("0x53: --- Start ---")
 				result = None
 				_packet = {'dateTime': int(self.the_time+0.5), 'usUnits' : weewx.METRIC }
-				result = self.get_rfxdata("0x53")
+				result = self.sensor_data("0x53", batch)
 				self.writelog("0x53: Data: %s " % str(result))
 				if result:
 					data = result.split(';')
@@ -304,7 +365,7 @@ class RfxCmd(weewx.abstractstation.AbstractStation):
 				self.writelog("0x54: --- Start ---")
 				result = None
 				_packet = {'dateTime': int(self.the_time+0.5), 'usUnits' : weewx.METRIC }
-				result = self.get_rfxdata("0x54")
+				result = self.sensor_data("0x54", batch)
 				self.writelog("0x54: Data: %s " % str(result))
 				if result:
 					data = result.split(';')
@@ -343,7 +404,7 @@ class RfxCmd(weewx.abstractstation.AbstractStation):
 				self.writelog("0x55: --- Start ---")
 				result = None
 				_packet = {'dateTime': int(self.the_time+0.5), 'usUnits' : weewx.METRIC }
-				result = self.get_rfxdata("0x55")
+				result = self.sensor_data("0x55", batch)
 				self.writelog("0x55: Data: %s " % str(result))
 				if result:
 					data = result.split(';')
@@ -382,7 +443,7 @@ class RfxCmd(weewx.abstractstation.AbstractStation):
 				self.writelog("0x56: --- Start ---")
 				result = None
 				_packet = {'dateTime': int(self.the_time+0.5), 'usUnits' : weewx.METRICWX }
-				result = self.get_rfxdata("0x56")
+				result = self.sensor_data("0x56", batch)
 				self.writelog("0x56: Data: %s " % str(result))
 				if result:
 					data = result.split(';')
@@ -434,7 +495,7 @@ class RfxCmd(weewx.abstractstation.AbstractStation):
 				self.writelog("0x57: --- Start ---")
 				result = None
 				_packet = {'dateTime': int(self.the_time+0.5), 'usUnits' : weewx.METRIC }
-				result = self.get_rfxdata("0x57")
+				result = self.sensor_data("0x57", batch)
 				self.writelog("0x57: Data: %s " % str(result))
 				if result:
 					data = result.split(';')